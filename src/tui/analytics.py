@@ -0,0 +1,253 @@
+"""`agent-bureau stats` — offline analytics over the session journal.
+
+Reads .disagree/sessions.jsonl and its rotated .gz segments line by line,
+oldest first, so memory does not grow with the log: only the aggregates
+(counters, plus one float per latency sample for the percentiles) are
+kept. Most of a long journal is checkpoint records full of streamed text;
+they carry nothing the report needs, so lines are triaged by their "stage"
+field before any JSON is parsed.
+
+Reported:
+- disagreement kinds, from classification records (old and new format),
+- per-agent total latency and time to first token (p50/p90/p99),
+- how the reconciliation loop stopped (converged, max rounds, ...),
+- which answer was applied (claude, codex, merge, hunks, reuse) and race wins.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import math
+import re
+import sys
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO
+
+from tui.journal import JOURNAL_PATH
+
+# Stages the report reads; lines of any other stage are skipped unparsed.
+_WANTED = {b"classification", b"stream", b"reconcile_round", b"apply", b"race", b"prompt"}
+_STAGE = re.compile(rb'"stage":\s*"([a-z_]+)"')
+# Stream and race records end with the (large) answer text, which the report
+# never reads: only the part before it is parsed.
+_TEXT_FIELD = b', "text": '
+_TEXT_STAGES = {b"stream", b"race"}
+
+
+def journal_files(path: Path = JOURNAL_PATH) -> list[Path]:
+    """Rotated segments (oldest first) followed by the active journal, those that exist."""
+    segments = sorted(path.parent.glob(f"{path.stem}-*{path.suffix}.gz"))
+    return segments + ([path] if path.exists() else [])
+
+
+def _open(path: Path) -> IO[bytes]:
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def iter_records(paths: Iterable[Path]) -> Iterator[dict]:
+    """Yield report-relevant records from journal files, streaming.
+
+    Lines whose stage is not needed are skipped without parsing; lines
+    without a stage (the original log format) are classification records.
+    Malformed lines are skipped.
+    """
+    for path in paths:
+        try:
+            f = _open(path)
+        except OSError:
+            continue
+        with f:
+            try:
+                for line in f:
+                    match = _STAGE.search(line, 0, 200)
+                    if match is not None:
+                        stage = match.group(1)
+                        if stage not in _WANTED:
+                            continue
+                        if stage in _TEXT_STAGES:
+                            cut = line.find(_TEXT_FIELD)
+                            if cut > 0:
+                                try:
+                                    yield json.loads(line[:cut] + b"}")
+                                    continue
+                                except ValueError:
+                                    pass  # the marker was inside another field
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict):
+                        yield record
+            except (OSError, EOFError):
+                continue  # truncated segment: keep what was read
+
+
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile (q in 0..100) of already sorted values."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class JournalStats:
+    """Streaming aggregates over journal records; feed with add(), read with summary()."""
+
+    def __init__(self) -> None:
+        self.sessions = 0
+        self.classified = 0
+        self.disagreement_kinds: Counter[str] = Counter()
+        self.latency: dict[str, list[float]] = defaultdict(list)
+        self.ttft: dict[str, list[float]] = defaultdict(list)
+        self.outcomes: Counter[tuple[str, str]] = Counter()  # (agent, done / error / timeout)
+        self.stop_reasons: Counter[str] = Counter()
+        self.rounds = 0
+        self.applied: Counter[str] = Counter()
+        self.cancelled = 0
+        self.race_wins: Counter[str] = Counter()
+
+    def add(self, record: dict) -> None:
+        stage = record.get("stage")
+        if stage is None or stage == "classification":
+            if stage is None:
+                self.sessions += 1  # original format: one record per session
+            self.classified += 1
+            for item in record.get("disagreements") or []:
+                if isinstance(item, dict):
+                    self.disagreement_kinds[item.get("kind", "unknown")] += 1
+        elif stage == "prompt":
+            self.sessions += 1
+        elif stage == "stream":
+            agent = record.get("agent", "?")
+            self.outcomes[(agent, record.get("status", "?"))] += 1
+            if isinstance(record.get("elapsed"), (int, float)):
+                self.latency[agent].append(float(record["elapsed"]))
+            if isinstance(record.get("ttft"), (int, float)):
+                self.ttft[agent].append(float(record["ttft"]))
+        elif stage == "reconcile_round":
+            self.rounds += 1
+            if record.get("stop_reason"):
+                # Exactly one round per reconciliation loop carries the stop reason.
+                self.stop_reasons[record["stop_reason"]] += 1
+        elif stage == "apply":
+            if record.get("confirmed"):
+                self.applied[record.get("source") or "unknown"] += 1
+            else:
+                self.cancelled += 1
+        elif stage == "race":
+            self.race_wins[record.get("winner", "?")] += 1
+
+    def summary(self) -> dict:
+        """All aggregates as a JSON-serializable dict."""
+        agents = sorted(set(self.latency) | set(self.ttft) | {a for a, _ in self.outcomes})
+        per_agent = {}
+        for agent in agents:
+            latency = sorted(self.latency.get(agent, []))
+            ttft = sorted(self.ttft.get(agent, []))
+            per_agent[agent] = {
+                "answers": {s: n for (a, s), n in sorted(self.outcomes.items()) if a == agent},
+                "latency": {f"p{q}": percentile(latency, q) for q in (50, 90, 99)},
+                "ttft": {f"p{q}": percentile(ttft, q) for q in (50, 90, 99)},
+                "samples": len(latency),
+            }
+        loops = sum(self.stop_reasons.values())
+        return {
+            "sessions": self.sessions,
+            "classified": self.classified,
+            "disagreement_kinds": dict(self.disagreement_kinds.most_common()),
+            "agents": per_agent,
+            "reconciliation": {
+                "loops": loops,
+                "rounds": self.rounds,
+                "converged_rate": self.stop_reasons["converged"] / loops if loops else None,
+                "stop_reasons": dict(self.stop_reasons.most_common()),
+            },
+            "accepted": dict(self.applied.most_common()),
+            "cancelled": self.cancelled,
+            "race_wins": dict(self.race_wins.most_common()),
+        }
+
+
+def compute_stats(paths: Iterable[Path]) -> dict:
+    stats = JournalStats()
+    for record in iter_records(paths):
+        stats.add(record)
+    return stats.summary()
+
+
+def _seconds(value: float | None) -> str:
+    return "-" if value is None else f"{value:.2f}s"
+
+
+def render_table(summary: dict) -> str:
+    """Plain-text report of a summary() dict."""
+    lines = [f"Sessions: {summary['sessions']}   Classified: {summary['classified']}", ""]
+
+    lines.append("Disagreement kinds")
+    kinds = summary["disagreement_kinds"]
+    total = sum(kinds.values())
+    for kind, count in kinds.items():
+        lines.append(f"  {kind:<24} {count:>7}  {count / total:6.1%}")
+    if not kinds:
+        lines.append("  (none)")
+    lines.append("")
+
+    lines.append(f"  {'Agent':<10} {'answers':>8} {'lat p50':>9} {'p90':>9} {'p99':>9} "
+                 f"{'ttft p50':>9} {'p90':>9} {'p99':>9}")
+    if not summary["agents"]:
+        lines.append("  (no agent answers recorded)")
+    for agent, data in summary["agents"].items():
+        answers = sum(data["answers"].values())
+        lat, ttft = data["latency"], data["ttft"]
+        lines.append(
+            f"  {agent:<10} {answers:>8} {_seconds(lat['p50']):>9} {_seconds(lat['p90']):>9} "
+            f"{_seconds(lat['p99']):>9} {_seconds(ttft['p50']):>9} {_seconds(ttft['p90']):>9} "
+            f"{_seconds(ttft['p99']):>9}"
+        )
+        failures = {s: n for s, n in data["answers"].items() if s != "done"}
+        if failures:
+            lines.append("  " + " " * 10 + " failed: " + ", ".join(f"{s} {n}" for s, n in failures.items()))
+    lines.append("")
+
+    recon = summary["reconciliation"]
+    rate = recon["converged_rate"]
+    lines.append(
+        f"Reconciliation: {recon['loops']} loops, {recon['rounds']} rounds, "
+        f"converged {'-' if rate is None else f'{rate:.0%}'}"
+    )
+    for reason, count in recon["stop_reasons"].items():
+        lines.append(f"  {reason:<24} {count:>7}")
+    lines.append("")
+
+    accepted = summary["accepted"]
+    lines.append(
+        f"Applied: {sum(accepted.values())}   Cancelled: {summary['cancelled']}"
+    )
+    for source, count in accepted.items():
+        lines.append(f"  {source:<24} {count:>7}")
+    if summary["race_wins"]:
+        lines.append("Race wins: " + ", ".join(f"{a} {n}" for a, n in summary["race_wins"].items()))
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for `agent-bureau stats`."""
+    parser = argparse.ArgumentParser(
+        prog="agent-bureau stats", description="Summarize the session journal.",
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument(
+        "--journal", type=Path, default=JOURNAL_PATH, metavar="PATH",
+        help="active journal file; its rotated .gz segments are read too",
+    )
+    args = parser.parse_args(argv)
+    summary = compute_stats(journal_files(args.journal))
+    if args.json:
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(render_table(summary))
+    return 0
@@ -10,12 +10,17 @@ Layout (top to bottom):
 Flow:
   User submits prompt → both agents stream simultaneously → classification →
   auto-reconciliation (each agent sees the other's response and proposes a
-  unified solution) → ReviewBar appears with options:
+  unified solution; rounds repeat until the proposals converge, see
+  ConvergencePolicy) → ReviewBar appears with options:
     [r] Reconcile further  [c] Apply Claude  [x] Apply Codex
 
   "Reconcile further" feeds the reconciliation outputs back as new inputs,
   so each subsequent round is cross-reviewing the previous reconciliation.
 
+  With --daemon everything up to review runs in the background daemon
+  (tui.daemon) and the app renders the session's events, so quitting leaves
+  the session running; --attach SESSION picks it up again.
+
 Keyboard bindings:
   left / right        — switch pane focus
   ctrl+left/right     — shift horizontal divider (±5 %)
@@ -23,13 +28,15 @@ Keyboard bindings:
   q                   — exit immediately
   ctrl+c              — push QuitScreen confirmation dialog
   ctrl+l              — clear both panes and reset
+  ctrl+r              — toggle race mode (first agent to answer with code wins)
   r / c / x / y       — review actions (only active during REVIEWING state)
+  h                   — pick Claude's or Codex's side per hunk (j/k move, c/x pick,
+                        a applies the assembled result, esc goes back)
 """
 from __future__ import annotations
 
 import asyncio
-import os
-import subprocess
+import time
 from pathlib import Path
 
 from textual.app import App, ComposeResult
@@ -37,15 +44,33 @@ from textual.binding import Binding
 from textual.containers import Horizontal
 from textual.reactive import reactive
 from textual.widgets import Input, Static
+from textual.worker import Worker, WorkerCancelled, WorkerFailed, WorkerState
 
-from tui.event_bus import AgentDone, AgentError, AgentTimeout, BridgeEvent
+from tui.apply import CodeProposal, Hunk, default_filename
+from tui.batch import record_event
+from tui.env_context import EnvContextCache, with_env_context
+from tui.event_bus import AgentDone, AgentError, AgentTimeout, BridgeEvent, terminal_text
+from tui.journal import Checkpoint, SessionJournal, new_session_id
 from tui.messages import (
     AgentFinished, ClassificationDone, TokenReceived,
-    ReconciliationReady, ApplyResult,
+    ReconciliationReady, ApplyResult, RaceWon, QuorumReached, ReconcileRoundDone,
+    ContextRetrieved, DaemonEvent,
+)
+from tui.prompts import (
+    RECONCILE_TOKEN_BUDGET,
+    build_conflict_prompt,
+    parse_delta_reply,
+    render_proposal,
 )
-from tui.session import SessionState
+from tui.reconcile import RoundResult, proposal_records, run_reconciliation
+from tui.repo_index import RepoIndex, render_snippets
+from tui.session import ConvergencePolicy, QuorumPolicy, SessionState
+from tui.similarity import Solution, SolutionIndex, SolutionMatch, environment_fingerprint
+from tui.stats import LatencyHistory
+from tui.watcher import FileWatcher
 from tui.widgets.agent_pane import AgentPane
 from tui.widgets.apply_confirm_screen import ApplyConfirmScreen
+from tui.widgets.history_screen import HistoryScreen
 from tui.widgets.prompt_bar import PromptBar
 from tui.widgets.quit_screen import QuitScreen
 from tui.widgets.reconciliation_panel import ReconciliationPanel
@@ -65,6 +90,8 @@ class AgentBureauApp(App):
         Binding("q", "quit", "Quit"),
         Binding("ctrl+c", "confirm_quit", "Exit", priority=True),
         Binding("ctrl+l", "clear_panes", "Clear", show=False),
+        Binding("ctrl+r", "toggle_race", "Race mode", show=False),
+        Binding("ctrl+o", "open_history", "History", show=False),
         # Pane resize
         Binding("ctrl+left", "pane_shift_left", "Divider left", show=False),
         Binding("ctrl+right", "pane_shift_right", "Divider right", show=False),
@@ -75,14 +102,74 @@ class AgentBureauApp(App):
         Binding("c", "accept_claude", "Apply Claude", show=False),
         Binding("x", "accept_codex", "Apply Codex", show=False),
         Binding("y", "merge_and_apply", "Merge & apply", show=False),
+        Binding("h", "pick_hunks", "Pick per hunk", show=False),
+        # Offered when a near-duplicate prompt has an accepted solution
+        Binding("u", "reuse_solution", "Reuse past solution", show=False),
+        # Per-hunk picking (only active while picking hunks during REVIEWING)
+        Binding("j", "next_hunk", "Next hunk", show=False),
+        Binding("k", "prev_hunk", "Previous hunk", show=False),
+        Binding("a", "apply_hunks", "Apply selection", show=False),
+        Binding("escape", "leave_hunks", "Back", show=False),
     ]
 
     session_state: reactive[SessionState] = reactive(SessionState.IDLE)
+    # Race mode: commit to the first agent that answers with code, cancel the rest
+    race_mode: reactive[bool] = reactive(False)
     # Horizontal split: left pane weight out of 100 (default 50/50)
     pane_split: reactive[int] = reactive(50)
     # Reconciliation panel height in rows
     recon_height: reactive[int] = reactive(15)
 
+    def __init__(
+        self,
+        continue_from_partial: bool = True,
+        quorum: QuorumPolicy = QuorumPolicy(),
+        reconcile_token_budget: int = RECONCILE_TOKEN_BUDGET,
+        convergence: ConvergencePolicy = ConvergencePolicy(),
+        speculative_merge: bool = True,
+        context_bytes: int = 4000,
+        watch_files: bool = True,
+        checkpoint_interval: float = 2.0,
+        resume: Checkpoint | None = None,
+        daemon_socket: Path | None = None,
+        attach: str | None = None,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            continue_from_partial: When an agent errors or times out, classify and
+                reconcile its partial transcript instead of discarding it.
+            quorum: When to classify without waiting for slow agents.
+            reconcile_token_budget: Estimated-token cap for each reconciliation prompt.
+            convergence: When automatic reconciliation rounds stop.
+            speculative_merge: Start the `y` merge call as soon as review begins.
+            context_bytes: Byte budget for relevant-file excerpts added to each
+                prompt from the repository index (0 disables the index).
+            watch_files: Update the index and environment context as files change
+                (inotify, or polling where unavailable) instead of only at startup.
+            checkpoint_interval: Seconds between journal checkpoints of streamed
+                output while a session is in flight (0 checkpoints only on state changes).
+            resume: Interrupted session to rebuild at startup, without calling agents.
+            daemon_socket: Run sessions in the daemon listening there (see
+                tui.daemon) instead of in this process, so closing the app
+                leaves them running. Review actions still run here.
+            attach: Session to follow at startup from the daemon at daemon_socket.
+        """
+        super().__init__(**kwargs)
+        self.continue_from_partial = continue_from_partial
+        self.quorum = quorum
+        self.reconcile_token_budget = reconcile_token_budget
+        self.convergence = convergence
+        self.speculative_merge = speculative_merge
+        self.context_bytes = context_bytes
+        self.watch_files = watch_files
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+        self.daemon_socket = daemon_socket
+        self.attach = attach
+        # Set on exit if a daemon session was still running: it can be attached again.
+        self.detached_session: str | None = None
+
     def compose(self) -> ComposeResult:
         yield StatusBar(id="status-bar")
         with Horizontal():
@@ -102,6 +189,80 @@ class AgentBureauApp(App):
         self._agreed_code: str = ""
         self._agreed_language: str = "python"
         self._agreed_filename: str | None = None
+        self._partial_agents: set[str] = set()
+        # Agents still streaming after an early (quorum) classification
+        self._quorum_pending: set[str] = set()
+        self._classified_early = False
+        # Per-hunk picking: hunks between the two proposals and the side chosen for each.
+        self._hunks: list[Hunk] = []
+        self._hunk_choices: list[str] = []
+        self._hunk_cursor = 0
+        self._review_diff = ""
+        # Background merge started on entering REVIEWING; consumed by `y`.
+        self._speculative_merge: Worker | None = None
+        # Observed agent latency; drives adaptive timeouts and hedging.
+        self._latency = LatencyHistory()
+        self.run_worker(self._load_latency_history, thread=True, exit_on_error=False,
+                        name="load-latency")
+        # Environment context for prompts, warmed in the background at startup.
+        self._env_context = EnvContextCache()
+        self.run_worker(self._env_context.refresh, thread=True, exit_on_error=False,
+                        name="env-context")
+        # Repository index for relevant-file excerpts; None until the first build finishes.
+        self._repo_index: RepoIndex | None = None
+        self._index_build_ms = 0.0
+        self._index_saved_at = 0.0
+        # Keeps the index and environment context current as files change.
+        self._watcher: FileWatcher | None = None
+        self._unmounted = False
+        # Every session stage goes to .disagree/sessions.jsonl via a background writer.
+        self._journal = SessionJournal()
+        self._session_id = ""
+        self._prompt = ""
+        self._convergence = ""
+        # Timing for the journal: session start and each agent's first token (monotonic).
+        self._session_started = 0.0
+        self._first_token_at: dict[str, float] = {}
+        # Which answer the user applied: "claude", "codex", "merge", "hunks" or "reuse".
+        self._apply_source = ""
+        self._reused = False
+        # Agent that won a race; the loser was cancelled, so review offers only the winner.
+        self._race_winner: str | None = None
+        # A daemon-run session this app follows that has not sent its result yet.
+        self._remote_running = False
+        # Lines streamed since the last checkpoint, per agent.
+        self._unsaved_lines: dict[str, list[str]] = {}
+        # Accepted solutions, for offering one when a prompt is a near-duplicate.
+        self._solutions: SolutionIndex | None = None
+        self._env_fingerprint = ""
+        self._reuse: SolutionMatch | None = None
+        self.run_worker(self._load_solutions, thread=True, exit_on_error=False,
+                        name="load-solutions")
+        if self.checkpoint_interval > 0:
+            self.set_interval(self.checkpoint_interval, self._checkpoint_streamed)
+        if self.resume is not None:
+            self._restore_checkpoint(self.resume)
+        elif self.attach is not None and self.daemon_socket is not None:
+            self._follow_daemon_session(attach=self.attach)
+        if self.context_bytes > 0:
+            self.run_worker(self._build_repo_index, thread=True, exit_on_error=False,
+                            name="repo-index")
+
+    def _load_latency_history(self) -> None:
+        """Thread worker: replace the empty history with the persisted one."""
+        self._latency = LatencyHistory.load()
+
+    def _load_solutions(self) -> None:
+        """Thread worker: load the accepted-solution index."""
+        self._env_fingerprint = environment_fingerprint(Path.cwd())
+        self._solutions = SolutionIndex.load()
+
+    async def _save_latency_history(self) -> None:
+        """Persist latency history off the UI thread (errors are non-fatal)."""
+        try:
+            await asyncio.to_thread(self._latency.save)
+        except OSError:
+            pass
 
     def watch_session_state(self, state: SessionState) -> None:
         try:
@@ -109,6 +270,7 @@ class AgentBureauApp(App):
             prompt_input.disabled = state != SessionState.IDLE
         except Exception:
             pass
+        self._checkpoint()
 
     def watch_pane_split(self, split: int) -> None:
         try:
@@ -125,51 +287,172 @@ class AgentBureauApp(App):
 
     # --- Environment context ---
 
-    @staticmethod
-    def _gather_env_context() -> str:
-        """Collect cwd, git branch, and top-level project structure.
+    async def _with_env_context(self, prompt: str) -> str:
+        """Prefix prompt with the cached environment context (refreshed off-thread if stale)."""
+        return with_env_context(prompt, await self._env_context_for(prompt))
+
+    async def _env_context_for(self, prompt: str) -> str:
+        """The Environment section for prompt: the cached context plus relevant files.
 
-        Returns a compact multi-line string suitable for prepending to user
-        prompts so both agents understand the environment they are operating in.
-        Returns an empty string if nothing useful can be gathered.
+        Once the repository index is built, the files most relevant to the
+        prompt are excerpted into it as well.
+        """
+        env_ctx = await self._env_context.current()
+        index = self._repo_index
+        if index is not None and self.context_bytes > 0:
+            started = time.perf_counter()
+            snippets = await asyncio.to_thread(index.query, prompt, 5, self.context_bytes)
+            query_ms = (time.perf_counter() - started) * 1000
+            if snippets:
+                rendered = render_snippets(snippets)
+                env_ctx = f"{env_ctx}\n\nRelevant files:\n{rendered}".lstrip()
+                self.post_message(ContextRetrieved(
+                    snippets=len(snippets), size=len(rendered.encode()), query_ms=query_ms,
+                    files=index.file_count, build_ms=self._index_build_ms,
+                ))
+        return env_ctx
+
+    def _build_repo_index(self) -> None:
+        """Thread worker: load the saved index, bring it up to date and save it."""
+        started = time.perf_counter()
+        index = RepoIndex.load(self._env_context.root)
+        changed, removed = index.update()
+        if changed or removed:
+            try:
+                index.save()
+            except OSError:
+                pass
+        self._index_build_ms = (time.perf_counter() - started) * 1000
+        self._index_saved_at = time.monotonic()
+        self._repo_index = index
+        if self.watch_files and not self._unmounted:
+            self._watcher = FileWatcher(self._env_context.root, self._on_files_changed)
+            self._watcher.start()
+
+    def _on_files_changed(self, paths: set[str] | None) -> None:
+        """Watcher thread: re-index changed files and refresh the environment context.
+
+        paths is None when the watcher lost track (overflow, directory moves)
+        and everything must be rescanned.
         """
-        lines: list[str] = []
+        index = self._repo_index
+        if index is not None:
+            started = time.perf_counter()
+            if paths is None:
+                index.update()
+            else:
+                index.update_paths(paths)
+            self._index_build_ms = (time.perf_counter() - started) * 1000
+            # Persist at most every 30 s; the next start re-stats files anyway.
+            if time.monotonic() - self._index_saved_at > 30.0:
+                self._index_saved_at = time.monotonic()
+                try:
+                    index.save()
+                except OSError:
+                    pass
+        if paths is None or any("/" not in p or p.startswith(".git/") for p in paths):
+            self._env_context.refresh()
+
+    def on_unmount(self) -> None:
+        self._unmounted = True
+        if self._remote_running:
+            self.detached_session = self._session_id
+        if self._watcher is not None:
+            self._watcher.stop()
+        self._journal.close()
+
+    def _journal_stage(self, stage: str, **fields) -> None:
+        """Queue one journal record for the current session (never blocks on disk)."""
+        self._journal.append({"session": self._session_id, "stage": stage, **fields})
+
+    def _proposal_records(self) -> dict[str, dict]:
+        return proposal_records(self._recon_proposals)
+
+    # --- Checkpoints and resume ---
+
+    def _checkpoint(self) -> None:
+        """Journal the in-flight session state and the lines streamed since the last checkpoint."""
+        if not getattr(self, "_session_id", "") or self.session_state == SessionState.IDLE:
+            return
+        if self._remote_running:
+            return  # the daemon keeps the session's events; --attach replays them
+        lines, self._unsaved_lines = self._unsaved_lines, {}
+        self._journal_stage(
+            "checkpoint", state=self.session_state.name, prompt=self._prompt, lines=lines,
+            last_texts=dict(self._last_texts), proposals=self._proposal_records(),
+            partial=sorted(self._partial_agents),
+            finished=sorted(a for a, e in self._terminal_events.items() if isinstance(e, AgentDone)),
+            diff=self._review_diff, convergence=self._convergence,
+        )
 
-        cwd = os.getcwd()
-        lines.append(f"Working directory: {cwd}")
+    def _checkpoint_streamed(self) -> None:
+        """Interval callback: checkpoint only if something streamed since the last one."""
+        if self._unsaved_lines:
+            self._checkpoint()
 
-        try:
-            branch = subprocess.check_output(
-                ["git", "branch", "--show-current"],
-                text=True, stderr=subprocess.DEVNULL,
-            ).strip()
-            if branch:
-                lines.append(f"Git branch: {branch}")
-        except Exception:
-            pass
+    def _restore_checkpoint(self, checkpoint: Checkpoint) -> None:
+        """Rebuild an interrupted session from its checkpoint and open it for review.
 
-        try:
-            remote = subprocess.check_output(
-                ["git", "remote", "get-url", "origin"],
-                text=True, stderr=subprocess.DEVNULL,
-            ).strip()
-            if remote:
-                lines.append(f"Git remote: {remote}")
-        except Exception:
-            pass
+        No agent is called. A session cut off while streaming or classifying
+        resumes with the streamed text so far (unfinished agents marked
+        partial); one cut off mid-reconciliation resumes with the previous
+        round's proposals. From review, `r` reconciles further as usual.
+        """
+        from tui.apply import extract_code_proposals, generate_unified_diff
 
-        try:
-            _SKIP = {"__pycache__", "node_modules", ".git", ".venv", "venv", ".mypy_cache"}
-            entries = sorted(
-                e for e in os.listdir(cwd)
-                if e not in _SKIP and not (e.startswith(".") and e not in {".planning"})
+        self._session_id = checkpoint.session
+        self._prompt = checkpoint.prompt
+        self._convergence = checkpoint.convergence
+        separator = "\u2500" * 60
+        for agent, pane_id in (("claude", "#pane-left"), ("codex", "#pane-right")):
+            pane = self.query_one(pane_id, AgentPane)
+            pane.write_token(separator)
+            for line in checkpoint.lines.get(agent, []):
+                pane.write_token(line)
+            self._agent_line_counts[agent] = len(checkpoint.lines.get(agent, []))
+
+        if checkpoint.state in (SessionState.STREAMING.name, SessionState.CLASSIFYING.name):
+            texts = {a: "\n".join(lines) for a, lines in checkpoint.lines.items()}
+            self._last_texts = {a: t for a, t in texts.items() if t}
+            self._partial_agents = {a for a in self._last_texts if a not in checkpoint.finished}
+        else:
+            self._last_texts = dict(checkpoint.last_texts)
+            self._partial_agents = set(checkpoint.partial)
+        self._recon_proposals = {"claude": None, "codex": None}
+        for agent, proposal in checkpoint.proposals.items():
+            self._recon_proposals[agent] = CodeProposal(**proposal)
+        for agent, text in self._last_texts.items():
+            if self._recon_proposals.get(agent) is None:
+                proposals = extract_code_proposals(text)
+                self._recon_proposals[agent] = proposals[-1] if proposals else None
+
+        diff = checkpoint.diff
+        if not diff:
+            claude, codex = self._recon_proposals["claude"], self._recon_proposals["codex"]
+            diff = generate_unified_diff(
+                claude.code if claude else self._last_texts.get("claude", ""),
+                codex.code if codex else self._last_texts.get("codex", ""),
+                fromfile="claude", tofile="codex",
             )
-            if entries:
-                lines.append(f"Project root: {', '.join(entries[:30])}")
-        except Exception:
-            pass
+        self._review_diff = diff
+        code_found = any(p is not None for p in self._recon_proposals.values())
+        self.query_one("#recon-panel", ReconciliationPanel).show_reconciliation(diff, code_found=code_found)
+        self.session_state = SessionState.REVIEWING
+        self.query_one("#status-bar", StatusBar).update(
+            f"Resumed session {checkpoint.session} (interrupted while "
+            f"{checkpoint.state.lower().replace('_', ' ')}) — no agents re-run"
+        )
+        self.query_one("#review-bar", ReviewBar).show()
 
-        return "\n".join(lines)
+    def on_context_retrieved(self, message: ContextRetrieved) -> None:
+        """Note the retrieved context (and what it cost) at the top of both panes."""
+        note = (
+            f"[context: {message.snippets} file excerpt(s), {message.size / 1024:.1f} KB, "
+            f"query {message.query_ms:.0f} ms  •  index: {message.files} files, "
+            f"updated in {message.build_ms:.0f} ms]"
+        )
+        self.query_one("#pane-left", AgentPane).write_token(note)
+        self.query_one("#pane-right", AgentPane).write_token(note)
 
     # --- Prompt submission ---
 
@@ -180,7 +463,9 @@ class AgentBureauApp(App):
         event.input.clear()
         self._start_session(prompt)
 
-    def _start_session(self, prompt: str) -> None:
+    def _start_session(self, prompt: str, race: bool | None = None) -> None:
+        """Start a session for prompt; race defaults to the race_mode toggle."""
+        race = self.race_mode if race is None else race
         self._terminal_events = {}
         self._agent_line_counts = {"claude": 0, "codex": 0}
         self._last_texts = {}
@@ -188,6 +473,23 @@ class AgentBureauApp(App):
         self._agreed_code = ""
         self._agreed_language = "python"
         self._agreed_filename = None
+        self._partial_agents = set()
+        self._quorum_pending = set()
+        self._classified_early = False
+        self._review_diff = ""
+        self._convergence = ""
+        self._unsaved_lines = {}
+        self._session_started = time.monotonic()
+        self._first_token_at = {}
+        self._apply_source = ""
+        self._reused = False
+        self._race_winner = None
+        self._prompt = prompt
+        if self.daemon_socket is not None:
+            self._session_id = ""  # assigned (and journaled) by the daemon
+        else:
+            self._session_id = new_session_id()
+            self._journal_stage("prompt", prompt=prompt, race_mode=race)
 
         self.query_one("#recon-panel", ReconciliationPanel).hide_panel()
         self.query_one("#review-bar", ReviewBar).hide()
@@ -196,40 +498,178 @@ class AgentBureauApp(App):
         self.query_one("#pane-left", AgentPane).write_token(separator)
         self.query_one("#pane-right", AgentPane).write_token(separator)
 
+        self._reuse = None
+        if self._solutions is not None:
+            self._reuse = self._solutions.find(prompt, self._env_fingerprint)
+        if self._reuse is not None:
+            note = (
+                f"[similar to a past prompt ({self._reuse.similarity:.0%}): press u to reuse "
+                f"the solution applied to {self._reuse.solution.filename or 'the project'}]"
+            )
+            self.query_one("#pane-left", AgentPane).write_token(note)
+            self.query_one("#pane-right", AgentPane).write_token(note)
+
+        if self.daemon_socket is not None:
+            self._follow_daemon_session(prompt=prompt)
+            return
         self.query_one("#pane-left", AgentPane).show_loading()
         self.query_one("#pane-right", AgentPane).show_loading()
         self.session_state = SessionState.STREAMING
-        env_ctx = self._gather_env_context()
-        full_prompt = f"## Environment\n{env_ctx}\n\n## Task\n{prompt}" if env_ctx else prompt
+        session = self._run_race_session if race else self._run_session
         self.run_worker(
-            self._run_session(full_prompt),
+            session(prompt),
             exclusive=True,
             exit_on_error=False,
             name="bridge-session",
         )
 
     async def _run_session(self, prompt: str) -> None:
-        """Worker: fan-out to both agents simultaneously, collect responses."""
-        from tui.bridge import _stream_pipe, CLAUDE, CODEX
+        """Worker: fan-out to both agents simultaneously, collect responses.
+
+        Once self.quorum.quorum agents have finished, a grace timer starts; if it
+        expires before the rest finish, QuorumReached lets classification run on
+        what has arrived while the late agents keep streaming.
+        """
+        from tui.bridge import _stream_hedged, CLAUDE, CODEX
 
+        prompt = await self._with_env_context(prompt)
+        loop = asyncio.get_running_loop()
         q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
         collected: dict[str, list[str]] = {"claude": [], "codex": []}
+        failed: set[str] = set()
+        finished: set[str] = set()
+        grace_deadline: float | None = None
+        quorum_armed = True
 
-        task_a = asyncio.create_task(_stream_pipe(CLAUDE, prompt, 60.0, q))
-        task_b = asyncio.create_task(_stream_pipe(CODEX, prompt, 60.0, q))
+        task_a = asyncio.create_task(
+            _stream_hedged(CLAUDE, prompt, 60.0, q, stage="stream", history=self._latency)
+        )
+        task_b = asyncio.create_task(
+            _stream_hedged(CODEX, prompt, 60.0, q, stage="stream", history=self._latency)
+        )
 
         terminal_count = 0
-        while terminal_count < 2:
-            event = await q.get()
+        try:
+            while terminal_count < 2:
+                wait = None if grace_deadline is None else max(0.0, grace_deadline - loop.time())
+                try:
+                    event = await asyncio.wait_for(q.get(), wait)
+                except asyncio.TimeoutError:
+                    pending = tuple(a for a in collected if a not in finished)
+                    self.post_message(QuorumReached(
+                        pending=pending,
+                        partial_texts={a: "\n".join(collected[a]) for a in pending},
+                    ))
+                    grace_deadline = None
+                    continue
+                if event.type == "token":
+                    self.post_message(TokenReceived(agent=event.agent, text=event.text))
+                    collected[event.agent].append(event.text)
+                elif event.type in ("done", "error", "timeout"):
+                    self.post_message(AgentFinished(agent=event.agent, event=event))
+                    if event.type != "done":
+                        failed.add(event.agent)
+                    finished.add(event.agent)
+                    terminal_count += 1
+                    if quorum_armed and self.quorum.quorum <= terminal_count < 2:
+                        grace_deadline = loop.time() + self.quorum.grace
+                        quorum_armed = False
+                if terminal_count == 2:
+                    grace_deadline = None
+
+            await asyncio.gather(task_a, task_b)
+        finally:
+            # Cancelling the worker (e.g. `u`) must stop the agents too.
+            task_a.cancel()
+            task_b.cancel()
+        self._last_texts = {
+            k: "\n".join(v) for k, v in collected.items()
+            if self.continue_from_partial or k not in failed
+        }
+        await self._save_latency_history()
+
+    async def _run_race_session(self, prompt: str) -> None:
+        """Worker: race both agents; the first to answer with code wins.
+
+        Tokens stream into the panes as usual. If a winner emerges the losers are
+        cancelled and RaceWon skips classification and reconciliation. If nobody
+        qualifies, terminal events are replayed so the normal flow takes over.
+        """
+        from tui.bridge import run_race, CLAUDE, CODEX
+        from tui.stats import RaceLedger
+
+        prompt = await self._with_env_context(prompt)
+
+        def _forward(event: BridgeEvent) -> None:
             if event.type == "token":
                 self.post_message(TokenReceived(agent=event.agent, text=event.text))
-                collected[event.agent].append(event.text)
-            elif event.type in ("done", "error", "timeout"):
-                self.post_message(AgentFinished(agent=event.agent, event=event))
-                terminal_count += 1
 
-        await asyncio.gather(task_a, task_b)
-        self._last_texts = {k: "\n".join(v) for k, v in collected.items()}
+        result = await run_race(prompt, (CLAUDE, CODEX), 60.0, use_pty=False, on_event=_forward)
+
+        ledger = await asyncio.to_thread(RaceLedger.load)
+        saved = ledger.record(
+            [CLAUDE.name, CODEX.name], result.winner, result.elapsed, result.cancelled
+        )
+        await asyncio.to_thread(ledger.save)
+
+        winning = result.winner_event
+        if winning is None:
+            for event in result.events:
+                if event.type in ("done", "error", "timeout"):
+                    self.post_message(AgentFinished(agent=event.agent, event=event))
+            return
+        self.post_message(RaceWon(
+            winner=winning.agent,
+            full_text=winning.full_text,
+            elapsed=result.elapsed,
+            latency_saved=saved,
+        ))
+
+    def _follow_daemon_session(self, prompt: str | None = None, attach: str | None = None) -> None:
+        """Run prompt in the daemon, or follow its session `attach`, showing the events here."""
+        self.query_one("#pane-left", AgentPane).show_loading()
+        self.query_one("#pane-right", AgentPane).show_loading()
+        self.session_state = SessionState.STREAMING
+        self.run_worker(
+            self._run_daemon_session(prompt, attach),
+            exclusive=True,
+            exit_on_error=False,
+            name="bridge-session",
+        )
+
+    async def _run_daemon_session(self, prompt: str | None, attach: str | None) -> None:
+        """Worker: submit prompt to the daemon (or attach to a session) and relay its events.
+
+        Tokens become TokenReceived, everything else DaemonEvent. The agents,
+        classification and reconciliation rounds run in the daemon, so
+        cancelling this worker or quitting only drops the connection: the
+        session goes on and `agent-bureau --attach SESSION` replays it.
+        """
+        from tui.daemon import request
+
+        ended = False
+        try:
+            if attach is None:
+                context = await self._env_context_for(prompt or "")
+                payload = {"op": "submit", "prompt": prompt, "context": context, "follow": True}
+            else:
+                async for reply in request({"op": "list"}, self.daemon_socket):
+                    for summary in reply.get("sessions", []):
+                        if summary["session"] == attach:
+                            self.post_message(DaemonEvent({"type": "attached", **summary}))
+                payload = {"op": "attach", "session": attach, "offset": 0}
+            async for record in request(payload, self.daemon_socket):
+                if record["type"] == "token":
+                    self.post_message(TokenReceived(agent=record["agent"], text=record["text"]))
+                    continue
+                ended = record["type"] in ("result", "failed", "cancelled", "rejected")
+                self.post_message(DaemonEvent(record))
+        except OSError as exc:
+            message = f"cannot reach the daemon at {self.daemon_socket}: {exc}"
+        else:
+            message = "the daemon closed the connection"
+        if not ended:
+            self.post_message(DaemonEvent({"type": "rejected", "message": message}))
 
     # --- Message handlers ---
 
@@ -237,11 +677,14 @@ class AgentBureauApp(App):
         pane_id = "#pane-left" if message.agent == "claude" else "#pane-right"
         pane = self.query_one(pane_id, AgentPane)
         pane.write_token(message.text)
+        self._unsaved_lines.setdefault(message.agent, []).append(message.text)
+        self._first_token_at.setdefault(message.agent, time.monotonic())
         self._agent_line_counts[message.agent] = (
             self._agent_line_counts.get(message.agent, 0) + 1
         )
-        # Don't overwrite "Reconciling..." status bar while reconciliation is streaming
-        if self.session_state != SessionState.RECONCILING:
+        # Don't overwrite "Reconciling..." status bar while reconciliation is streaming,
+        # nor an early quorum classification while a late agent is still streaming.
+        if self.session_state != SessionState.RECONCILING and not self._quorum_pending:
             self.query_one("#status-bar", StatusBar).show_streaming(self._agent_line_counts)
 
         left = self.query_one("#pane-left", AgentPane)
@@ -250,29 +693,61 @@ class AgentBureauApp(App):
             self.action_clear_panes()
 
     def on_agent_finished(self, message: AgentFinished) -> None:
+        if self.session_state in (SessionState.REVIEWING, SessionState.CONFIRMING_APPLY):
+            return  # posted before the session was cut short (e.g. a reused solution)
         event = message.event
         pane_id = "#pane-left" if message.agent == "claude" else "#pane-right"
-        pane = self.query_one(pane_id, AgentPane)
-
-        if isinstance(event, AgentError):
-            pane.write_token(f"[error: agent exited with code {event.exit_code}]")
-        elif isinstance(event, AgentTimeout):
-            pane.write_token("[error: agent timed out]")
+        note = _failure_note(event, self.continue_from_partial)
+        if note:
+            self.query_one(pane_id, AgentPane).write_token(note)
 
         self._terminal_events[message.agent] = event
-        self.query_one("#status-bar", StatusBar).show_done(self._agent_line_counts)
+        self._quorum_pending.discard(message.agent)
+        first_token = self._first_token_at.get(message.agent)
+        self._journal_stage(
+            "stream", agent=message.agent, status=event.type,
+            elapsed=round(time.monotonic() - self._session_started, 3),
+            ttft=round(first_token - self._session_started, 3) if first_token is not None else None,
+            text=terminal_text(event),
+        )
+        if self.session_state == SessionState.STREAMING and not self._classified_early:
+            self.query_one("#status-bar", StatusBar).show_done(self._agent_line_counts)
 
         if len(self._terminal_events) == 2:
+            if self._classified_early and not self.quorum.reclassify_late:
+                # Late agent finished: keep the early classification, reconcile now.
+                self._last_texts[message.agent] = terminal_text(event)
+                if isinstance(event, AgentDone):
+                    self._partial_agents.discard(message.agent)
+                self._start_reconciliation()
+                return
             self.session_state = SessionState.CLASSIFYING
             self._run_classification()
 
-    def _run_classification(self) -> None:
+    def on_quorum_reached(self, message: QuorumReached) -> None:
+        """Classify early on what has arrived; late agents keep streaming."""
+        if self.session_state != SessionState.STREAMING or len(self._terminal_events) == 2:
+            return
+        self._quorum_pending = set(message.pending)
+        self._classified_early = True
+        self._run_classification(extra_partial=message.partial_texts)
+
+    def _run_classification(self, extra_partial: dict[str, str] | None = None) -> None:
+        """Classify finished agents' texts (plus extra_partial, for agents still running)."""
         from disagree_v1.classifier import classify_disagreements
 
         full_texts: dict[str, str] = {}
+        partial: list[str] = []
         for agent_name, event in self._terminal_events.items():
             if isinstance(event, AgentDone):
                 full_texts[agent_name] = event.full_text
+            elif self.continue_from_partial and terminal_text(event):
+                full_texts[agent_name] = terminal_text(event)
+                partial.append(agent_name)
+        for agent_name, text in (extra_partial or {}).items():
+            if text:
+                full_texts[agent_name] = text
+                partial.append(agent_name)
 
         disagreements: list = []
         texts = list(full_texts.values())
@@ -282,12 +757,28 @@ class AgentBureauApp(App):
             except Exception:
                 disagreements = []
 
-        self.post_message(ClassificationDone(disagreements=disagreements, full_texts=full_texts))
+        self.post_message(ClassificationDone(
+            disagreements=disagreements, full_texts=full_texts, partial=tuple(partial)
+        ))
 
     def on_classification_done(self, message: ClassificationDone) -> None:
         """Apply classification visuals, then automatically start reconciliation."""
         status_bar = self.query_one("#status-bar", StatusBar)
-        status_bar.show_classification(self._agent_line_counts, message.disagreements)
+        status_bar.show_classification(
+            self._agent_line_counts, message.disagreements, message.partial,
+            pending=tuple(sorted(self._quorum_pending)),
+        )
+        self._partial_agents = set(message.partial)
+        # Same keys as the log's earlier records: prompt, agent_a, agent_b, disagreements
+        # (long texts in them are blob references on disk; see tui.journal).
+        self._journal_stage(
+            "classification",
+            prompt=self._prompt,
+            agent_a={"name": "claude", "answer": message.full_texts.get("claude", "")},
+            agent_b={"name": "codex", "answer": message.full_texts.get("codex", "")},
+            disagreements=[{"kind": d.kind, "summary": d.summary} for d in message.disagreements],
+            partial=list(message.partial),
+        )
 
         has_disagreements = bool(message.disagreements)
         self.query_one("#pane-left", AgentPane).set_disagreement_highlight(has_disagreements)
@@ -298,96 +789,111 @@ class AgentBureauApp(App):
             if text:
                 self._last_texts[agent] = text
 
+        if self._quorum_pending:
+            # Early quorum classification: reconciliation waits for late agents.
+            status_bar.show_quorum_wait(sorted(self._quorum_pending))
+            return
+        if self.session_state != SessionState.CLASSIFYING:
+            return  # stale early classification; reconciliation already under way
+
         # Auto-start reconciliation — no user action required
+        self._start_reconciliation()
+
+    def _start_reconciliation(self, delta: bool = False) -> None:
         self.session_state = SessionState.RECONCILING
         self.query_one("#status-bar", StatusBar).show_reconciling()
         self.query_one("#pane-left", AgentPane).show_loading()
         self.query_one("#pane-right", AgentPane).show_loading()
         self.run_worker(
-            self._run_reconciliation(),
+            self._run_reconciliation(delta=delta),
             exclusive=False,
             exit_on_error=False,
             name="reconciliation",
         )
 
-    async def _run_reconciliation(self) -> None:
-        """Worker: each agent sees the other's response and proposes a unified solution.
+    async def _run_reconciliation(self, delta: bool = False) -> None:
+        """Worker: run reconciliation rounds until the ConvergencePolicy stops the loop.
 
-        Both reconciliation responses stream to their respective panes (with a
-        separator line). After both finish, _last_texts is updated to the
-        reconciliation outputs so that 'reconcile further' naturally feeds those
-        into the next round.
+        The loop is tui.reconcile.run_reconciliation(): rounds after the first
+        are delta rounds, and so is the first with delta=True ("reconcile
+        further"). After each round _last_texts and _recon_proposals hold its
+        outcome, so a later round builds on it, and ReconcileRoundDone reports
+        its score. The diff of the last round is posted as ReconciliationReady
+        for review.
         """
-        from tui.bridge import _stream_pipe, CLAUDE, CODEX
-        from tui.apply import extract_code_proposals, generate_unified_diff
+        from tui.apply import generate_unified_diff
+
+        def _on_round(result: RoundResult) -> None:
+            self._last_texts = dict(result.texts)
+            self._recon_proposals = dict(result.proposals)
+            self._partial_agents = set()
+            self.post_message(ReconcileRoundDone(
+                round=result.round, similarity=result.similarity, stop_reason=result.stop_reason,
+            ))
+
+        last = await run_reconciliation(
+            dict(self._last_texts), dict(self._recon_proposals), self._reconcile_round,
+            policy=self.convergence, budget=self.reconcile_token_budget,
+            partial=set(self._partial_agents), delta=delta, on_round=_on_round,
+        )
+        claude, codex = last.proposals["claude"], last.proposals["codex"]
+        diff_text = generate_unified_diff(
+            claude.code if claude else last.texts["claude"],
+            codex.code if codex else last.texts["codex"],
+            fromfile="claude-recon", tofile="codex-recon",
+        )
+        convergence = (
+            f"{last.round} round{'s' if last.round != 1 else ''}, "
+            f"{last.similarity:.0%} similar ({last.stop_reason})"
+        )
+        self.post_message(ReconciliationReady(diff_text=diff_text, convergence=convergence))
+
+    async def _reconcile_round(self, prompts: dict[str, str]) -> dict[str, str]:
+        """Send one round's prompts, streaming both replies into the panes.
 
-        claude_text = self._last_texts.get("claude", "")
-        codex_text = self._last_texts.get("codex", "")
+        Each pane gets a separator line first. Returns each agent's reply: the
+        lines it streamed (whatever arrived, if it failed).
+        """
+        from tui.bridge import _stream_hedged, CLAUDE, CODEX
 
         separator = "\u2500" * 60
         self.post_message(TokenReceived(agent="claude", text=separator))
         self.post_message(TokenReceived(agent="codex", text=separator))
 
-        claude_prompt = (
-            f"You previously proposed:\n{claude_text}\n\n"
-            f"Here is what Codex proposed:\n{codex_text}\n\n"
-            f"Review both approaches. Identify the strengths of each and produce "
-            f"the best unified solution. Write a brief explanation, then provide "
-            f"the final code in a fenced block with the target filename as the "
-            f"first line comment (e.g. # src/module.py)."
-        )
-        codex_prompt = (
-            f"You previously proposed:\n{codex_text}\n\n"
-            f"Here is what Claude proposed:\n{claude_text}\n\n"
-            f"Review both approaches. Identify the strengths of each and produce "
-            f"the best unified solution. Write a brief explanation, then provide "
-            f"the final code in a fenced block with the target filename as the "
-            f"first line comment (e.g. # src/module.py)."
-        )
-
         q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
         collected: dict[str, list[str]] = {"claude": [], "codex": []}
 
-        task_a = asyncio.create_task(_stream_pipe(CLAUDE, claude_prompt, 90.0, q))
-        task_b = asyncio.create_task(_stream_pipe(CODEX, codex_prompt, 90.0, q))
-
-        terminal_count = 0
-        while terminal_count < 2:
-            event = await q.get()
-            if event.type == "token":
-                self.post_message(TokenReceived(agent=event.agent, text=event.text))
-                collected[event.agent].append(event.text)
-            elif event.type in ("done", "error", "timeout"):
-                terminal_count += 1
-
-        await asyncio.gather(task_a, task_b)
-
-        recon_claude = "\n".join(collected["claude"])
-        recon_codex = "\n".join(collected["codex"])
-
-        # Update _last_texts so "reconcile further" builds on these outputs
-        self._last_texts = {"claude": recon_claude, "codex": recon_codex}
-
-        # Extract code proposals for apply actions
-        claude_proposals = extract_code_proposals(recon_claude)
-        codex_proposals = extract_code_proposals(recon_codex)
-        self._recon_proposals = {
-            "claude": claude_proposals[-1] if claude_proposals else None,
-            "codex": codex_proposals[-1] if codex_proposals else None,
-        }
-
-        # Diff between the two reconciliation proposals
-        claude_code = self._recon_proposals["claude"].code if self._recon_proposals["claude"] else recon_claude
-        codex_code = self._recon_proposals["codex"].code if self._recon_proposals["codex"] else recon_codex
-        diff_text = generate_unified_diff(
-            claude_code, codex_code,
-            fromfile="claude-recon", tofile="codex-recon"
+        task_a = asyncio.create_task(
+            _stream_hedged(CLAUDE, prompts["claude"], 90.0, q, stage="reconcile",
+                           history=self._latency)
+        )
+        task_b = asyncio.create_task(
+            _stream_hedged(CODEX, prompts["codex"], 90.0, q, stage="reconcile",
+                           history=self._latency)
         )
 
-        self.post_message(ReconciliationReady(diff_text=diff_text))
+        terminal_count = 0
+        try:
+            while terminal_count < 2:
+                event = await q.get()
+                if event.type == "token":
+                    self.post_message(TokenReceived(agent=event.agent, text=event.text))
+                    collected[event.agent].append(event.text)
+                elif event.type in ("done", "error", "timeout"):
+                    terminal_count += 1
+
+            await asyncio.gather(task_a, task_b)
+        finally:
+            task_a.cancel()
+            task_b.cancel()
+        await self._save_latency_history()
+        return {agent: "\n".join(lines) for agent, lines in collected.items()}
 
     def on_reconciliation_ready(self, message: ReconciliationReady) -> None:
         """Show reconciliation panel and review bar."""
+        self._hunks = []
+        self._review_diff = message.diff_text
+        self._convergence = message.convergence
         code_found = (
             self._recon_proposals.get("claude") is not None
             or self._recon_proposals.get("codex") is not None
@@ -396,8 +902,135 @@ class AgentBureauApp(App):
             message.diff_text, code_found=code_found
         )
         self.session_state = SessionState.REVIEWING
-        self.query_one("#status-bar", StatusBar).show_reviewing(self._agent_line_counts)
+        self.query_one("#status-bar", StatusBar).show_reviewing(
+            self._agent_line_counts, convergence=message.convergence
+        )
         self.query_one("#review-bar", ReviewBar).show()
+        self._start_speculative_merge()
+
+    def on_reconcile_round_done(self, message: ReconcileRoundDone) -> None:
+        """Show the per-round convergence metric while the loop runs."""
+        self.query_one("#status-bar", StatusBar).show_convergence(
+            message.round, message.similarity, message.stop_reason
+        )
+        self._journal_stage(
+            "reconcile_round", round=message.round, similarity=message.similarity,
+            stop_reason=message.stop_reason,
+            proposals=self._proposal_records(),
+        )
+
+    def on_daemon_event(self, message: DaemonEvent) -> None:
+        """Show one event of a daemon-run session the way the local pipeline would."""
+        record = message.record
+        kind = record["type"]
+        status_bar = self.query_one("#status-bar", StatusBar)
+        panes = {
+            "claude": self.query_one("#pane-left", AgentPane),
+            "codex": self.query_one("#pane-right", AgentPane),
+        }
+        if kind in ("accepted", "attached"):
+            self._session_id = record["session"]
+            self._prompt = record.get("prompt", self._prompt)
+            self._remote_running = True
+        elif kind in ("done", "error", "timeout"):
+            if record["phase"] != "stream":
+                return  # reconcile rounds are summarized by reconcile_round
+            event = record_event(record)
+            self._terminal_events[event.agent] = event
+            note = _failure_note(event, self.continue_from_partial)
+            if note:
+                panes[event.agent].write_token(note)
+            if len(self._terminal_events) == 2:
+                status_bar.show_done(self._agent_line_counts)
+        elif kind == "classification":
+            from disagree_v1.models import Disagreement
+
+            disagreements = [Disagreement(d["kind"], d["summary"]) for d in record["disagreements"]]
+            status_bar.show_classification(
+                self._agent_line_counts, disagreements, tuple(record["partial"])
+            )
+            for pane in panes.values():
+                pane.set_disagreement_highlight(bool(disagreements))
+            self.session_state = SessionState.RECONCILING
+            status_bar.show_reconciling()
+            self._write_round_separator()
+        elif kind == "reconcile_round":
+            status_bar.show_convergence(record["round"], record["similarity"], record["stop_reason"])
+            if record["stop_reason"] is None:
+                self._write_round_separator()
+        elif kind == "result":
+            self._remote_running = False
+            for pane in panes.values():
+                pane.hide_loading()
+            self._show_daemon_result(record)
+        else:  # failed, cancelled, rejected
+            self._remote_running = False
+            for pane in panes.values():
+                pane.hide_loading()
+            detail = f": {record['message']}" if record.get("message") else ""
+            status_bar.update(f"Daemon session {kind}{detail}")
+            self.session_state = SessionState.IDLE
+
+    def _write_round_separator(self) -> None:
+        """A reconciliation round starts in the daemon: separate it in both panes."""
+        separator = "\u2500" * 60
+        self.query_one("#pane-left", AgentPane).write_token(separator)
+        self.query_one("#pane-right", AgentPane).write_token(separator)
+
+    def _show_daemon_result(self, record: dict) -> None:
+        """Open review on a daemon session's final proposals; review actions run locally."""
+        from tui.apply import generate_unified_diff
+
+        proposals = {agent: CodeProposal(**p) for agent, p in record["proposals"].items()}
+        self._recon_proposals = {agent: proposals.get(agent) for agent in ("claude", "codex")}
+        self._last_texts = {agent: render_proposal(p) for agent, p in proposals.items()}
+        self._partial_agents = set() if record["rounds"] else set(record["partial"])
+        claude, codex = self._recon_proposals["claude"], self._recon_proposals["codex"]
+        diff_text = generate_unified_diff(
+            claude.code if claude else "", codex.code if codex else "",
+            fromfile="claude-recon", tofile="codex-recon",
+        )
+        rounds = record["rounds"]
+        if rounds:
+            convergence = (
+                f"{rounds} round{'s' if rounds != 1 else ''}, "
+                f"{record['similarity']:.0%} similar ({record['stop_reason']})"
+            )
+        else:
+            convergence = record["stop_reason"]
+        self.post_message(ReconciliationReady(diff_text=diff_text, convergence=convergence))
+
+    def on_race_won(self, message: RaceWon) -> None:
+        """Skip classification and reconciliation: go straight to review of the winner."""
+        from tui.apply import extract_code_proposals
+
+        for agent, pane_id in (("claude", "#pane-left"), ("codex", "#pane-right")):
+            pane = self.query_one(pane_id, AgentPane)
+            pane.hide_loading()
+            if agent != message.winner:
+                pane.write_token(f"[cancelled: {message.winner} won the race]")
+
+        self._journal_stage(
+            "race", winner=message.winner, text=message.full_text,
+            elapsed=message.elapsed, latency_saved=message.latency_saved,
+        )
+        proposals = extract_code_proposals(message.full_text)
+        self._last_texts = {message.winner: message.full_text}
+        self._recon_proposals = {"claude": None, "codex": None}
+        self._recon_proposals[message.winner] = proposals[-1] if proposals else None
+        self._race_winner = message.winner
+
+        winner = proposals[-1] if proposals else None
+        self.query_one("#recon-panel", ReconciliationPanel).show_race_winner(
+            message.winner,
+            winner.code if winner else message.full_text,
+            winner.language if winner else "",
+        )
+        self.session_state = SessionState.REVIEWING
+        self.query_one("#status-bar", StatusBar).show_race_won(
+            message.winner, message.elapsed, message.latency_saved
+        )
+        self.query_one("#review-bar", ReviewBar).show_race(message.winner)
 
     def on_apply_result(self, message: ApplyResult) -> None:
         if message.confirmed and message.files_written:
@@ -406,6 +1039,18 @@ class AgentBureauApp(App):
             status_text = "Applied — no files detected in reconciliation output"
         else:
             status_text = "Cancelled — no files written"
+        self._journal_stage(
+            "apply", confirmed=message.confirmed, files=list(message.files_written),
+            source=self._apply_source,
+        )
+        if message.confirmed and message.files_written and self._prompt and self._solutions is not None:
+            self._solutions.add(Solution(
+                prompt=self._prompt, env=self._env_fingerprint, code=self._agreed_code,
+                language=self._agreed_language, filename=message.files_written[0],
+                session=self._session_id, ts=time.time(),
+            ))
+            self.run_worker(self._solutions.save, thread=True, exit_on_error=False,
+                            name="save-solutions")
 
         self.query_one("#status-bar", StatusBar).update(status_text)
         self.query_one("#review-bar", ReviewBar).hide()
@@ -414,25 +1059,39 @@ class AgentBureauApp(App):
 
     # --- Review actions (only honoured during REVIEWING state) ---
 
+    def _race_hint(self) -> None:
+        """After a race only the winner's answer exists: say which keys still apply."""
+        winner = self._race_winner or ""
+        key = "c" if winner == "claude" else "x"
+        self.query_one("#status-bar", StatusBar).update(
+            f"{winner.capitalize()} won the race and the other agent was cancelled — "
+            f"press {key} to apply its answer or r to run both agents normally"
+        )
+
     def action_reconcile_again(self) -> None:
         if self.session_state != SessionState.REVIEWING:
             return
+        if self._race_winner is not None:
+            # Nothing to reconcile against: rerun the prompt through both agents instead.
+            self._start_session(self._prompt, race=False)
+            return
         self.query_one("#review-bar", ReviewBar).hide()
         self.query_one("#recon-panel", ReconciliationPanel).hide_panel()
-        self.session_state = SessionState.RECONCILING
-        self.query_one("#status-bar", StatusBar).show_reconciling()
-        self.query_one("#pane-left", AgentPane).show_loading()
-        self.query_one("#pane-right", AgentPane).show_loading()
-        self.run_worker(
-            self._run_reconciliation(),
-            exclusive=False,
-            exit_on_error=False,
-            name="reconciliation",
-        )
+        self._hunks = []
+        self._cancel_speculative_merge()
+        self._start_reconciliation(delta=True)
 
     def action_accept_claude(self) -> None:
         if self.session_state != SessionState.REVIEWING:
             return
+        if self._race_winner not in (None, "claude"):
+            self._race_hint()
+            return
+        if self._hunks:
+            self._pick_hunk("claude")
+            return
+        self._cancel_speculative_merge()
+        self._apply_source = "reuse" if self._reused else "claude"
         proposal = self._recon_proposals.get("claude")
         if proposal is not None:
             self._agreed_code = proposal.code
@@ -447,6 +1106,14 @@ class AgentBureauApp(App):
     def action_accept_codex(self) -> None:
         if self.session_state != SessionState.REVIEWING:
             return
+        if self._race_winner not in (None, "codex"):
+            self._race_hint()
+            return
+        if self._hunks:
+            self._pick_hunk("codex")
+            return
+        self._cancel_speculative_merge()
+        self._apply_source = "reuse" if self._reused else "codex"
         proposal = self._recon_proposals.get("codex")
         if proposal is not None:
             self._agreed_code = proposal.code
@@ -459,24 +1126,221 @@ class AgentBureauApp(App):
         self._start_apply()
 
     def action_merge_and_apply(self) -> None:
-        """Merge both reconciliation outputs via a single Claude call, then apply."""
+        """Merge both reconciliation outputs via a single Claude call, then apply.
+
+        Uses the speculative merge started on entering review: instant if it has
+        finished, otherwise its in-flight call is awaited rather than restarted.
+        """
         if self.session_state != SessionState.REVIEWING:
             return
+        if self._race_winner is not None:
+            self._race_hint()
+            return
+        self._hunks = []
+        pending, self._speculative_merge = self._speculative_merge, None
+        if pending is not None and pending.state == WorkerState.SUCCESS:
+            self._finish_merge(pending.result)
+            return
         self.query_one("#review-bar", ReviewBar).hide()
         self.session_state = SessionState.RECONCILING
         self.query_one("#status-bar", StatusBar).update("Merging — producing final unified solution...")
         self.run_worker(
-            self._run_merge_and_apply(),
+            self._run_merge_and_apply(pending),
             exclusive=False,
             exit_on_error=False,
             name="merge-apply",
         )
 
-    async def _run_merge_and_apply(self) -> None:
-        """Worker: single Claude call that merges both recon outputs into one result."""
-        from tui.bridge import _stream_pipe, CLAUDE
-        from tui.apply import extract_code_proposals
+    def action_reuse_solution(self) -> None:
+        """Skip the agent round: stop the agents and review the offered past solution."""
+        match = self._reuse
+        if match is None or self.session_state in (SessionState.IDLE, SessionState.CONFIRMING_APPLY):
+            return
+        for worker in self.workers:
+            if worker.name in ("bridge-session", "reconciliation"):
+                worker.cancel()
+        self._cancel_speculative_merge()
+        self._hunks = []
+        self._reuse = None
+        self._reused = True
+        self._race_winner = None
+        solution = match.solution
+        proposal = CodeProposal(language=solution.language, code=solution.code, filename=solution.filename)
+        # Both sides carry the solution, so c, x and y all apply it unchanged.
+        self._recon_proposals = {"claude": proposal, "codex": proposal}
+        self._last_texts = {"claude": render_proposal(proposal), "codex": render_proposal(proposal)}
+        for pane_id in ("#pane-left", "#pane-right"):
+            pane = self.query_one(pane_id, AgentPane)
+            pane.hide_loading()
+            pane.write_token("[stopped: reusing a past solution]")
+        self._journal_stage("reuse", source=solution.session, similarity=match.similarity)
+        self.query_one("#recon-panel", ReconciliationPanel).show_reused(
+            match.similarity, solution.prompt, solution.code, solution.language
+        )
+        self.session_state = SessionState.REVIEWING
+        self.query_one("#status-bar", StatusBar).update(
+            f"Reusing the solution from a {match.similarity:.0%} similar prompt — no agent round needed"
+        )
+        self.query_one("#review-bar", ReviewBar).show()
+
+    # --- Per-hunk picking (REVIEWING, after `h`) ---
+
+    def action_pick_hunks(self) -> None:
+        """Split the two proposals into hunks and let the user pick a side for each."""
+        if self.session_state != SessionState.REVIEWING or self._hunks:
+            return
+        if self._race_winner is not None:
+            self._race_hint()
+            return
+        from tui.apply import diff_hunks
 
+        claude = self._recon_proposals.get("claude")
+        codex = self._recon_proposals.get("codex")
+        status = self.query_one("#status-bar", StatusBar)
+        if claude is None or codex is None:
+            status.update("Per-hunk picking needs code from both agents")
+            return
+        hunks = diff_hunks(claude.code, codex.code)
+        if not hunks:
+            status.update("Proposals are identical — press c to apply")
+            return
+        self._hunks = hunks
+        self._hunk_choices = ["claude"] * len(hunks)
+        self._hunk_cursor = 0
+        self.query_one("#review-bar", ReviewBar).show_hunk_mode(True)
+        self._show_hunks()
+
+    def _show_hunks(self) -> None:
+        self.query_one("#recon-panel", ReconciliationPanel).show_hunk_selection(
+            self._hunks, self._hunk_choices, self._hunk_cursor
+        )
+
+    def _pick_hunk(self, agent: str) -> None:
+        """Use agent's side for the current hunk and move on to the next one."""
+        self._hunk_choices[self._hunk_cursor] = agent
+        self._hunk_cursor = min(len(self._hunks) - 1, self._hunk_cursor + 1)
+        self._show_hunks()
+
+    def action_next_hunk(self) -> None:
+        if self._hunks:
+            self._hunk_cursor = min(len(self._hunks) - 1, self._hunk_cursor + 1)
+            self._show_hunks()
+
+    def action_prev_hunk(self) -> None:
+        if self._hunks:
+            self._hunk_cursor = max(0, self._hunk_cursor - 1)
+            self._show_hunks()
+
+    def action_leave_hunks(self) -> None:
+        """Back to the whole-answer review."""
+        if not self._hunks:
+            return
+        self._hunks = []
+        self.query_one("#review-bar", ReviewBar).show_hunk_mode(False)
+        self.query_one("#recon-panel", ReconciliationPanel).show_reconciliation(self._review_diff)
+
+    def action_apply_hunks(self) -> None:
+        """Assemble the picked sides locally and open the apply confirmation."""
+        if self.session_state != SessionState.REVIEWING or not self._hunks:
+            return
+        from tui.apply import apply_hunks
+
+        claude = self._recon_proposals["claude"]
+        codex = self._recon_proposals["codex"]
+        replacements = {
+            index: hunk.b_lines
+            for index, (hunk, choice) in enumerate(zip(self._hunks, self._hunk_choices))
+            if choice == "codex"
+        }
+        self._agreed_code = apply_hunks(claude.code, self._hunks, replacements)
+        self._agreed_language = claude.language
+        self._agreed_filename = claude.filename or codex.filename
+        self._apply_source = "hunks"
+        self._hunks = []
+        self._cancel_speculative_merge()
+        self._start_apply()
+
+    def _start_speculative_merge(self) -> None:
+        """Start the merge call in the background so `y` is instant when pressed."""
+        self._cancel_speculative_merge()
+        if not self.speculative_merge:
+            return
+        if not (self._last_texts.get("claude") and self._last_texts.get("codex")):
+            return
+        self._speculative_merge = self.run_worker(
+            self._merge_proposals(),
+            exclusive=False,
+            exit_on_error=False,
+            name="speculative-merge",
+        )
+
+    def _cancel_speculative_merge(self) -> None:
+        """Abandon the speculative merge (the user chose another action)."""
+        if self._speculative_merge is not None:
+            self._speculative_merge.cancel()
+            self._speculative_merge = None
+
+    async def _run_merge_and_apply(self, pending: Worker | None = None) -> None:
+        """Worker: finish the merge (reusing a pending speculative call) and apply it."""
+        merged_text: str | None = None
+        if pending is not None:
+            try:
+                merged_text = await pending.wait()
+            except (WorkerCancelled, WorkerFailed):
+                merged_text = None
+        if merged_text is None:
+            merged_text = await self._merge_proposals()
+        self._finish_merge(merged_text)
+
+    async def _merge_proposals(self) -> str:
+        """Merge both reconciliation outputs; returns text with the merged code block.
+
+        Tries a local three-way merge first and only falls back to a full merge
+        call when the proposals cannot be merged line by line.
+        """
+        merged = await self._local_merge()
+        if merged is not None:
+            return merged
+        return await self._agent_merge()
+
+    async def _local_merge(self) -> str | None:
+        """Three-way merge both proposals against the file on disk.
+
+        Non-overlapping changes merge locally; only conflicting regions are sent
+        to Claude in one small prompt. Returns None when the proposals lack code
+        or target different files.
+        """
+        from tui.apply import read_base_file
+        from tui.merge import merge3
+
+        ours = self._recon_proposals.get("claude")
+        theirs = self._recon_proposals.get("codex")
+        if ours is None or theirs is None or ours.filename != theirs.filename:
+            return None
+        base = await asyncio.to_thread(read_base_file, ours.filename)
+        result = merge3(base, ours.code, theirs.code)
+
+        resolutions: dict[int, list[str]] = {}
+        if not result.clean:
+            prompt = build_conflict_prompt(
+                result.conflicts, ours.language, ours.filename, budget=self.reconcile_token_budget
+            )
+            reply = await self._ask_claude(prompt, stage="merge.conflicts")
+            resolutions = parse_delta_reply(reply)
+
+        conflicts = len(result.conflicts)
+        against = "the file on disk" if base is not None else "each other"
+        note = f"Merged locally against {against}: {result.auto_resolved} change(s) auto-merged"
+        if conflicts:
+            resolved = sum(1 for i in range(conflicts) if i in resolutions)
+            note += f", {resolved}/{conflicts} conflict(s) resolved by Claude"
+            if resolved < conflicts:
+                note += " (unresolved conflicts keep Claude's version)"
+        merged = CodeProposal(ours.language, result.render(resolutions), ours.filename)
+        return f"{note}.\n\n{render_proposal(merged)}"
+
+    async def _agent_merge(self) -> str:
+        """Single Claude call that merges both recon outputs; returns the merged text."""
         claude_recon = self._last_texts.get("claude", "")
         codex_recon = self._last_texts.get("codex", "")
 
@@ -489,19 +1353,36 @@ class AgentBureauApp(App):
             f"fenced block with the target filename as the first line comment."
         )
 
-        q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
-        task = asyncio.create_task(_stream_pipe(CLAUDE, merge_prompt, 90.0, q))
+        return await self._ask_claude(merge_prompt, stage="merge")
 
-        merged_tokens: list[str] = []
-        while True:
-            event = await q.get()
-            if event.type == "token":
-                merged_tokens.append(event.text)
-            elif event.type in ("done", "error", "timeout"):
-                break
-        await task
+    async def _ask_claude(self, prompt: str, stage: str) -> str:
+        """Send one prompt to Claude and return its collected output (partial on failure)."""
+        from tui.bridge import _stream_hedged, CLAUDE
+
+        q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+        task = asyncio.create_task(
+            _stream_hedged(CLAUDE, prompt, 90.0, q, stage=stage, history=self._latency)
+        )
+        tokens: list[str] = []
+        try:
+            while True:
+                event = await q.get()
+                if event.type == "token":
+                    tokens.append(event.text)
+                elif event.type in ("done", "error", "timeout"):
+                    break
+            await task
+        finally:
+            # Cancelling the speculative worker must also stop the agent process.
+            task.cancel()
+        await self._save_latency_history()
+        return "\n".join(tokens)
+
+    def _finish_merge(self, merged_text: str) -> None:
+        """Adopt merged_text as the agreed answer and open the apply confirmation."""
+        from tui.apply import extract_code_proposals
 
-        merged_text = "\n".join(merged_tokens)
+        self._apply_source = "reuse" if self._reused else "merge"
         proposals = extract_code_proposals(merged_text)
         if proposals:
             best = proposals[-1]
@@ -545,10 +1426,7 @@ class AgentBureauApp(App):
         # Use fallback filename when agents omit the filename comment
         target_filename = self._agreed_filename
         if not target_filename and self._agreed_code.strip():
-            _ext = {"python": "py", "javascript": "js", "typescript": "ts",
-                    "go": "go", "rust": "rs", "java": "java", "ruby": "rb",
-                    "bash": "sh", "shell": "sh"}.get(self._agreed_language, "txt")
-            target_filename = f"output.{_ext}"
+            target_filename = default_filename(self._agreed_language)
 
         confirmed: bool = await self.push_screen(
             ApplyConfirmScreen(filename=target_filename, code=self._agreed_code),
@@ -575,8 +1453,22 @@ class AgentBureauApp(App):
     def action_recon_grow(self) -> None:
         self.recon_height = min(50, self.recon_height + 2)
 
+    def action_toggle_race(self) -> None:
+        if self.daemon_socket is not None:
+            self.query_one("#status-bar", StatusBar).update(
+                "Race mode is not available while sessions run in the daemon"
+            )
+            return
+        self.race_mode = not self.race_mode
+        self.query_one("#status-bar", StatusBar).show_race_mode(self.race_mode)
+
     # --- Standard actions ---
 
+    def action_open_history(self) -> None:
+        """Browse and search past sessions."""
+        self._journal.flush(timeout=0.5)
+        self.push_screen(HistoryScreen())
+
     def action_focus_left(self) -> None:
         self.query_one("#pane-left", AgentPane).focus()
 
@@ -590,6 +1482,8 @@ class AgentBureauApp(App):
         self.push_screen(QuitScreen(), lambda result: self.exit() if result else None)
 
     def action_clear_panes(self) -> None:
+        self._cancel_speculative_merge()
+        self._hunks = []
         self.query_one("#pane-left", AgentPane).clear()
         self.query_one("#pane-right", AgentPane).clear()
         self.query_one("#recon-panel", ReconciliationPanel).hide_panel()
@@ -598,9 +1492,123 @@ class AgentBureauApp(App):
         self.query_one("#status-bar", StatusBar).show_hints()
 
 
-def main() -> None:
-    """Entry point for the `agent-bureau` CLI command."""
-    AgentBureauApp().run()
+def _failure_note(event: BridgeEvent, continue_from_partial: bool) -> str:
+    """The pane note for an agent that errored or timed out ("" for a success)."""
+    if isinstance(event, AgentError):
+        note = f"[error: agent exited with code {event.exit_code}"
+    elif isinstance(event, AgentTimeout) and event.idle:
+        note = "[error: agent stalled — no output before the inactivity timeout"
+    elif isinstance(event, AgentTimeout):
+        note = "[error: agent timed out"
+    else:
+        return ""
+    kept = terminal_text(event)
+    if kept and continue_from_partial:
+        note += f" — continuing from {len(kept.splitlines())} partial lines"
+    return note + "]"
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry point for the `agent-bureau` CLI command.
+
+    Headless subcommands (`stats`, `batch`, `run`, `daemon`; see tui.cli)
+    run instead of the TUI.
+    """
+    import argparse
+    import sys
+
+    from tui.cli import run_subcommand
+
+    argv = sys.argv[1:] if argv is None else argv
+    code = run_subcommand(argv)
+    if code is not None:
+        sys.exit(code)
+
+    parser = argparse.ArgumentParser(prog="agent-bureau", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--no-partial", dest="continue_from_partial", action="store_false",
+        help="discard the output of agents that error or time out instead of "
+             "classifying and reconciling their partial transcript",
+    )
+    parser.add_argument(
+        "--max-rounds", type=int, default=ConvergencePolicy.max_rounds, metavar="N",
+        help="maximum automatic reconciliation rounds before review (1 disables the loop)",
+    )
+    parser.add_argument(
+        "--round-budget", type=float, default=ConvergencePolicy.time_budget, metavar="SECONDS",
+        help="wall-clock budget for the automatic reconciliation loop",
+    )
+    parser.add_argument(
+        "--quorum", type=int, default=QuorumPolicy.quorum, metavar="N",
+        help="classify once N agents have finished and the --grace period has passed, "
+             "without waiting for the rest (default: wait for both)",
+    )
+    parser.add_argument(
+        "--grace", type=float, default=QuorumPolicy.grace, metavar="SECONDS",
+        help="how long to wait for late agents once the --quorum is reached",
+    )
+    parser.add_argument(
+        "--no-speculative-merge", dest="speculative_merge", action="store_false",
+        help="only call the merge agent after y is pressed, not as soon as review starts",
+    )
+    parser.add_argument(
+        "--context-bytes", type=int, default=4000, metavar="N",
+        help="byte budget for relevant-file excerpts from the repository index "
+             "added to each prompt (0 disables indexing)",
+    )
+    parser.add_argument(
+        "--no-watch", dest="watch_files", action="store_false",
+        help="index the project once at startup instead of following file changes",
+    )
+    parser.add_argument(
+        "--resume", nargs="?", const="", default=None, metavar="SESSION",
+        help="reopen an interrupted session (default: the most recent) from "
+             ".disagree/sessions.jsonl without calling the agents again",
+    )
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="run sessions in the background daemon (`agent-bureau daemon serve`), "
+             "so quitting leaves them running",
+    )
+    parser.add_argument(
+        "--attach", default=None, metavar="SESSION",
+        help="follow a session running in the daemon (implies --daemon)",
+    )
+    parser.add_argument(
+        "--socket", type=Path, default=None, metavar="PATH",
+        help="Unix socket of the daemon (default: .disagree/bureau.sock)",
+    )
+    args = parser.parse_args(argv)
+    checkpoint = None
+    if args.resume is not None:
+        from tui.journal import load_checkpoint
+        checkpoint = load_checkpoint(session=args.resume or None)
+        if checkpoint is None:
+            parser.exit(1, "agent-bureau: no interrupted session to resume\n")
+    daemon_socket = None
+    if args.daemon or args.attach is not None or args.socket is not None:
+        from tui.daemon import SOCKET_PATH
+        daemon_socket = args.socket or SOCKET_PATH
+    app = AgentBureauApp(
+        resume=checkpoint,
+        daemon_socket=daemon_socket,
+        attach=args.attach,
+        context_bytes=max(0, args.context_bytes),
+        watch_files=args.watch_files,
+        continue_from_partial=args.continue_from_partial,
+        speculative_merge=args.speculative_merge,
+        convergence=ConvergencePolicy(
+            max_rounds=max(1, args.max_rounds), time_budget=args.round_budget
+        ),
+        quorum=QuorumPolicy(quorum=max(1, args.quorum), grace=max(0.0, args.grace)),
+    )
+    app.run()
+    if app.detached_session:
+        print(
+            f"agent-bureau: session {app.detached_session} is still running in the daemon; "
+            f"reattach with `agent-bureau --attach {app.detached_session}`",
+            file=sys.stderr,
+        )
 
 
 if __name__ == "__main__":
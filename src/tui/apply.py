@@ -3,7 +3,10 @@
 This module provides pure stdlib functions for the code-apply pipeline:
 - Parse fenced code blocks from agent output text
 - Generate unified diffs between two code strings
+- Split two code strings into differing hunks and rebuild a file from them
+- Score how similar two code strings are
 - Write file content atomically via temp file + rename
+- Read the current content of a target file, if any
 
 No side effects occur without explicit function calls.
 """
@@ -11,6 +14,7 @@ import difflib
 import os
 import re
 import tempfile
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -110,6 +114,85 @@ def generate_unified_diff(
     return result if result.strip() else ""
 
 
+@dataclass(frozen=True)
+class Hunk:
+    """One region where two code strings differ, as line ranges into each.
+
+    Attributes:
+        a_start, a_end: Half-open 0-based line range in the first string.
+        b_start, b_end: Half-open 0-based line range in the second string.
+        a_lines: The first string's lines in that range (empty for an insertion).
+        b_lines: The second string's lines in that range (empty for a deletion).
+    """
+
+    a_start: int
+    a_end: int
+    b_start: int
+    b_end: int
+    a_lines: tuple[str, ...]
+    b_lines: tuple[str, ...]
+
+
+def diff_hunks(a_code: str, b_code: str) -> list[Hunk]:
+    """Split two code strings into the hunks where they differ.
+
+    Lines outside every hunk are identical in both strings (the common base),
+    so a full version of either side can be rebuilt from a_code plus one
+    replacement per hunk with apply_hunks().
+
+    Args:
+        a_code: First code string.
+        b_code: Second code string.
+
+    Returns:
+        Hunks in file order; empty list if the line sequences are identical.
+    """
+    a_lines = a_code.splitlines()
+    b_lines = b_code.splitlines()
+    matcher = difflib.SequenceMatcher(None, a_lines, b_lines, autojunk=False)
+    return [
+        Hunk(i1, i2, j1, j2, tuple(a_lines[i1:i2]), tuple(b_lines[j1:j2]))
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def apply_hunks(
+    a_code: str,
+    hunks: Sequence[Hunk],
+    replacements: Mapping[int, Sequence[str]],
+) -> str:
+    """Rebuild a full code string from a_code's common lines and per-hunk replacements.
+
+    Args:
+        a_code: The first string passed to diff_hunks().
+        hunks: Hunks returned by diff_hunks(a_code, ...).
+        replacements: {hunk index: lines to put in place of that hunk}. Hunks
+            without an entry keep a_code's lines.
+
+    Returns:
+        The rebuilt code, lines joined with "\n" (no trailing newline).
+    """
+    a_lines = a_code.splitlines()
+    out: list[str] = []
+    pos = 0
+    for index, hunk in enumerate(hunks):
+        out.extend(a_lines[pos:hunk.a_start])
+        out.extend(replacements.get(index, hunk.a_lines))
+        pos = hunk.a_end
+    out.extend(a_lines[pos:])
+    return "\n".join(out)
+
+
+def similarity_ratio(a_code: str, b_code: str) -> float:
+    """Line-level similarity of two code strings, from 0.0 (disjoint) to 1.0 (identical)."""
+    a_lines = a_code.splitlines()
+    b_lines = b_code.splitlines()
+    if a_lines == b_lines:
+        return 1.0
+    return difflib.SequenceMatcher(None, a_lines, b_lines, autojunk=False).ratio()
+
+
 def write_file_atomic(target: Path, content: str) -> None:
     """Write content to target path atomically via temp file + rename.
 
@@ -134,3 +217,25 @@ def write_file_atomic(target: Path, content: str) -> None:
         except OSError:
             pass
         raise
+
+
+# Fence language -> file extension, for answers that name no target file.
+_EXTENSIONS = {
+    "python": "py", "javascript": "js", "typescript": "ts", "go": "go", "rust": "rs",
+    "java": "java", "ruby": "rb", "bash": "sh", "shell": "sh",
+}
+
+
+def default_filename(language: str) -> str:
+    """Fallback target for code without a filename comment, e.g. "output.py"."""
+    return f"output.{_EXTENSIONS.get(language, 'txt')}"
+
+
+def read_base_file(filename: str | None) -> str | None:
+    """Current content of a target file, or None if there is none on disk."""
+    if not filename:
+        return None
+    try:
+        return Path(filename).read_text()
+    except (OSError, UnicodeDecodeError):
+        return None
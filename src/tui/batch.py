@@ -0,0 +1,522 @@
+"""`agent-bureau batch` — run many prompts headless with bounded agent concurrency.
+
+Each prompt goes through the same pipeline as the TUI, without Textual:
+both agents stream (hedged, with adaptive timeouts), their answers are
+classified, and reconciliation rounds run until the ConvergencePolicy stops
+the loop. With --apply-dir the final code is written under a scratch
+directory, one subdirectory per prompt, never into the project itself.
+
+Agent invocations are the scarce resource, so the limit is on them rather
+than on prompts: every agent process, including a hedged duplicate of a
+slow one, holds one slot of a shared semaphore (a hedge starts only when a
+slot is free, and is skipped otherwise). As many prompts as there are slots
+are kept in flight, so slots freed while a prompt is classifying or merging
+are picked up by another prompt's agents.
+
+One NDJSON result line per prompt is written (flushed) as each prompt
+finishes, in completion order. With --journal every stage is also recorded
+in .disagree/sessions.jsonl in the app's record shapes, so `agent-bureau
+stats` and the history browser include batch runs.
+
+`agent-bureau run "prompt" --json` runs a single prompt the same way and
+writes every event as it happens instead: each BridgeEvent (token, done,
+error, timeout, tagged with its phase), the classification, each
+reconcile round and finally the result, one flushed JSON line each.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import IO
+
+from tui.apply import CodeProposal, default_filename, extract_code_proposals
+from tui.event_bus import (
+    AgentDone,
+    AgentError,
+    AgentSpec,
+    AgentTimeout,
+    BridgeEvent,
+    TokenChunk,
+    terminal_text,
+)
+from tui.env_context import with_env_context
+from tui.journal import JOURNAL_PATH, SessionJournal, new_session_id
+from tui.prompts import RECONCILE_TOKEN_BUDGET
+from tui.reconcile import AGENTS, RoundResult, proposal_records, run_reconciliation
+from tui.session import ConvergencePolicy
+from tui.stats import LatencyHistory
+
+_EVENT_TYPES = {"token": TokenChunk, "done": AgentDone, "error": AgentError, "timeout": AgentTimeout}
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """One prompt to run; id names its result line and its --apply-dir subdirectory.
+
+    context, if set, is sent to the agents as the prompt's Environment section
+    (see tui.env_context); the prompt alone is what gets journaled.
+    """
+
+    id: str
+    prompt: str
+    context: str = ""
+
+
+def read_prompts(lines: Iterable[str]) -> list[BatchItem]:
+    """Parse a prompts file: one JSON object ({"prompt": ..., "id": ...}) or string per line.
+
+    Blank lines are skipped; items without an id are numbered by line.
+
+    Raises:
+        ValueError: a line is not JSON or has no prompt.
+    """
+    items: list[BatchItem] = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError as exc:
+            raise ValueError(f"line {number}: not JSON ({exc})") from None
+        if isinstance(value, dict):
+            prompt, item_id = value.get("prompt"), value.get("id", number)
+        else:
+            prompt, item_id = value, number
+        if not isinstance(prompt, str) or not prompt.strip():
+            raise ValueError(f"line {number}: no prompt")
+        items.append(BatchItem(id=str(item_id), prompt=prompt.strip()))
+    return items
+
+
+@dataclass(frozen=True)
+class HeadlessOptions:
+    """How each prompt is run.
+
+    Attributes:
+        convergence:           When the reconciliation loop stops.
+        reconcile_token_budget: Estimated-token cap for each reconciliation prompt.
+        continue_from_partial: Reconcile the partial transcript of agents that fail.
+        timeout:               Default per-agent deadline for the first answer (seconds).
+        reconcile_timeout:     Default per-agent deadline for a reconciliation round.
+    """
+
+    convergence: ConvergencePolicy = ConvergencePolicy()
+    reconcile_token_budget: int = RECONCILE_TOKEN_BUDGET
+    continue_from_partial: bool = True
+    timeout: float = 60.0
+    reconcile_timeout: float = 90.0
+
+
+class HeadlessRunner:
+    """Runs prompts through the bridge, classifier and reconciliation without a UI.
+
+    All prompts run by one runner share `concurrency` agent slots and one
+    LatencyHistory (so hedging and adaptive timeouts learn across the batch).
+    on_event, if given, receives every event of every prompt as a
+    JSON-serializable dict with "type" and "session" keys (see event_record()).
+    """
+
+    def __init__(
+        self,
+        options: HeadlessOptions = HeadlessOptions(),
+        concurrency: int = 4,
+        latency: LatencyHistory | None = None,
+        journal: SessionJournal | None = None,
+        on_event: Callable[[dict], None] | None = None,
+    ) -> None:
+        self.options = options
+        self.concurrency = concurrency
+        self.latency = latency if latency is not None else LatencyHistory()
+        self.journal = journal
+        self.on_event = on_event
+        self._slots = asyncio.Semaphore(concurrency)
+
+    def _record(self, session: str, stage: str, **fields) -> None:
+        if self.journal is not None:
+            self.journal.append({"session": session, "stage": stage, **fields})
+
+    def _emit(self, session: str, kind: str, **fields) -> None:
+        if self.on_event is not None:
+            self.on_event({"type": kind, "session": session, **fields})
+
+    async def _agent(
+        self, spec: AgentSpec, prompt: str, timeout: float, q: asyncio.Queue, stage: str
+    ) -> None:
+        """One agent call inside a concurrency slot; failures to start become AgentError.
+
+        A hedged duplicate takes a slot of its own, and only if one is free,
+        so the limit counts agent processes, hedges included.
+        """
+        from tui.bridge import _stream_hedged
+
+        async with self._slots:
+            try:
+                await _stream_hedged(
+                    spec, prompt, timeout, q, stage=stage, history=self.latency, slots=self._slots
+                )
+            except Exception as exc:  # e.g. the agent CLI is not installed
+                await q.put(AgentError(agent=spec.name, message=str(exc), exit_code=-1))
+
+    async def _round(
+        self, session: str, prompts: dict[str, str], stage: str, timeout: float
+    ) -> tuple[dict[str, BridgeEvent], dict[str, float], dict[str, float]]:
+        """Run both agents on their prompts.
+
+        Returns terminal events, first-token times and finish times (loop.time()) by agent.
+        """
+        from tui.bridge import CLAUDE, CODEX
+
+        loop = asyncio.get_running_loop()
+        q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+        specs = {"claude": CLAUDE, "codex": CODEX}
+        tasks = [
+            asyncio.create_task(self._agent(specs[agent], prompts[agent], timeout, q, stage))
+            for agent in AGENTS
+        ]
+        terminal: dict[str, BridgeEvent] = {}
+        first_token: dict[str, float] = {}
+        finished: dict[str, float] = {}
+        try:
+            while len(terminal) < len(tasks):
+                event = await q.get()
+                if self.on_event is not None:
+                    self.on_event(event_record(event, session, stage))
+                if event.type == "token":
+                    first_token.setdefault(event.agent, loop.time())
+                else:
+                    terminal[event.agent] = event
+                    finished[event.agent] = loop.time()
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return terminal, first_token, finished
+
+    async def run(
+        self, item: BatchItem, apply_dir: Path | None = None, session: str | None = None
+    ) -> dict:
+        """Run one prompt to the end of reconciliation (and apply, with apply_dir).
+
+        session is the journal session id to use (default: a new one).
+        Returns the result record written as its NDJSON line.
+        """
+        from disagree_v1.classifier import classify_disagreements
+
+        options = self.options
+        session = session or new_session_id()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self._record(session, "prompt", prompt=item.prompt, race_mode=False, batch_id=item.id)
+
+        prompt = with_env_context(item.prompt, item.context)
+        terminal, first_token, finished = await self._round(
+            session, {agent: prompt for agent in AGENTS}, "stream", options.timeout
+        )
+        texts: dict[str, str] = {}
+        partial: list[str] = []
+        for agent in AGENTS:
+            event = terminal[agent]
+            ttft = first_token.get(agent)
+            self._record(
+                session, "stream", agent=agent, status=event.type,
+                elapsed=round(finished[agent] - started, 3),
+                ttft=round(ttft - started, 3) if ttft is not None else None,
+                text=terminal_text(event),
+            )
+            if isinstance(event, AgentDone):
+                texts[agent] = event.full_text
+            elif options.continue_from_partial and terminal_text(event):
+                texts[agent] = terminal_text(event)
+                partial.append(agent)
+
+        disagreements: list = []
+        if len(texts) == 2:
+            try:
+                disagreements = await asyncio.to_thread(
+                    classify_disagreements, texts["claude"], texts["codex"]
+                )
+            except Exception:
+                disagreements = []
+        kinds = [{"kind": d.kind, "summary": d.summary} for d in disagreements]
+        self._record(
+            session, "classification", prompt=item.prompt,
+            agent_a={"name": "claude", "answer": texts.get("claude", "")},
+            agent_b={"name": "codex", "answer": texts.get("codex", "")},
+            disagreements=kinds, partial=partial,
+        )
+        self._emit(session, "classification", disagreements=kinds, partial=partial)
+
+        result = {
+            "id": item.id, "session": session, "prompt": item.prompt,
+            "status": {agent: terminal[agent].type for agent in AGENTS},
+            "partial": partial, "disagreements": kinds,
+        }
+        proposals: dict[str, CodeProposal | None] = {agent: None for agent in AGENTS}
+        if len(texts) == 2:
+            proposals, rounds, similarity, stop_reason = await self._reconcile(
+                session, texts, set(partial)
+            )
+            result.update(rounds=rounds, similarity=similarity, stop_reason=stop_reason)
+        else:
+            # Nothing to reconcile against: whatever a single agent produced is the answer.
+            for agent, text in texts.items():
+                found = extract_code_proposals(text)
+                proposals[agent] = found[-1] if found else None
+            result.update(rounds=0, similarity=None, stop_reason="single answer")
+        result["proposals"] = proposal_records(proposals)
+        if apply_dir is not None:
+            result.update(await asyncio.to_thread(self._apply, session, item, proposals, apply_dir))
+        await self._save_latency()
+        result["elapsed"] = round(loop.time() - started, 3)
+        return result
+
+    async def _reconcile(
+        self, session: str, texts: dict[str, str], partial: set[str]
+    ) -> tuple[dict[str, CodeProposal | None], int, float, str]:
+        """The automatic reconciliation loop; returns proposals, rounds, similarity, stop reason."""
+        options = self.options
+
+        async def _send(prompts: dict[str, str]) -> dict[str, str]:
+            terminal, _, _ = await self._round(session, prompts, "reconcile", options.reconcile_timeout)
+            return {agent: terminal_text(terminal[agent]) for agent in AGENTS}
+
+        def _on_round(result: RoundResult) -> None:
+            fields = dict(
+                round=result.round, similarity=result.similarity, stop_reason=result.stop_reason,
+                proposals=proposal_records(result.proposals),
+            )
+            self._record(session, "reconcile_round", **fields)
+            self._emit(session, "reconcile_round", **fields)
+
+        last = await run_reconciliation(
+            texts, {agent: None for agent in AGENTS}, _send,
+            policy=options.convergence, budget=options.reconcile_token_budget,
+            partial=partial, on_round=_on_round,
+        )
+        return last.proposals, last.round, last.similarity, last.stop_reason
+
+    def _apply(
+        self, session: str, item: BatchItem, proposals: dict[str, CodeProposal | None], apply_dir: Path
+    ) -> dict:
+        """Thread: write the agreed code under apply_dir/<item id>/; returns result fields.
+
+        Both proposals for one file are merged three-way against the project's
+        copy of that file; conflicting regions keep Claude's side (no extra
+        agent call). Otherwise the one proposal there is is written.
+        """
+        from tui.apply import read_base_file, write_file_atomic
+        from tui.merge import merge3
+
+        claude, codex = proposals["claude"], proposals["codex"]
+        conflicts = 0
+        if claude is not None and codex is not None and claude.filename == codex.filename:
+            merged = merge3(read_base_file(claude.filename), claude.code, codex.code)
+            conflicts = len(merged.conflicts)
+            chosen, source = CodeProposal(claude.language, merged.render(), claude.filename), "merge"
+        elif claude is not None or codex is not None:
+            source = "claude" if claude is not None else "codex"
+            chosen = claude if claude is not None else codex
+        else:
+            self._record(session, "apply", confirmed=False, files=[], source="")
+            return {"applied": [], "source": None}
+
+        root = apply_dir / _safe_name(item.id)
+        target = root / _relative_target(chosen.filename or default_filename(chosen.language))
+        write_file_atomic(target, chosen.code)
+        self._record(session, "apply", confirmed=True, files=[str(target)], source=source)
+        return {"applied": [str(target)], "source": source, "conflicts": conflicts}
+
+    async def _save_latency(self) -> None:
+        try:
+            await asyncio.to_thread(self.latency.save)
+        except OSError:
+            pass
+
+    async def run_all(
+        self, items: list[BatchItem], out: IO[str], apply_dir: Path | None = None
+    ) -> int:
+        """Run every item, writing one flushed NDJSON line per item as it finishes.
+
+        Returns the number of items that failed with an unexpected error (their
+        line carries "error" instead of a result).
+        """
+        pending: asyncio.Queue[BatchItem] = asyncio.Queue()
+        for item in items:
+            pending.put_nowait(item)
+        failures = 0
+
+        async def _worker() -> None:
+            nonlocal failures
+            while not pending.empty():
+                item = pending.get_nowait()
+                try:
+                    result = await self.run(item, apply_dir)
+                except Exception as exc:
+                    failures += 1
+                    result = {"id": item.id, "prompt": item.prompt, "error": str(exc)}
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+
+        await asyncio.gather(*(_worker() for _ in range(min(self.concurrency, len(items)))))
+        return failures
+
+
+def event_record(event: BridgeEvent, session: str, phase: str) -> dict:
+    """A BridgeEvent as a JSON-serializable dict; phase is "stream" or "reconcile"."""
+    return {"session": session, "phase": phase, **asdict(event)}
+
+
+def record_event(record: dict) -> BridgeEvent:
+    """Inverse of event_record(): the BridgeEvent a token/done/error/timeout record carries."""
+    cls = _EVENT_TYPES[record["type"]]
+    return cls(**{f.name: record[f.name] for f in fields(cls) if f.name in record})
+
+
+def _safe_name(item_id: str) -> str:
+    """item_id as a single path component."""
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in item_id).strip(".") or "_"
+
+
+def _relative_target(filename: str) -> Path:
+    """filename as a path that stays inside the scratch directory."""
+    parts = [p for p in Path(filename).parts if p not in ("", "/", "..", ".")]
+    return Path(*parts) if parts else Path(default_filename("text"))
+
+
+def _add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    """Options shared by `batch` and `run`."""
+    parser.add_argument(
+        "--max-rounds", type=int, default=ConvergencePolicy.max_rounds, metavar="N",
+        help="maximum reconciliation rounds per prompt",
+    )
+    parser.add_argument(
+        "--no-partial", dest="continue_from_partial", action="store_false",
+        help="discard the output of agents that error or time out",
+    )
+    parser.add_argument(
+        "--apply-dir", type=Path, default=None, metavar="DIR",
+        help="write each prompt's final code under DIR/<id>/ (never into the project)",
+    )
+    parser.add_argument(
+        "--journal", action="store_true",
+        help=f"also record every stage in {JOURNAL_PATH}",
+    )
+
+
+def _options(args: argparse.Namespace) -> HeadlessOptions:
+    return HeadlessOptions(
+        convergence=ConvergencePolicy(max_rounds=max(1, args.max_rounds)),
+        continue_from_partial=args.continue_from_partial,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for `agent-bureau batch`."""
+    parser = argparse.ArgumentParser(
+        prog="agent-bureau batch",
+        description="Run prompts from a JSONL file through both agents without the TUI.",
+    )
+    parser.add_argument(
+        "prompts", metavar="PROMPTS",
+        help='JSONL file: one {"prompt": ..., "id": ...} object or JSON string per line ("-" for stdin)',
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=4, metavar="N",
+        help="maximum agent invocations running at once, across all prompts",
+    )
+    parser.add_argument(
+        "--output", "-o", default="-", metavar="PATH",
+        help="where to write the NDJSON results (default: stdout)",
+    )
+    _add_run_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        if args.prompts == "-":
+            items = read_prompts(sys.stdin)
+        else:
+            with open(args.prompts, encoding="utf-8") as f:
+                items = read_prompts(f)
+    except (OSError, ValueError) as exc:
+        parser.exit(2, f"agent-bureau batch: {args.prompts}: {exc}\n")
+
+    journal = SessionJournal() if args.journal else None
+    runner = HeadlessRunner(
+        _options(args),
+        concurrency=max(1, args.concurrency),
+        latency=LatencyHistory.load(),
+        journal=journal,
+    )
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        failures = asyncio.run(runner.run_all(items, out, args.apply_dir))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if journal is not None:
+            journal.flush()
+            journal.close()
+    return 1 if failures else 0
+
+
+def _print_event(record: dict, out: IO[str]) -> None:
+    """Plain-text rendering of one event for `run` without --json."""
+    kind = record["type"]
+    if kind == "token":
+        out.write(f"[{record['agent']}] {record['text']}\n")
+    elif kind in ("done", "error", "timeout"):
+        out.write(f"[{record['agent']}] -- {kind} ({record['phase']})\n")
+    elif kind == "classification":
+        kinds = ", ".join(d["kind"] for d in record["disagreements"]) or "none"
+        out.write(f"-- disagreements: {kinds}\n")
+    elif kind == "reconcile_round":
+        reason = f" ({record['stop_reason']})" if record["stop_reason"] else ""
+        out.write(f"-- round {record['round']}: {record['similarity']:.0%} similar{reason}\n")
+    elif kind == "result" and record.get("applied"):
+        out.write(f"-- wrote {', '.join(record['applied'])}\n")
+    out.flush()
+
+
+def run_main(argv: list[str] | None = None) -> int:
+    """Entry point for `agent-bureau run`: one prompt, events written as they happen."""
+    parser = argparse.ArgumentParser(
+        prog="agent-bureau run",
+        description="Run one prompt through both agents without the TUI, streaming its events.",
+    )
+    parser.add_argument("prompt", help='the prompt ("-" reads it from stdin)')
+    parser.add_argument(
+        "--json", action="store_true",
+        help="write every event as one JSON line (NDJSON), flushed as it happens",
+    )
+    _add_run_arguments(parser)
+    args = parser.parse_args(argv)
+    prompt = (sys.stdin.read() if args.prompt == "-" else args.prompt).strip()
+    if not prompt:
+        parser.exit(2, "agent-bureau run: empty prompt\n")
+
+    out = sys.stdout
+
+    def _write(record: dict) -> None:
+        if args.json:
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+        else:
+            _print_event(record, out)
+
+    journal = SessionJournal() if args.journal else None
+    runner = HeadlessRunner(
+        _options(args), concurrency=2, latency=LatencyHistory.load(),
+        journal=journal, on_event=_write,
+    )
+    try:
+        result = asyncio.run(runner.run(BatchItem("run", prompt), args.apply_dir))
+    finally:
+        if journal is not None:
+            journal.flush()
+            journal.close()
+    _write({"type": "result", **result})
+    return 0 if "done" in result["status"].values() else 1
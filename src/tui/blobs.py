@@ -0,0 +1,156 @@
+"""Content-addressed, chunked, compressed text store under .disagree/blobs/.
+
+Each reconcile round re-sends mostly the same code, and the journal used
+to store every copy verbatim: the stream text, the classification answers,
+every checkpoint's last_texts, and each round's proposals. BlobStore keeps
+each distinct text once:
+
+- A text is split into chunks at content-defined line boundaries (after a
+  line whose hash has its low bits zero), so editing one function changes
+  the chunks around it and leaves the rest of the file's chunks as they were.
+- Each chunk is stored once, zlib-compressed, as chunks/<h[:2]>/<sha256>.
+- A text is a small manifest of its chunks' binary sha256 digests, stored as
+  texts/<h[:2]>/<sha256 of the text>; put() returns that hash.
+
+Disk use therefore grows with unique content, not with the number of rounds.
+Writes are atomic (temp file + rename) and idempotent, so several processes
+can share a store. The journal references texts as {"$blob": hash}; see
+externalize() and resolve().
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import zlib
+from pathlib import Path
+
+from tui.stats import DISAGREE_DIR
+
+BLOBS_DIR = DISAGREE_DIR / "blobs"
+BLOB_KEY = "$blob"
+
+# A chunk ends after a line whose crc32 & _BOUNDARY_MASK == 0 (about every 64 lines),
+# but never before _MIN_LINES lines and never beyond _MAX_CHUNK bytes.
+_BOUNDARY_MASK = 0x3F
+_MIN_LINES = 16
+_MAX_CHUNK = 64 * 1024
+
+
+def chunk_text(text: str) -> list[str]:
+    """Split text into content-defined chunks that concatenate back to text."""
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for line in text.splitlines(keepends=True):
+        while len(line) > _MAX_CHUNK:  # one enormous line: fixed-size pieces
+            if current:
+                chunks.append("".join(current))
+                current, size = [], 0
+            chunks.append(line[:_MAX_CHUNK])
+            line = line[_MAX_CHUNK:]
+        current.append(line)
+        size += len(line)
+        boundary = len(current) >= _MIN_LINES and zlib.crc32(line.encode()) & _BOUNDARY_MASK == 0
+        if boundary or size >= _MAX_CHUNK:
+            chunks.append("".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """Texts stored by content hash as deduplicated, compressed chunks."""
+
+    def __init__(self, root: Path = BLOBS_DIR, level: int = 6) -> None:
+        self.root = root
+        self.level = level
+
+    def _path(self, kind: str, digest: str) -> Path:
+        return self.root / kind / digest[:2] / digest
+
+    def _write(self, target: Path, data: bytes) -> None:
+        if target.exists():
+            return  # same hash, same content
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def put(self, text: str) -> str:
+        """Store text; returns its hash. Chunks already present are not written again."""
+        digest = _digest(text.encode())
+        manifest = self._path("texts", digest)
+        if manifest.exists():
+            return digest
+        digests = []
+        for chunk in chunk_text(text):
+            raw = chunk.encode()
+            chunk_digest = hashlib.sha256(raw).digest()
+            self._write(self._path("chunks", chunk_digest.hex()), zlib.compress(raw, self.level))
+            digests.append(chunk_digest)
+        self._write(manifest, b"".join(digests))
+        return digest
+
+    def get(self, digest: str) -> str | None:
+        """The text stored under digest, or None if missing or damaged."""
+        try:
+            manifest = self._path("texts", digest).read_bytes()
+            parts = [
+                zlib.decompress(self._path("chunks", manifest[i:i + 32].hex()).read_bytes())
+                for i in range(0, len(manifest), 32)
+            ]
+        except (OSError, ValueError, zlib.error):
+            return None
+        data = b"".join(parts)
+        return data.decode() if _digest(data) == digest else None
+
+    def __contains__(self, digest: str) -> bool:
+        return self._path("texts", digest).exists()
+
+    def disk_usage(self) -> int:
+        """Bytes used by stored chunks and manifests."""
+        total = 0
+        for dirpath, _dirs, files in os.walk(self.root):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, name))
+                except OSError:
+                    pass
+        return total
+
+
+def externalize(value, store: BlobStore, min_size: int = 512):
+    """Copy of a JSON value with every string of min_size+ characters replaced by {"$blob": hash}."""
+    if isinstance(value, str):
+        return {BLOB_KEY: store.put(value)} if len(value) >= min_size else value
+    if isinstance(value, dict):
+        return {k: externalize(v, store, min_size) for k, v in value.items()}
+    if isinstance(value, list):
+        return [externalize(v, store, min_size) for v in value]
+    return value
+
+
+def resolve(value, store: BlobStore):
+    """Inverse of externalize(): blob references become their text ("" if missing)."""
+    if isinstance(value, dict):
+        if len(value) == 1 and isinstance(value.get(BLOB_KEY), str):
+            text = store.get(value[BLOB_KEY])
+            return text if text is not None else ""
+        return {k: resolve(v, store) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve(v, store) for v in value]
+    return value
@@ -15,9 +15,12 @@ from __future__ import annotations
 import asyncio
 import fcntl
 import os
+import tempfile
 import warnings
-from typing import Optional
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
 
+from tui.stats import LatencyHistory, TimeoutPolicy
 from tui.event_bus import (
     AgentSpec,
     AgentDone,
@@ -57,20 +60,27 @@ _CODEX_PREAMBLE = _SHARED_PREAMBLE + "\n\nYou are the Codex agent."
 # Public agent defaults
 # ---------------------------------------------------------------------------
 
+# Prompts go over stdin: reconciliation prompts embed both agents' previous
+# outputs and can exceed the per-argument argv limit (E2BIG).
+# claude -p reads the prompt from stdin when no prompt argument is given.
 CLAUDE = AgentSpec(
     name="claude",
     command="claude",
     args=("-p",),
     system_prompt=_CLAUDE_PREAMBLE,
     system_prompt_flag="--system-prompt",
+    prompt_transport="stdin",
 )
 # codex exec = non-interactive mode; read-only sandbox prevents file writes.
 # Codex has no system-prompt flag so the preamble is prepended to the prompt.
+# "-" tells codex exec to read the instructions from stdin.
 CODEX = AgentSpec(
     name="codex",
     command="codex",
     args=("exec", "--ephemeral", "--sandbox", "read-only", "--skip-git-repo-check"),
     system_prompt=_CODEX_PREAMBLE,
+    prompt_transport="stdin",
+    prompt_args=("-",),
 )
 
 
@@ -91,6 +101,104 @@ def _pty_available() -> bool:
         return False
 
 
+async def _terminate(proc: asyncio.subprocess.Process) -> None:
+    """Terminate a child process, escalating to SIGKILL after 5 seconds."""
+    if proc.returncode is not None:
+        return
+    try:
+        proc.terminate()
+    except ProcessLookupError:
+        return
+    try:
+        await asyncio.wait_for(proc.wait(), timeout=5.0)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+
+
+# ---------------------------------------------------------------------------
+# Subprocess launch and prompt transport
+# ---------------------------------------------------------------------------
+
+# Strong references to per-process housekeeping tasks (see _spawn).
+_HOUSEKEEPING: set[asyncio.Task] = set()
+
+
+def _write_prompt_file(text: str) -> str:
+    """Write text to a private temp file and return its path."""
+    fd, path = tempfile.mkstemp(prefix="agent-bureau-prompt-", suffix=".md")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+async def _feed_stdin(proc: asyncio.subprocess.Process, data: bytes) -> None:
+    """Stream data into the child's stdin, then close it (EOF ends the prompt)."""
+    assert proc.stdin is not None
+    try:
+        proc.stdin.write(data)
+        await proc.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass  # child exited (or was killed) before reading everything
+    finally:
+        proc.stdin.close()
+
+
+async def _housekeep(
+    proc: asyncio.subprocess.Process, feeder: Optional[asyncio.Task], path: str
+) -> None:
+    """After the child exits, stop feeding stdin and remove its prompt file."""
+    try:
+        await proc.wait()
+    finally:
+        if feeder is not None:
+            feeder.cancel()
+            await asyncio.gather(feeder, return_exceptions=True)
+        if path:
+            await asyncio.to_thread(_unlink_quietly, path)
+
+
+async def _spawn(spec: AgentSpec, prompt: str, **kwargs) -> asyncio.subprocess.Process:
+    """Start the agent subprocess, delivering the prompt via spec.prompt_transport.
+
+    "argv" passes the prompt on the command line. "stdin" writes it to a pipe
+    from a background task, so large prompts neither hit ARG_MAX nor block
+    the caller. "file" writes it to a temp file off the event loop and passes
+    the path. Prompt files and stdin writers are cleaned up when the child exits.
+    """
+    path = ""
+    data = spec.build_input(prompt)
+    if spec.prompt_transport == "file":
+        path = await asyncio.to_thread(_write_prompt_file, data)
+    stdin = (
+        asyncio.subprocess.PIPE if spec.prompt_transport == "stdin"
+        else asyncio.subprocess.DEVNULL
+    )
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *spec.build_argv(prompt, path), stdin=stdin, **kwargs
+        )
+    except BaseException:
+        if path:
+            _unlink_quietly(path)
+        raise
+
+    feeder = None
+    if stdin == asyncio.subprocess.PIPE:
+        feeder = asyncio.create_task(_feed_stdin(proc, data.encode("utf-8")))
+    task = asyncio.create_task(_housekeep(proc, feeder, path))
+    _HOUSEKEEPING.add(task)
+    task.add_done_callback(_HOUSEKEEPING.discard)
+    return proc
+
+
 # ---------------------------------------------------------------------------
 # PTY streaming
 # ---------------------------------------------------------------------------
@@ -101,8 +209,13 @@ async def _stream_pty(
     prompt: str,
     timeout: float,
     q: asyncio.Queue[BridgeEvent],
+    idle_timeout: Optional[float] = None,
 ) -> None:
-    """Stream agent subprocess output via PTY (fake terminal)."""
+    """Stream agent subprocess output via PTY (fake terminal).
+
+    If idle_timeout is set, the agent is stopped once no output has arrived for
+    that many seconds, even if the overall timeout has not expired.
+    """
     import pty
 
     master_fd, slave_fd = pty.openpty()
@@ -111,12 +224,7 @@ async def _stream_pty(
     flags = fcntl.fcntl(master_fd, fcntl.F_GETFL)
     fcntl.fcntl(master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
 
-    proc = await asyncio.create_subprocess_exec(
-        *spec.build_argv(prompt),
-        stdin=asyncio.subprocess.DEVNULL,
-        stdout=slave_fd,
-        stderr=slave_fd,
-    )
+    proc = await _spawn(spec, prompt, stdout=slave_fd, stderr=slave_fd)
 
     # Close slave_fd in the parent immediately after create_subprocess_exec.
     os.close(slave_fd)
@@ -124,8 +232,12 @@ async def _stream_pty(
     loop = asyncio.get_event_loop()
     collected: list[str] = []
     read_done = asyncio.Event()
+    last_output = loop.time()
+    stalled = False
 
     def _on_readable() -> None:
+        nonlocal last_output
+        last_output = loop.time()
         try:
             data = os.read(master_fd, 4096)
         except OSError:
@@ -144,24 +256,44 @@ async def _stream_pty(
                 collected.append(line)
                 q.put_nowait(TokenChunk(agent=spec.name, text=line))
 
+    async def _wait_read_done() -> None:
+        nonlocal stalled
+        while not read_done.is_set():
+            if idle_timeout is None:
+                await read_done.wait()
+                return
+            remaining = last_output + idle_timeout - loop.time()
+            if remaining <= 0:
+                stalled = True
+                raise asyncio.TimeoutError
+            try:
+                await asyncio.wait_for(read_done.wait(), remaining)
+            except asyncio.TimeoutError:
+                continue  # re-check: output may have arrived meanwhile
+
     loop.add_reader(master_fd, _on_readable)
 
     try:
         async with asyncio.timeout(timeout):
-            await read_done.wait()
+            await _wait_read_done()
             await proc.wait()
     except asyncio.TimeoutError:
         loop.remove_reader(master_fd)
-        proc.terminate()
-        try:
-            await asyncio.wait_for(proc.wait(), timeout=5.0)
-        except asyncio.TimeoutError:
-            proc.kill()
-            await proc.wait()
-        await q.put(AgentTimeout(agent=spec.name))
+        await _terminate(proc)
+        await q.put(AgentTimeout(
+            agent=spec.name, idle=stalled, partial_text="\n".join(collected)
+        ))
+    except asyncio.CancelledError:
+        # Cancelled by the caller (e.g. a race was won) — reap the child, no event.
+        loop.remove_reader(master_fd)
+        await _terminate(proc)
+        raise
     except Exception as exc:
         loop.remove_reader(master_fd)
-        await q.put(AgentError(agent=spec.name, message=str(exc), exit_code=-1))
+        await q.put(AgentError(
+            agent=spec.name, message=str(exc), exit_code=-1,
+            partial_text="\n".join(collected),
+        ))
     else:
         if proc.returncode == 0:
             await q.put(
@@ -177,6 +309,7 @@ async def _stream_pty(
                     agent=spec.name,
                     message=f"exited with code {proc.returncode}",
                     exit_code=proc.returncode,
+                    partial_text="\n".join(collected),
                 )
             )
     finally:
@@ -196,21 +329,33 @@ async def _stream_pipe(
     prompt: str,
     timeout: float,
     q: asyncio.Queue[BridgeEvent],
+    idle_timeout: Optional[float] = None,
 ) -> None:
-    """Stream agent subprocess output via PIPE (fallback — may buffer)."""
-    proc = await asyncio.create_subprocess_exec(
-        *spec.build_argv(prompt),
-        stdin=asyncio.subprocess.DEVNULL,
+    """Stream agent subprocess output via PIPE (fallback — may buffer).
+
+    If idle_timeout is set, the agent is stopped once no line has arrived for
+    that many seconds, even if the overall timeout has not expired.
+    """
+    proc = await _spawn(
+        spec, prompt,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.DEVNULL,  # discard stderr; status/progress noise from agents
     )
 
     assert proc.stdout is not None
     collected: list[str] = []
+    stalled = False
 
     async def _read_lines() -> None:
+        nonlocal stalled
         while True:
-            line_bytes = await proc.stdout.readline()  # type: ignore[union-attr]
+            try:
+                line_bytes = await asyncio.wait_for(
+                    proc.stdout.readline(), idle_timeout  # type: ignore[union-attr]
+                )
+            except asyncio.TimeoutError:
+                stalled = True
+                raise
             if not line_bytes:
                 break
             # ANSI pass-through — decode only, do NOT strip escape sequences.
@@ -224,16 +369,19 @@ async def _stream_pipe(
             await _read_lines()
             await proc.wait()
     except asyncio.TimeoutError:
-        proc.terminate()
-        try:
-            await asyncio.wait_for(proc.wait(), timeout=5.0)
-        except asyncio.TimeoutError:
-            proc.kill()
-            await proc.wait()
-        await q.put(AgentTimeout(agent=spec.name))
+        await _terminate(proc)
+        await q.put(AgentTimeout(
+            agent=spec.name, idle=stalled, partial_text="\n".join(collected)
+        ))
         return
+    except asyncio.CancelledError:
+        await _terminate(proc)
+        raise
     except Exception as exc:
-        await q.put(AgentError(agent=spec.name, message=str(exc), exit_code=-1))
+        await q.put(AgentError(
+            agent=spec.name, message=str(exc), exit_code=-1,
+            partial_text="\n".join(collected),
+        ))
         return
 
     if proc.returncode == 0:
@@ -250,6 +398,7 @@ async def _stream_pipe(
                 agent=spec.name,
                 message=f"exited with code {proc.returncode}",
                 exit_code=proc.returncode,
+                partial_text="\n".join(collected),
             )
         )
 
@@ -259,12 +408,31 @@ async def _stream_pipe(
 # ---------------------------------------------------------------------------
 
 
+def _select_stream(use_pty: Optional[bool]):
+    """Return the streaming coroutine for PTY mode, PIPE mode, or auto-detect (None).
+
+    Warns only when auto-detection has to fall back to PIPE mode; an explicit
+    use_pty=False is a deliberate choice.
+    """
+    if use_pty is None:
+        use_pty = _pty_available()
+        if not use_pty:
+            warnings.warn(
+                "PTY unavailable — falling back to PIPE mode. "
+                "Agent output may be buffered.",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+    return _stream_pty if use_pty else _stream_pipe
+
+
 async def run_bridge(
     prompt: str,
     spec_a: AgentSpec = CLAUDE,
     spec_b: AgentSpec = CODEX,
     timeout: float = 60.0,
     use_pty: Optional[bool] = None,
+    idle_timeout: Optional[float] = None,
 ) -> list[BridgeEvent]:
     """
     Fan-out to exactly 2 agent subprocesses concurrently.
@@ -278,28 +446,17 @@ async def run_bridge(
         spec_b:  AgentSpec for the second agent (default: CODEX).
         timeout: Global per-agent timeout in seconds.
         use_pty: Force PTY mode (True), PIPE mode (False), or auto-detect (None).
+        idle_timeout: Stop an agent after this many seconds without output (None: off).
 
     Returns:
         Ordered list of BridgeEvent instances (TokenChunk + terminal events).
     """
-    if use_pty is None:
-        use_pty = _pty_available()
-
-    if use_pty:
-        _stream = _stream_pty
-    else:
-        warnings.warn(
-            "PTY unavailable — falling back to PIPE mode. "
-            "Agent output may be buffered.",
-            RuntimeWarning,
-            stacklevel=2,
-        )
-        _stream = _stream_pipe
+    _stream = _select_stream(use_pty)
 
     q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
 
-    task_a = asyncio.create_task(_stream(spec_a, prompt, timeout, q))
-    task_b = asyncio.create_task(_stream(spec_b, prompt, timeout, q))
+    task_a = asyncio.create_task(_stream(spec_a, prompt, timeout, q, idle_timeout))
+    task_b = asyncio.create_task(_stream(spec_b, prompt, timeout, q, idle_timeout))
 
     events: list[BridgeEvent] = []
     done_count = 0
@@ -311,3 +468,265 @@ async def run_bridge(
 
     await asyncio.gather(task_a, task_b)
     return events
+
+
+# ---------------------------------------------------------------------------
+# Race mode: first successful answer wins
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class RaceResult:
+    """Outcome of run_race().
+
+    Attributes:
+        winner:    Name of the first agent whose AgentDone contained a fenced code
+                   block, or None if no agent qualified.
+        events:    Every event observed before the race was decided, in order.
+        elapsed:   Seconds from start until the winner finished (or until all
+                   agents finished when there is no winner).
+        cancelled: Names of the agents that were still running when the winner
+                   finished and were cancelled.
+    """
+
+    winner: Optional[str]
+    events: list[BridgeEvent]
+    elapsed: float
+    cancelled: tuple[str, ...] = ()
+
+    @property
+    def winner_event(self) -> Optional[AgentDone]:
+        """The winning AgentDone event, or None."""
+        for event in self.events:
+            if isinstance(event, AgentDone) and event.agent == self.winner:
+                return event
+        return None
+
+
+def _is_winning(event: BridgeEvent) -> bool:
+    """A race is won by a successful exit whose output contains a fenced code block."""
+    from tui.apply import extract_code_proposals
+
+    return isinstance(event, AgentDone) and bool(extract_code_proposals(event.full_text))
+
+
+async def run_race(
+    prompt: str,
+    specs: Sequence[AgentSpec] = (CLAUDE, CODEX),
+    timeout: float = 60.0,
+    use_pty: Optional[bool] = None,
+    on_event: Optional[Callable[[BridgeEvent], None]] = None,
+    idle_timeout: Optional[float] = None,
+) -> RaceResult:
+    """
+    Fan-out to N agents and commit to the first one that answers with code.
+
+    All agents stream concurrently. The first AgentDone whose full_text contains
+    a fenced code block wins; every other agent still running is cancelled (its
+    subprocess is terminated and it emits no terminal event). If no agent
+    qualifies, the race ends once every agent has produced a terminal event.
+
+    Args:
+        prompt:   The prompt string forwarded to every agent.
+        specs:    AgentSpecs to race (default: CLAUDE and CODEX).
+        timeout:  Global per-agent timeout in seconds.
+        use_pty:  Force PTY mode (True), PIPE mode (False), or auto-detect (None).
+        on_event: Optional callback invoked for each event as it arrives.
+        idle_timeout: Stop an agent after this many seconds without output (None: off).
+
+    Returns:
+        RaceResult describing the winner, observed events and cancelled agents.
+    """
+    _stream = _select_stream(use_pty)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+    tasks = {
+        spec.name: asyncio.create_task(_stream(spec, prompt, timeout, q, idle_timeout))
+        for spec in specs
+    }
+
+    events: list[BridgeEvent] = []
+    finished: set[str] = set()
+    winner: Optional[str] = None
+    while len(finished) < len(tasks):
+        event = await q.get()
+        events.append(event)
+        if on_event is not None:
+            on_event(event)
+        if event.type in ("done", "error", "timeout"):
+            finished.add(event.agent)
+            if _is_winning(event):
+                winner = event.agent
+                break
+
+    elapsed = loop.time() - started
+    cancelled = tuple(name for name in tasks if name not in finished)
+    for name in cancelled:
+        tasks[name].cancel()
+    await asyncio.gather(*tasks.values(), return_exceptions=True)
+    return RaceResult(winner=winner, events=events, elapsed=elapsed, cancelled=cancelled)
+
+
+# ---------------------------------------------------------------------------
+# Hedged requests: duplicate a stalled invocation, keep whichever talks first
+# ---------------------------------------------------------------------------
+
+
+class HedgeBudget:
+    """Per-agent token bucket bounding how often a request may be hedged.
+
+    Every request earns `ratio` credits (capped at `burst`); a hedge spends one.
+    With the default ratio of 0.1, at most ~10% of requests start a duplicate,
+    so tail latency drops without doubling load.
+    """
+
+    def __init__(self, ratio: float = 0.1, burst: float = 2.0) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self._credits: dict[str, float] = {}
+
+    def note_request(self, agent: str) -> None:
+        """Credit the agent for one new (unhedged) request."""
+        self._credits[agent] = min(self.burst, self._credits.get(agent, 0.0) + self.ratio)
+
+    def try_spend(self, agent: str) -> bool:
+        """Spend one credit for a hedge; False if the agent's budget is exhausted."""
+        credits = self._credits.get(agent, 0.0)
+        if credits < 1.0:
+            return False
+        self._credits[agent] = credits - 1.0
+        return True
+
+
+# Process-wide defaults shared by every hedged stream.
+LATENCY_HISTORY = LatencyHistory()
+HEDGE_BUDGET = HedgeBudget()
+TIMEOUT_POLICY = TimeoutPolicy()
+HEDGE_PERCENTILE = 0.9
+
+
+class _Lane:
+    """Queue stand-in that tags each event with the invocation (lane) it came from."""
+
+    def __init__(self, shared: asyncio.Queue, lane: int) -> None:
+        self._shared = shared
+        self._lane = lane
+
+    def put_nowait(self, event: BridgeEvent) -> None:
+        self._shared.put_nowait((self._lane, event))
+
+    async def put(self, event: BridgeEvent) -> None:
+        await self._shared.put((self._lane, event))
+
+
+async def _stream_hedged(
+    spec: AgentSpec,
+    prompt: str,
+    timeout: float,
+    q: asyncio.Queue[BridgeEvent],
+    stage: str = "stream",
+    history: LatencyHistory = LATENCY_HISTORY,
+    budget: HedgeBudget = HEDGE_BUDGET,
+    policy: Optional[TimeoutPolicy] = TIMEOUT_POLICY,
+    stream=_stream_pipe,
+    slots: Optional[asyncio.Semaphore] = None,
+) -> None:
+    """Stream one agent with adaptive timeouts, hedging if the first token is late.
+
+    `timeout` is the default deadline. Once the agent has enough history for
+    this stage, `policy` replaces it with one learned from observed latency and
+    adds an inactivity timeout; pass policy=None to always use `timeout` as-is.
+    On success the total latency and the largest inter-token gap are recorded
+    as "<stage>" and "<stage>.gap" samples.
+
+    If no TokenChunk arrives within the agent's historical p90 time-to-first-token
+    for this stage (and the hedge budget allows), a second identical invocation
+    starts. The first invocation to produce output (a token or a successful exit)
+    wins; the other is cancelled. Only the winner's events reach `q`, so
+    consumers see exactly one stream and one terminal event per agent.
+
+    With cold history (fewer than history.min_samples) no hedge is attempted.
+
+    `slots` is a concurrency limit the caller already holds one slot of for
+    this call. A hedge is a second agent process, so it needs a slot of its
+    own: it starts only if one is free right away (it never waits, which
+    would make it late by definition) and releases it when it ends.
+    Otherwise hedging is given up for this call.
+    """
+    loop = asyncio.get_running_loop()
+    shared: asyncio.Queue[tuple[int, BridgeEvent]] = asyncio.Queue()
+    tasks: dict[int, asyncio.Task] = {}
+    starts: dict[int, float] = {}
+
+    idle_timeout: Optional[float] = None
+    if policy is not None:
+        timeout, idle_timeout = policy.timeouts(history, spec.name, stage, timeout)
+
+    def _launch() -> None:
+        lane = len(tasks)
+        starts[lane] = loop.time()
+        tasks[lane] = asyncio.create_task(
+            stream(spec, prompt, timeout, _Lane(shared, lane), idle_timeout=idle_timeout)
+        )
+        if lane and slots is not None:
+            tasks[lane].add_done_callback(lambda _task: slots.release())
+
+    ttft_stage = f"{stage}.ttft"
+    budget.note_request(spec.name)
+    hedge_after = history.percentile(spec.name, ttft_stage, HEDGE_PERCENTILE)
+    _launch()
+
+    try:
+        winner: Optional[int] = None
+        failed: set[int] = set()
+        while winner is None:
+            wait: Optional[float] = None
+            if hedge_after is not None and len(tasks) == 1:
+                wait = max(0.0, starts[0] + hedge_after - loop.time())
+            try:
+                lane, event = await asyncio.wait_for(shared.get(), wait)
+            except asyncio.TimeoutError:
+                if (slots is None or not slots.locked()) and budget.try_spend(spec.name):
+                    if slots is not None:
+                        await slots.acquire()  # free, so this returns without waiting
+                    _launch()
+                else:
+                    hedge_after = None
+                continue
+            if event.type in ("token", "done"):
+                winner = lane
+                if event.type == "token":
+                    history.record(spec.name, ttft_stage, loop.time() - starts[lane])
+                await q.put(event)
+                break
+            # error/timeout before any output: hedging targets stalls, not failures,
+            # so this is final unless another lane is still in flight.
+            failed.add(lane)
+            if len(failed) == len(tasks):
+                await q.put(event)
+                return
+
+        for lane, task in tasks.items():
+            if lane != winner:
+                task.cancel()
+        last_token = loop.time()
+        max_gap = 0.0
+        while event.type != "done":
+            lane, event = await shared.get()
+            if lane != winner:
+                continue
+            await q.put(event)
+            if event.type == "token":
+                now = loop.time()
+                max_gap = max(max_gap, now - last_token)
+                last_token = now
+            elif event.type in ("error", "timeout"):
+                return
+        history.record(spec.name, stage, loop.time() - starts[winner])
+        history.record(spec.name, f"{stage}.gap", max_gap)
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
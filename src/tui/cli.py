@@ -0,0 +1,37 @@
+"""The `agent-bureau` command.
+
+Subcommands that need no UI (`stats`, `batch`, `run`, `daemon`) are
+dispatched before Textual is imported, so scripts that call them do not
+pay for loading it. Anything else starts the TUI (tui.app.main).
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+
+# subcommand -> "module:function" taking the remaining arguments and returning an exit code
+SUBCOMMANDS = {
+    "stats": "tui.analytics:main",
+    "batch": "tui.batch:main",
+    "run": "tui.batch:run_main",
+    "daemon": "tui.daemon:main",
+}
+
+
+def run_subcommand(argv: list[str]) -> int | None:
+    """Run argv[0] as a headless subcommand and return its exit code; None if it is not one."""
+    if not argv or argv[0] not in SUBCOMMANDS:
+        return None
+    module, _, function = SUBCOMMANDS[argv[0]].partition(":")
+    return getattr(importlib.import_module(module), function)(argv[1:])
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry point for the `agent-bureau` CLI command."""
+    argv = sys.argv[1:] if argv is None else argv
+    code = run_subcommand(argv)
+    if code is not None:
+        sys.exit(code)
+    from tui.app import main as app_main
+
+    app_main(argv)
@@ -0,0 +1,373 @@
+"""`agent-bureau daemon` — the agent fan-out as a background service on a Unix socket.
+
+Agent processes used to live and die with the TUI: closing the terminal
+killed a long reconciliation, and a second terminal could not watch it.
+The daemon owns the agents (one HeadlessRunner, so one set of concurrency
+slots and one latency history shared by every session) and the session
+journal. Clients only submit prompts and read events, so they can attach
+and detach while sessions keep running. The clients are the `daemon`
+subcommands and the TUI started with `--daemon` or `--attach SESSION`.
+
+Each session's events (the dicts HeadlessRunner emits: tokens and terminal
+events per phase, the classification, each reconcile round, then the
+result) are kept in memory and numbered by "seq". Attaching with an offset
+replays from there and then follows live until the result, so a client
+that reconnects misses nothing.
+
+Protocol: newline-delimited JSON over .disagree/bureau.sock. The client
+sends one request line and reads lines until the daemon closes the
+connection:
+
+  {"op": "submit", "prompt": ..., "follow": bool} -> {"type": "accepted", "session": id}, then its events if follow
+  {"op": "attach", "session": id, "offset": n}    -> events with seq >= n, live until the result
+  {"op": "list"}                                  -> {"type": "sessions", "sessions": [...]}
+
+Bad requests get {"type": "rejected", "message": ...}. A submit may carry
+"context", an Environment section the agents get ahead of the prompt (the
+TUI sends its environment and relevant files); sessions are listed and
+journaled under the prompt alone.
+
+With --http the same sessions are also served read-only to browsers as
+Server-Sent Events (see tui.sse_server).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from tui.batch import BatchItem, HeadlessOptions, HeadlessRunner
+from tui.journal import SessionJournal, new_session_id
+from tui.session import ConvergencePolicy
+from tui.stats import DISAGREE_DIR, LatencyHistory
+
+SOCKET_PATH = DISAGREE_DIR / "bureau.sock"
+# Result lines carry whole proposals; the default 64 KiB line limit is too small.
+LINE_LIMIT = 16 * 1024 * 1024
+
+
+class SessionLog:
+    """The numbered events of one session, readable from any offset while it grows."""
+
+    def __init__(self, session: str, prompt: str) -> None:
+        self.session = session
+        self.prompt = prompt
+        self.events: list[dict] = []
+        self.finished = False
+        self._changed = asyncio.Event()
+
+    def append(self, record: dict) -> None:
+        self.events.append({**record, "seq": len(self.events)})
+        self._wake()
+
+    def finish(self) -> None:
+        self.finished = True
+        self._wake()
+
+    def _wake(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self, offset: int = 0) -> AsyncIterator[dict]:
+        """Events from offset on, waiting for new ones until the session finishes."""
+        position = max(0, offset)
+        while True:
+            changed = self._changed  # taken before draining, so no append is missed
+            while position < len(self.events):
+                yield self.events[position]
+                position += 1
+            if self.finished:
+                return
+            await changed.wait()
+
+    def summary(self) -> dict:
+        return {
+            "session": self.session, "prompt": self.prompt,
+            "events": len(self.events), "finished": self.finished,
+        }
+
+
+class SessionHub:
+    """Runs submitted prompts on one HeadlessRunner and keeps each session's event log.
+
+    At most `max_sessions` logs are kept; the oldest finished ones are dropped first.
+    """
+
+    def __init__(
+        self,
+        options: HeadlessOptions = HeadlessOptions(),
+        concurrency: int = 4,
+        latency: LatencyHistory | None = None,
+        journal: SessionJournal | None = None,
+        max_sessions: int = 100,
+    ) -> None:
+        self.runner = HeadlessRunner(
+            options, concurrency=concurrency, latency=latency, journal=journal,
+            on_event=self._route,
+        )
+        self.max_sessions = max_sessions
+        self._logs: dict[str, SessionLog] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def _route(self, record: dict) -> None:
+        log = self._logs.get(record["session"])
+        if log is not None:
+            log.append(record)
+
+    def submit(self, prompt: str, context: str = "") -> str:
+        """Start a session for prompt; returns its id. Must be called on the event loop.
+
+        context is passed to the agents as the prompt's Environment section.
+        """
+        session = new_session_id()
+        log = SessionLog(session, prompt)
+        self._logs[session] = log
+        self._prune()
+        task = asyncio.create_task(self._run(log, context))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return session
+
+    async def _run(self, log: SessionLog, context: str = "") -> None:
+        try:
+            item = BatchItem(log.session, log.prompt, context)
+            result = await self.runner.run(item, session=log.session)
+            log.append({"type": "result", **result})
+        except asyncio.CancelledError:
+            log.append({"type": "cancelled", "session": log.session})
+            raise
+        except Exception as exc:
+            log.append({"type": "failed", "session": log.session, "message": str(exc)})
+        finally:
+            log.finish()
+
+    def _prune(self) -> None:
+        excess = len(self._logs) - self.max_sessions
+        for session in [s for s, log in self._logs.items() if log.finished][:max(0, excess)]:
+            del self._logs[session]
+
+    def get(self, session: str) -> SessionLog | None:
+        return self._logs.get(session)
+
+    def sessions(self) -> list[dict]:
+        return [log.summary() for log in self._logs.values()]
+
+    async def close(self) -> None:
+        """Cancel running sessions (their agents are terminated)."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class BridgeDaemon:
+    """Serves a SessionHub on a Unix socket (owner-only permissions)."""
+
+    def __init__(self, hub: SessionHub, path: Path = SOCKET_PATH) -> None:
+        self.hub = hub
+        self.path = path
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        """Listen on path; a stale socket file is replaced, a live daemon is an error.
+
+        Raises:
+            RuntimeError: another daemon is already listening on path.
+        """
+        if self.path.exists():
+            try:
+                _, writer = await asyncio.open_unix_connection(str(self.path))
+            except OSError:
+                self.path.unlink()
+            else:
+                writer.close()
+                raise RuntimeError(f"a daemon is already listening on {self.path}")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._server = await asyncio.start_unix_server(
+            self._handle, path=str(self.path), limit=LINE_LIMIT
+        )
+        os.chmod(self.path, 0o600)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+        await self.hub.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            try:
+                request = json.loads(await reader.readline())
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as exc:
+                await _send(writer, {"type": "rejected", "message": f"bad request: {exc}"})
+                return
+            op = request.get("op")
+            if op == "list":
+                await _send(writer, {"type": "sessions", "sessions": self.hub.sessions()})
+            elif op == "submit":
+                prompt = request.get("prompt")
+                if not isinstance(prompt, str) or not prompt.strip():
+                    await _send(writer, {"type": "rejected", "message": "no prompt"})
+                    return
+                context = request.get("context", "")
+                session = self.hub.submit(prompt.strip(), context if isinstance(context, str) else "")
+                await _send(writer, {"type": "accepted", "session": session})
+                if request.get("follow", True):
+                    await self._stream(writer, session, 0)
+            elif op == "attach":
+                offset = request.get("offset", 0)
+                await self._stream(writer, request.get("session"), offset if isinstance(offset, int) else 0)
+            else:
+                await _send(writer, {"type": "rejected", "message": f"unknown op {op!r}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # the client detached; its sessions keep running
+        finally:
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter, session: object, offset: int) -> None:
+        log = self.hub.get(session) if isinstance(session, str) else None
+        if log is None:
+            await _send(writer, {"type": "rejected", "message": f"unknown session {session!r}"})
+            return
+        async for record in log.follow(offset):
+            await _send(writer, record)
+
+
+async def _send(writer: asyncio.StreamWriter, record: dict) -> None:
+    writer.write(json.dumps(record).encode() + b"\n")
+    await writer.drain()
+
+
+async def request(payload: dict, path: Path = SOCKET_PATH) -> AsyncIterator[dict]:
+    """Send one request to the daemon and yield its response lines as they arrive."""
+    reader, writer = await asyncio.open_unix_connection(str(path), limit=LINE_LIMIT)
+    try:
+        writer.write(json.dumps(payload).encode() + b"\n")
+        await writer.drain()
+        while line := await reader.readline():
+            yield json.loads(line)
+    finally:
+        writer.close()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    journal = SessionJournal()
+    hub = SessionHub(
+        HeadlessOptions(convergence=ConvergencePolicy(max_rounds=max(1, args.max_rounds))),
+        concurrency=max(1, args.concurrency),
+        latency=await asyncio.to_thread(LatencyHistory.load),
+        journal=journal,
+    )
+    daemon = BridgeDaemon(hub, args.socket)
+    await daemon.start()
+    web = None
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    print(f"agent-bureau daemon listening on {args.socket}", file=sys.stderr, flush=True)
+    try:
+        if args.http is not None:
+            from tui.sse_server import EventServer
+
+            host, port = args.http
+            web = EventServer(hub, host, port)
+            await web.start()
+            print(f"session viewer on http://{host}:{web.port}/", file=sys.stderr, flush=True)
+        await stop.wait()
+    finally:
+        if web is not None:
+            await web.close()
+        await daemon.close()
+        journal.flush()
+        journal.close()
+
+
+def _http_address(value: str) -> tuple[str, int]:
+    """Parse --http: PORT or HOST:PORT (HOST defaults to 127.0.0.1)."""
+    host, _, port = value.rpartition(":")
+    try:
+        return host or "127.0.0.1", int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected PORT or HOST:PORT, got {value!r}") from None
+
+
+async def _print_responses(payload: dict, path: Path) -> int:
+    code = 0
+    async for record in request(payload, path):
+        if record["type"] == "rejected":
+            code = 1
+        sys.stdout.write(json.dumps(record) + "\n")
+        sys.stdout.flush()
+    return code
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Entry point for `agent-bureau daemon`."""
+    parser = argparse.ArgumentParser(
+        prog="agent-bureau daemon",
+        description="Run agent sessions in a background daemon and attach to them.",
+    )
+    parser.add_argument(
+        "--socket", type=Path, default=SOCKET_PATH, metavar="PATH",
+        help=f"Unix socket of the daemon (default: {SOCKET_PATH})",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the daemon in the foreground")
+    serve.add_argument(
+        "--concurrency", type=int, default=4, metavar="N",
+        help="maximum agent invocations running at once, across all sessions",
+    )
+    serve.add_argument(
+        "--max-rounds", type=int, default=ConvergencePolicy.max_rounds, metavar="N",
+        help="maximum reconciliation rounds per session",
+    )
+    serve.add_argument(
+        "--http", type=_http_address, default=None, metavar="[HOST:]PORT",
+        help="also serve a read-only browser viewer with Server-Sent Events "
+             "(HOST defaults to 127.0.0.1; reach it remotely through an SSH tunnel)",
+    )
+    submit = commands.add_parser("submit", help="start a session and follow its events")
+    submit.add_argument("prompt")
+    submit.add_argument(
+        "--detach", action="store_true", help="print the session id and return immediately",
+    )
+    attach = commands.add_parser("attach", help="replay and follow a session's events")
+    attach.add_argument("session")
+    attach.add_argument(
+        "--offset", type=int, default=0, metavar="SEQ",
+        help="first event to replay (the seq after the last one already seen)",
+    )
+    commands.add_parser("list", help="list the daemon's sessions")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(_serve(args))
+        except (RuntimeError, OSError) as exc:
+            parser.exit(1, f"agent-bureau daemon: {exc}\n")
+        return 0
+
+    if args.command == "submit":
+        payload = {"op": "submit", "prompt": args.prompt, "follow": not args.detach}
+    elif args.command == "attach":
+        payload = {"op": "attach", "session": args.session, "offset": args.offset}
+    else:
+        payload = {"op": "list"}
+    try:
+        return asyncio.run(_print_responses(payload, args.socket))
+    except OSError as exc:
+        parser.exit(1, f"agent-bureau daemon: cannot reach {args.socket}: {exc}\n")
+    except KeyboardInterrupt:
+        return 130  # detached; the session keeps running in the daemon
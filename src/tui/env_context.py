@@ -0,0 +1,114 @@
+"""Environment context prepended to every prompt, gathered once and cached.
+
+gather_env_context() runs two `git` subprocesses and lists the project root,
+which is too slow to do on the UI thread for every prompt. EnvContextCache
+keeps the last result together with a cheap fingerprint of what it depends
+on (the contents of .git/HEAD, plus the mtimes of .git/config and of the
+project root directory) and only recomputes it, in a thread, when the
+fingerprint changes: after a branch switch, a remote change, or a top-level
+file being added or removed.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import threading
+from pathlib import Path
+
+# Top-level entries never listed in the context.
+_SKIP = {"__pycache__", "node_modules", ".git", ".venv", "venv", ".mypy_cache"}
+# Hidden entries that are listed anyway.
+_KEEP_HIDDEN = {".planning"}
+
+
+def with_env_context(prompt: str, context: str) -> str:
+    """prompt under a Task heading, after context as its Environment section ("" adds nothing)."""
+    return f"## Environment\n{context}\n\n## Task\n{prompt}" if context else prompt
+
+
+def gather_env_context(root: Path) -> str:
+    """Collect cwd, git branch, git remote and top-level project structure (blocking).
+
+    Returns a compact multi-line string suitable for prepending to user
+    prompts so both agents understand the environment they are operating in.
+    Returns an empty string if nothing useful can be gathered.
+    """
+    lines: list[str] = [f"Working directory: {root}"]
+
+    for label, argv in (
+        ("Git branch", ["git", "branch", "--show-current"]),
+        ("Git remote", ["git", "remote", "get-url", "origin"]),
+    ):
+        try:
+            value = subprocess.check_output(
+                argv, cwd=root, text=True, stderr=subprocess.DEVNULL,
+            ).strip()
+            if value:
+                lines.append(f"{label}: {value}")
+        except Exception:
+            pass
+
+    try:
+        entries = sorted(
+            e for e in os.listdir(root)
+            if e not in _SKIP and not (e.startswith(".") and e not in _KEEP_HIDDEN)
+        )
+        if entries:
+            lines.append(f"Project root: {', '.join(entries[:30])}")
+    except Exception:
+        pass
+
+    return "\n".join(lines)
+
+
+def _fingerprint(root: Path) -> tuple:
+    """Cheap stamp of everything gather_env_context() reads (stat calls and one tiny read)."""
+    def _mtime(path: Path) -> int | None:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    try:
+        head = (root / ".git" / "HEAD").read_text()
+    except OSError:
+        head = None
+    return (head, _mtime(root / ".git" / "config"), _mtime(root))
+
+
+class EnvContextCache:
+    """Cached gather_env_context() for one project root.
+
+    get() never runs a subprocess: it returns the cached context if it is still
+    fresh, otherwise None. current() refreshes in a worker thread when needed.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = root if root is not None else Path.cwd()
+        self._value: str | None = None
+        self._stamp: tuple | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> str | None:
+        """The cached context if nothing it depends on has changed, else None."""
+        if self._value is None or _fingerprint(self.root) != self._stamp:
+            return None
+        return self._value
+
+    def refresh(self) -> str:
+        """Recompute the context now (blocking; run it off the UI thread)."""
+        with self._lock:
+            # Stamp before gathering, so a change made while gathering
+            # leaves the cache stale rather than silently current.
+            stamp = _fingerprint(self.root)
+            value = gather_env_context(self.root)
+            self._value, self._stamp = value, stamp
+            return value
+
+    async def current(self) -> str:
+        """The fresh context, recomputed in a thread only if the cache is stale."""
+        cached = self.get()
+        if cached is not None:
+            return cached
+        return await asyncio.to_thread(self.refresh)
@@ -22,16 +22,41 @@ class AgentSpec:
     # If set, system_prompt is passed as --flag "text" before the user prompt.
     # If empty, system_prompt is prepended directly to the user prompt string.
     system_prompt_flag: str = ""
-
-    def build_argv(self, prompt: str) -> list[str]:
-        """Return the full argument vector, injecting system_prompt if set."""
+    # How the prompt reaches the agent:
+    #   "argv"  — last command-line argument (subject to ARG_MAX / E2BIG)
+    #   "stdin" — streamed to the subprocess's stdin, which is then closed
+    #   "file"  — written to a temp file whose path is passed on the command line
+    prompt_transport: Literal["argv", "stdin", "file"] = "argv"
+    # Extra trailing arguments for "stdin"/"file" transports, e.g. ("-",) for
+    # CLIs that need an explicit stdin marker or ("--prompt-file", "{path}").
+    # For "file", "{path}" is replaced by the temp file path; if no argument
+    # contains it, the path is appended.
+    prompt_args: tuple[str, ...] = ()
+
+    def build_input(self, prompt: str) -> str:
+        """Return the prompt text to deliver, with system_prompt prepended if no flag."""
+        if self.system_prompt and not self.system_prompt_flag:
+            return f"{self.system_prompt}\n\n---\n\n{prompt}"
+        return prompt
+
+    def build_argv(self, prompt: str, prompt_path: str = "") -> list[str]:
+        """Return the full argument vector, injecting system_prompt if set.
+
+        For the "argv" transport the prompt is the last argument. For "stdin" it
+        is omitted (see build_input). For "file", prompt_path is substituted.
+        """
         argv = [self.command, *self.args]
-        if self.system_prompt:
-            if self.system_prompt_flag:
-                argv.extend([self.system_prompt_flag, self.system_prompt])
+        if self.system_prompt and self.system_prompt_flag:
+            argv.extend([self.system_prompt_flag, self.system_prompt])
+        if self.prompt_transport == "argv":
+            argv.append(self.build_input(prompt))
+        elif self.prompt_transport == "stdin":
+            argv.extend(self.prompt_args)
+        else:
+            if any("{path}" in arg for arg in self.prompt_args):
+                argv.extend(arg.replace("{path}", prompt_path) for arg in self.prompt_args)
             else:
-                prompt = f"{self.system_prompt}\n\n---\n\n{prompt}"
-        argv.append(prompt)
+                argv.extend([*self.prompt_args, prompt_path])
         return argv
 
 
@@ -56,20 +81,44 @@ class AgentDone:
 
 @dataclass(frozen=True)
 class AgentError:
-    """Terminal event: agent exited with a non-zero exit code."""
+    """Terminal event: agent exited with a non-zero exit code.
+
+    partial_text holds every line streamed before the failure, newline-joined.
+    """
 
     agent: str
     message: str
     exit_code: int
+    partial_text: str = ""
     type: Literal["error"] = "error"
 
 
 @dataclass(frozen=True)
 class AgentTimeout:
-    """Terminal event: agent exceeded the global timeout."""
+    """Terminal event: agent exceeded its timeout.
+
+    idle is True when the agent was stopped for producing no output within the
+    inactivity timeout, rather than for exceeding the overall deadline.
+    partial_text holds every line streamed before the timeout, newline-joined.
+    """
 
     agent: str
+    idle: bool = False
+    partial_text: str = ""
     type: Literal["timeout"] = "timeout"
 
 
 BridgeEvent = Union[TokenChunk, AgentDone, AgentError, AgentTimeout]
+
+
+def terminal_text(event: BridgeEvent) -> str:
+    """Return the transcript carried by a terminal event.
+
+    AgentDone yields full_text; AgentError and AgentTimeout yield whatever was
+    streamed before the failure. TokenChunk yields "".
+    """
+    if isinstance(event, AgentDone):
+        return event.full_text
+    if isinstance(event, (AgentError, AgentTimeout)):
+        return event.partial_text
+    return ""
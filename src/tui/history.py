@@ -0,0 +1,346 @@
+"""Searchable session history in SQLite (.disagree/history.db).
+
+sessions.jsonl is append-only and records every stage separately (and the
+log's older records repeat), so searching it means re-reading and grepping
+the whole file. HistoryStore imports the journal into SQLite instead:
+
+- one row per session (id, time, outcome, written files),
+- texts (prompt, each agent's output, code blocks) stored once per content
+  hash in a blobs table, so repeated prompts and answers cost nothing,
+- an FTS5 index over prompt, outputs and code, reading its content through a
+  view over those two tables rather than keeping another copy.
+
+sync() imports only what was appended since the last call (tracking the
+journal's inode and byte offset) plus any rotated .gz segments not yet seen.
+Imports are idempotent: records are merged per session id, and records
+without one (the legacy format) are keyed by their content hash, which also
+collapses the repeats. Texts the journal keeps in the blob store (see
+tui.blobs) are resolved on import.
+
+search() pages results with LIMIT/OFFSET, ranked by BM25, so a browser can
+load them lazily.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tui.apply import extract_code_proposals
+from tui.blobs import BlobStore, resolve
+from tui.journal import JOURNAL_PATH
+from tui.stats import DISAGREE_DIR
+
+HISTORY_PATH = DISAGREE_DIR / "history.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, text TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS sessions (
+    sid INTEGER PRIMARY KEY,
+    id TEXT UNIQUE NOT NULL,
+    ts REAL NOT NULL DEFAULT 0,
+    prompt_hash TEXT, claude_hash TEXT, codex_hash TEXT, code_hash TEXT,
+    status TEXT NOT NULL DEFAULT 'open',
+    files TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS sessions_ts ON sessions (ts);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE VIEW IF NOT EXISTS session_text AS
+    SELECT s.sid AS sid,
+           coalesce(p.text, '') AS prompt,
+           coalesce(a.text, '') || char(10) || coalesce(b.text, '') AS output,
+           coalesce(c.text, '') AS code
+    FROM sessions s
+    LEFT JOIN blobs p ON p.hash = s.prompt_hash
+    LEFT JOIN blobs a ON a.hash = s.claude_hash
+    LEFT JOIN blobs b ON b.hash = s.codex_hash
+    LEFT JOIN blobs c ON c.hash = s.code_hash;
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+    prompt, output, code, content='session_text', content_rowid='sid'
+);
+"""
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    """One search result.
+
+    Attributes:
+        session: Session id.
+        ts:      Unix time the session started (0 if unknown).
+        prompt:  The user's prompt.
+        status:  "applied", "cancelled" or "open".
+        files:   Files written when the answer was applied.
+        snippet: Matching excerpt with hits in [brackets] ("" for unfiltered listings).
+    """
+
+    session: str
+    ts: float
+    prompt: str
+    status: str
+    files: tuple[str, ...] = ()
+    snippet: str = ""
+
+
+@dataclass
+class SessionRecord:
+    """A session's searchable content, assembled from its journal records."""
+
+    id: str
+    ts: float = 0.0
+    prompt: str = ""
+    outputs: dict[str, str] = field(default_factory=dict)
+    code: list[str] = field(default_factory=list)
+    status: str = "open"
+    files: list[str] = field(default_factory=list)
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def fts_query(text: str) -> str:
+    """Quote each word of free text for FTS5 MATCH; the last word matches as a prefix."""
+    words = ['"' + w.replace('"', '""') + '"' for w in text.split()]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
+
+
+def sessions_from_records(records: Iterable[dict]) -> list[SessionRecord]:
+    """Group journal records into SessionRecords, in order of first appearance."""
+    sessions: dict[str, SessionRecord] = {}
+    for record in records:
+        session_id = record.get("session")
+        if not session_id:
+            # Legacy record: one whole session per line, identified by its content.
+            canonical = json.dumps(record, sort_keys=True, default=str)
+            session_id = "legacy-" + content_hash(canonical)[:16]
+        session = sessions.setdefault(session_id, SessionRecord(id=session_id))
+        if not session.ts and record.get("ts"):
+            session.ts = float(record["ts"])
+        stage = record.get("stage", "classification")
+        if record.get("prompt"):
+            session.prompt = record["prompt"]
+        if stage == "stream" and record.get("text"):
+            session.outputs[record.get("agent", "")] = record["text"]
+        elif stage == "classification":
+            for key, default in (("agent_a", "claude"), ("agent_b", "codex")):
+                agent = record.get(key) or {}
+                if agent.get("answer") and (agent.get("name") or default) not in session.outputs:
+                    session.outputs[agent.get("name") or default] = agent["answer"]
+        elif stage == "race" and record.get("text"):
+            session.outputs[record.get("winner", "")] = record["text"]
+        elif stage == "reconcile_round":
+            codes = [p.get("code", "") for p in (record.get("proposals") or {}).values()]
+            if any(codes):
+                session.code = [c for c in codes if c]
+        elif stage == "apply":
+            session.status = "applied" if record.get("confirmed") else "cancelled"
+            session.files = list(record.get("files") or [])
+    for session in sessions.values():
+        if not session.code:
+            session.code = [
+                p.code for text in session.outputs.values() for p in extract_code_proposals(text)
+            ]
+    return list(sessions.values())
+
+
+class HistoryStore:
+    """SQLite history of sessions with FTS5 search. Safe to share between threads."""
+
+    def __init__(self, path: Path = HISTORY_PATH) -> None:
+        self.path = path
+        if str(path) != ":memory:":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # --- import ---
+
+    def _blob(self, text: str) -> str | None:
+        if not text:
+            return None
+        digest = content_hash(text)
+        self._db.execute("INSERT OR IGNORE INTO blobs (hash, text) VALUES (?, ?)", (digest, text))
+        return digest
+
+    def _text(self, digest: str | None) -> str:
+        if digest is None:
+            return ""
+        row = self._db.execute("SELECT text FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        return row[0] if row else ""
+
+    def _upsert(self, session: SessionRecord) -> None:
+        """Merge session into its row (newer non-empty fields win) and re-index it."""
+        row = self._db.execute(
+            "SELECT sid, ts, prompt_hash, claude_hash, codex_hash, code_hash, status, files"
+            " FROM sessions WHERE id = ?", (session.id,),
+        ).fetchone()
+        code = "\n\n".join(session.code)
+        values = {
+            "ts": session.ts,
+            "prompt_hash": self._blob(session.prompt),
+            "claude_hash": self._blob(session.outputs.get("claude", "")),
+            "codex_hash": self._blob(session.outputs.get("codex", "")),
+            "code_hash": self._blob(code),
+            "status": session.status if session.status != "open" else None,
+            "files": json.dumps(session.files) if session.files else None,
+        }
+        if row is None:
+            cursor = self._db.execute(
+                "INSERT INTO sessions (id, ts, prompt_hash, claude_hash, codex_hash, code_hash,"
+                " status, files) VALUES (?, ?, ?, ?, ?, ?, coalesce(?, 'open'), coalesce(?, '[]'))",
+                (session.id, *values.values()),
+            )
+            sid = cursor.lastrowid
+        else:
+            sid = row[0]
+            old = dict(zip(values, row[1:]))
+            merged = {key: values[key] or old[key] for key in values}
+            merged["ts"] = old["ts"] or values["ts"]  # keep when the session started
+            if merged == old:
+                return
+            self._db.execute(
+                "INSERT INTO history_fts (history_fts, rowid, prompt, output, code)"
+                " SELECT 'delete', sid, prompt, output, code FROM session_text WHERE sid = ?", (sid,),
+            )
+            self._db.execute(
+                "UPDATE sessions SET ts = ?, prompt_hash = ?, claude_hash = ?, codex_hash = ?,"
+                " code_hash = ?, status = ?, files = ? WHERE sid = ?",
+                (*merged.values(), sid),
+            )
+        self._db.execute(
+            "INSERT INTO history_fts (rowid, prompt, output, code)"
+            " SELECT sid, prompt, output, code FROM session_text WHERE sid = ?", (sid,),
+        )
+
+    def add_records(self, records: Iterable[dict]) -> int:
+        """Import journal records. Returns the number of sessions touched."""
+        sessions = sessions_from_records(records)
+        with self._lock, self._db:
+            for session in sessions:
+                self._upsert(session)
+        return len(sessions)
+
+    def _meta(self, key: str) -> str | None:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def sync(self, journal: Path = JOURNAL_PATH) -> int:
+        """Import journal lines appended since the last sync, and unseen rotated segments.
+
+        Returns:
+            Number of sessions touched.
+        """
+        touched = 0
+        blobs = BlobStore(journal.parent / "blobs")
+        for segment in sorted(journal.parent.glob(f"{journal.stem}-*{journal.suffix}.gz")):
+            with self._lock:
+                seen = self._meta(f"segment:{segment.name}")
+            if seen:
+                continue
+            try:
+                with gzip.open(segment, "rb") as f:
+                    touched += self.add_records(_parse_lines(f.read(), blobs))
+            except (OSError, EOFError):
+                continue
+            with self._lock, self._db:
+                self._set_meta(f"segment:{segment.name}", "1")
+
+        try:
+            with open(journal, "rb") as f:
+                inode = str(os.fstat(f.fileno()).st_ino)
+                with self._lock:
+                    offset = int(self._meta("journal_offset") or 0)
+                    if self._meta("journal_inode") != inode or offset > os.fstat(f.fileno()).st_size:
+                        offset = 0
+                f.seek(offset)
+                data = f.read()
+        except OSError:
+            return touched
+        complete = data.rfind(b"\n") + 1  # leave a half-written last line for next time
+        touched += self.add_records(_parse_lines(data[:complete], blobs))
+        with self._lock, self._db:
+            self._set_meta("journal_inode", inode)
+            self._set_meta("journal_offset", str(offset + complete))
+        return touched
+
+    # --- queries ---
+
+    @property
+    def session_count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT count(*) FROM sessions").fetchone()[0]
+
+    def search(self, text: str = "", limit: int = 50, offset: int = 0) -> list[HistoryEntry]:
+        """One page of sessions matching text (all sessions, newest first, if text is blank)."""
+        if text.strip():
+            sql = (
+                "SELECT s.id, s.ts, coalesce(p.text, ''), s.status, s.files,"
+                " snippet(history_fts, -1, '[', ']', '…', 12)"
+                " FROM history_fts JOIN sessions s ON s.sid = history_fts.rowid"
+                " LEFT JOIN blobs p ON p.hash = s.prompt_hash"
+                " WHERE history_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?"
+            )
+            params: tuple = (fts_query(text), limit, offset)
+        else:
+            sql = (
+                "SELECT s.id, s.ts, coalesce(p.text, ''), s.status, s.files, ''"
+                " FROM sessions s LEFT JOIN blobs p ON p.hash = s.prompt_hash"
+                " ORDER BY s.ts DESC, s.sid DESC LIMIT ? OFFSET ?"
+            )
+            params = (limit, offset)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            HistoryEntry(session=r[0], ts=r[1], prompt=r[2], status=r[3],
+                         files=tuple(json.loads(r[4])), snippet=r[5])
+            for r in rows
+        ]
+
+    def get(self, session: str) -> SessionRecord | None:
+        """The stored texts of one session."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT ts, prompt_hash, claude_hash, codex_hash, code_hash, status, files"
+                " FROM sessions WHERE id = ?", (session,),
+            ).fetchone()
+            if row is None:
+                return None
+            outputs = {
+                agent: self._text(digest)
+                for agent, digest in (("claude", row[2]), ("codex", row[3])) if digest
+            }
+            code = self._text(row[4])
+            return SessionRecord(
+                id=session, ts=row[0], prompt=self._text(row[1]), outputs=outputs,
+                code=[code] if code else [], status=row[5], files=json.loads(row[6]),
+            )
+
+
+def _parse_lines(data: bytes, blobs: BlobStore) -> list[dict]:
+    records = []
+    for line in data.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict):
+            records.append(resolve(record, blobs))
+    return records
@@ -0,0 +1,277 @@
+"""Append-only session journal in .disagree/sessions.jsonl.
+
+Every stage of a session is one JSON line tagged with the session id and
+stage name: "prompt", "stream" (one per agent), "classification",
+"reconcile_round", "race" and "apply". The classification record keeps the
+log's established keys (prompt, agent_a, agent_b, disagreements).
+
+SessionJournal.append() only enqueues the record; a background thread
+batches records and appends them under an exclusive fcntl lock, so several
+running instances can share the file and the UI thread never touches disk.
+When the active file exceeds `max_bytes` it is renamed to a timestamped
+segment and gzip-compressed, keeping the newest `keep_segments` segments.
+
+Long strings (answers, code, checkpointed texts) are not written inline:
+the writer thread stores them in the content-addressed BlobStore next to
+the journal and writes {"$blob": hash} instead, so the same text journaled
+at every stage and round takes disk space once. Every string field is
+eligible, the prompt and the classification answers included, so readers
+of sessions.jsonl must resolve the references: read_journal() and
+load_checkpoint() do, other readers call tui.blobs.resolve() on each
+record. blob_min_size=0 keeps every text inline.
+
+While a session is in flight the app also journals "checkpoint" records:
+the lines streamed since the previous checkpoint plus a snapshot of the
+session state. load_checkpoint() folds them back into one Checkpoint, from
+which `agent-bureau --resume` rebuilds the app without calling the agents.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tui.blobs import BlobStore, externalize, resolve
+from tui.stats import DISAGREE_DIR
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms journal without locking
+    fcntl = None
+
+JOURNAL_PATH = DISAGREE_DIR / "sessions.jsonl"
+
+
+def new_session_id() -> str:
+    """A short random id grouping one session's records."""
+    return uuid.uuid4().hex[:12]
+
+
+class SessionJournal:
+    """Batched, locked, rotating JSONL writer running in a daemon thread."""
+
+    def __init__(
+        self,
+        path: Path = JOURNAL_PATH,
+        batch_size: int = 64,
+        flush_interval: float = 0.5,
+        max_bytes: int = 8 * 1024 * 1024,
+        keep_segments: int = 5,
+        blob_min_size: int = 512,
+    ) -> None:
+        """blob_min_size: strings this long go to the blob store (0 keeps everything inline)."""
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.keep_segments = keep_segments
+        self.blob_min_size = blob_min_size
+        self.blobs = BlobStore(path.parent / "blobs")
+        self._queue: queue.SimpleQueue[dict | None] = queue.SimpleQueue()
+        self._idle = threading.Condition()
+        self._unwritten = 0
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    # --- producer side (any thread, never blocks on I/O) ---
+
+    def append(self, record: dict) -> None:
+        """Queue one record; "ts" is added if missing. Ignored after close()."""
+        if self._closed:
+            return
+        record.setdefault("ts", round(time.time(), 3))
+        with self._idle:
+            self._unwritten += 1
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="session-journal", daemon=True)
+            self._thread.start()
+        self._queue.put(record)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued record is written. Returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._unwritten == 0, timeout)
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Write what is queued, then stop the writer thread."""
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    # --- writer thread ---
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            if record is None:
+                return
+            batch = [record]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    record = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if record is None:
+                    stop = True
+                    break
+                batch.append(record)
+            try:
+                self._write(batch)
+            except OSError:
+                pass  # the journal is best-effort; a full disk must not break the session
+            finally:
+                with self._idle:
+                    self._unwritten -= len(batch)
+                    self._idle.notify_all()
+            if stop:
+                return
+
+    def _externalize(self, record: dict) -> dict:
+        if not self.blob_min_size:
+            return record
+        try:
+            return externalize(record, self.blobs, self.blob_min_size)
+        except OSError:
+            return record  # blob store unwritable: keep the texts inline
+
+    def _write(self, batch: list[dict]) -> None:
+        batch = [self._externalize(r) for r in batch]
+        data = "".join(json.dumps(r, default=str) + "\n" for r in batch).encode()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        rotated = None
+        while True:
+            with open(self.path, "ab") as f:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    # Another instance may have rotated the file while we waited
+                    # for the lock; if so, retry on the new active file.
+                    if not _same_file(f, self.path):
+                        continue
+                    f.write(data)
+                    f.flush()
+                    rotated = self._rotate_if_full(f)
+                    break
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        if rotated is not None:
+            self._compress(rotated)
+
+    def _rotate_if_full(self, f) -> Path | None:
+        """Rename the active file to a segment if it is over max_bytes (lock held)."""
+        if os.fstat(f.fileno()).st_size < self.max_bytes:
+            return None
+        segment = self.path.with_name(f"{self.path.stem}-{time.time_ns()}{self.path.suffix}")
+        os.rename(self.path, segment)
+        return segment
+
+    def _compress(self, segment: Path) -> None:
+        """gzip a rotated segment and drop segments beyond keep_segments."""
+        with open(segment, "rb") as src, gzip.open(f"{segment}.gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        segment.unlink()
+        segments = sorted(self.path.parent.glob(f"{self.path.stem}-*{self.path.suffix}.gz"))
+        for old in segments[:-self.keep_segments] if self.keep_segments else segments:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def _same_file(f, path: Path) -> bool:
+    try:
+        return os.fstat(f.fileno()).st_ino == os.stat(path).st_ino
+    except OSError:
+        return False
+
+
+def read_journal(path: Path = JOURNAL_PATH) -> list[dict]:
+    """All records in the active journal file, skipping malformed lines.
+
+    Blob references are resolved to their text.
+    """
+    records: list[dict] = []
+    try:
+        lines = path.read_text().splitlines()
+    except OSError:
+        return records
+    blobs = BlobStore(path.parent / "blobs")
+    for line in lines:
+        try:
+            records.append(resolve(json.loads(line), blobs))
+        except ValueError:
+            continue
+    return records
+
+
+@dataclass
+class Checkpoint:
+    """An unfinished session, folded from its checkpoint records.
+
+    Attributes:
+        session:     Session id.
+        state:       SessionState name at the last checkpoint.
+        prompt:      The user's prompt.
+        lines:       Every line streamed into each agent's pane, in order.
+        last_texts:  Each agent's latest complete text (input to the next round).
+        proposals:   Reconciliation proposals as {agent: {language, code, filename}}.
+        partial:     Agents whose text was cut short.
+        finished:    Agents whose initial answer completed normally.
+        diff:        The diff under review, if review had started.
+        convergence: Convergence summary of the reconciliation loop.
+    """
+
+    session: str
+    state: str
+    prompt: str = ""
+    lines: dict[str, list[str]] = field(default_factory=dict)
+    last_texts: dict[str, str] = field(default_factory=dict)
+    proposals: dict[str, dict] = field(default_factory=dict)
+    partial: list[str] = field(default_factory=list)
+    finished: list[str] = field(default_factory=list)
+    diff: str = ""
+    convergence: str = ""
+
+
+def load_checkpoint(path: Path = JOURNAL_PATH, session: str | None = None) -> Checkpoint | None:
+    """Fold the checkpoints of session (default: the most recent one) into a Checkpoint.
+
+    Returns None if the session has no checkpoints or already ended with an
+    apply record.
+    """
+    records = read_journal(path)
+    if session is None:
+        session = next((r["session"] for r in reversed(records) if r.get("session")), None)
+    checkpoint: Checkpoint | None = None
+    for record in records:
+        if not session or record.get("session") != session:
+            continue
+        if record.get("stage") == "apply":
+            return None
+        if record.get("stage") != "checkpoint":
+            continue
+        if checkpoint is None:
+            checkpoint = Checkpoint(session=session, state=record.get("state", ""))
+        for agent, lines in (record.get("lines") or {}).items():
+            checkpoint.lines.setdefault(agent, []).extend(lines)
+        checkpoint.state = record.get("state", checkpoint.state)
+        checkpoint.prompt = record.get("prompt", checkpoint.prompt)
+        checkpoint.last_texts = record.get("last_texts", checkpoint.last_texts)
+        checkpoint.proposals = record.get("proposals", checkpoint.proposals)
+        checkpoint.partial = record.get("partial", checkpoint.partial)
+        checkpoint.finished = record.get("finished", checkpoint.finished)
+        checkpoint.diff = record.get("diff", checkpoint.diff)
+        checkpoint.convergence = record.get("convergence", checkpoint.convergence)
+    return checkpoint
@@ -0,0 +1,176 @@
+"""Local three-way merge of two code proposals against the file on disk.
+
+The "merge both" action used to hand both complete reconciliations to an
+agent. Most of the time the proposals change different parts of the file,
+which a line-based three-way merge resolves without any model call:
+
+- base:   the target file as it is on disk (the common ancestor),
+- ours:   Claude's proposal,
+- theirs: Codex's proposal.
+
+Changes made by only one side are taken as-is; identical changes on both
+sides are taken once. Only overlapping, different changes become Conflict
+segments, which the caller resolves (see tui.prompts.build_conflict_prompt)
+before calling MergeResult.render(). When there is no base (a new file) the
+merge is two-way: every region where the proposals differ is a conflict.
+
+Pure functions; no I/O.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+
+from tui.apply import diff_hunks
+
+
+@dataclass(frozen=True)
+class Conflict:
+    """A region both sides changed differently.
+
+    Attributes:
+        base:   The base lines the region replaces (empty for insertions).
+        ours:   Our version of the region.
+        theirs: Their version of the region.
+        before: Up to three merged lines preceding the region, as context.
+        after:  Up to three base lines following the region, as context.
+    """
+
+    base: tuple[str, ...]
+    ours: tuple[str, ...]
+    theirs: tuple[str, ...]
+    before: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+
+
+@dataclass
+class MergeResult:
+    """Outcome of merge3(): resolved lines interleaved with conflicts.
+
+    Attributes:
+        segments:      Resolved line runs (tuple[str, ...]) and Conflict entries, in file order.
+        auto_resolved: Number of changed regions merged without a conflict.
+    """
+
+    segments: list[tuple[str, ...] | Conflict] = field(default_factory=list)
+    auto_resolved: int = 0
+
+    @property
+    def conflicts(self) -> list[Conflict]:
+        """Conflicts in file order; index i here is conflict i in render()."""
+        return [s for s in self.segments if isinstance(s, Conflict)]
+
+    @property
+    def clean(self) -> bool:
+        """True if every change merged without a conflict."""
+        return not self.conflicts
+
+    def render(self, resolutions: Mapping[int, Sequence[str]] | None = None) -> str:
+        """Join the merged lines, substituting a resolution for each conflict.
+
+        Conflicts without a resolution keep our side.
+        """
+        resolutions = resolutions or {}
+        out: list[str] = []
+        index = 0
+        for segment in self.segments:
+            if isinstance(segment, Conflict):
+                out.extend(resolutions.get(index, segment.ours))
+                index += 1
+            else:
+                out.extend(segment)
+        return "\n".join(out)
+
+
+# (base_start, base_end, replacement lines) for one side's change
+_Change = tuple[int, int, tuple[str, ...]]
+
+
+def _changes(base: str, side: str) -> list[_Change]:
+    return [(h.a_start, h.a_end, h.b_lines) for h in diff_hunks(base, side)]
+
+
+def _side_region(base_lines: list[str], start: int, end: int, changes: list[_Change]) -> tuple[str, ...]:
+    """One side's version of base_lines[start:end], given its changes inside that range."""
+    out: list[str] = []
+    pos = start
+    for c_start, c_end, lines in changes:
+        out.extend(base_lines[pos:c_start])
+        out.extend(lines)
+        pos = c_end
+    out.extend(base_lines[pos:end])
+    return tuple(out)
+
+
+def _two_way(ours: str, theirs: str) -> MergeResult:
+    result = MergeResult()
+    our_lines = ours.splitlines()
+    pos = 0
+    for hunk in diff_hunks(ours, theirs):
+        result.segments.append(tuple(our_lines[pos:hunk.a_start]))
+        result.segments.append(Conflict(
+            base=(), ours=hunk.a_lines, theirs=hunk.b_lines,
+            before=tuple(our_lines[max(0, hunk.a_start - 3):hunk.a_start]),
+            after=tuple(our_lines[hunk.a_end:hunk.a_end + 3]),
+        ))
+        pos = hunk.a_end
+    result.segments.append(tuple(our_lines[pos:]))
+    return result
+
+
+def merge3(base: str | None, ours: str, theirs: str) -> MergeResult:
+    """Three-way merge ours and theirs against base.
+
+    Changes whose base ranges overlap or touch are grouped into one region;
+    a region changed by one side, or identically by both, is auto-resolved,
+    otherwise it becomes a Conflict.
+
+    Args:
+        base:   Common ancestor (file on disk), or None for a two-way merge.
+        ours:   First proposal.
+        theirs: Second proposal.
+
+    Returns:
+        MergeResult whose render() yields the merged code.
+    """
+    if base is None:
+        return _two_way(ours, theirs)
+
+    base_lines = base.splitlines()
+    pending = sorted(
+        [(*c, 0) for c in _changes(base, ours)] + [(*c, 1) for c in _changes(base, theirs)],
+        key=lambda c: (c[0], c[1]),
+    )
+    result = MergeResult()
+    merged: list[str] = []
+    pos = 0
+    i = 0
+    while i < len(pending):
+        start, end = pending[i][0], pending[i][1]
+        group = [pending[i]]
+        i += 1
+        while i < len(pending) and pending[i][0] <= end:
+            end = max(end, pending[i][1])
+            group.append(pending[i])
+            i += 1
+
+        merged.extend(base_lines[pos:start])
+        by_side = [[c[:3] for c in group if c[3] == side] for side in (0, 1)]
+        versions = [
+            _side_region(base_lines, start, end, changes) if changes else None
+            for changes in by_side
+        ]
+        if versions[0] is None or versions[1] is None or versions[0] == versions[1]:
+            merged.extend(versions[0] if versions[0] is not None else versions[1])
+            result.auto_resolved += 1
+        else:
+            result.segments.append(tuple(merged))
+            result.segments.append(Conflict(
+                base=tuple(base_lines[start:end]), ours=versions[0], theirs=versions[1],
+                before=tuple(merged[-3:]), after=tuple(base_lines[end:end + 3]),
+            ))
+            merged = []
+        pos = end
+    merged.extend(base_lines[pos:])
+    result.segments.append(tuple(merged))
+    return result
@@ -6,6 +6,9 @@ Handler naming convention (Textual auto-routes):
   ClassificationDone  -> on_classification_done
   ReconciliationReady -> on_reconciliation_ready
   ApplyResult         -> on_apply_result
+  RaceWon             -> on_race_won
+  QuorumReached       -> on_quorum_reached
+  DaemonEvent         -> on_daemon_event
 """
 from __future__ import annotations
 
@@ -34,10 +37,15 @@ class AgentFinished(Message):
 
 @dataclass
 class ClassificationDone(Message):
-    """Disagreement classification complete."""
+    """Disagreement classification complete.
+
+    partial lists agents whose text is a partial transcript salvaged from an
+    error or timeout rather than a completed answer.
+    """
 
     disagreements: list   # list[disagree_v1.models.Disagreement]
     full_texts: dict      # {agent_name: str}
+    partial: tuple = ()   # tuple[str, ...]
 
 
 @dataclass
@@ -45,6 +53,16 @@ class ReconciliationReady(Message):
     """Both agents finished their reconciliation passes; diff is ready for display."""
 
     diff_text: str
+    convergence: str = ""  # e.g. "2 rounds, 97% similar (no improvement)"; "" if not scored
+
+
+@dataclass
+class ReconcileRoundDone(Message):
+    """One automatic reconciliation round finished and its proposals were scored."""
+
+    round: int                # 1-based round number within the loop
+    similarity: float         # similarity_ratio of the two proposals, 0..1
+    stop_reason: str | None   # why the loop stops here, or None if another round follows
 
 
 @dataclass
@@ -53,3 +71,43 @@ class ApplyResult(Message):
 
     confirmed: bool
     files_written: list[str]
+
+
+@dataclass
+class RaceWon(Message):
+    """Race mode finished: one agent answered with code first; the rest were cancelled."""
+
+    winner: str
+    full_text: str
+    elapsed: float
+    latency_saved: float
+
+
+@dataclass
+class QuorumReached(Message):
+    """Quorum grace expired: classify now while `pending` agents keep streaming."""
+
+    pending: tuple        # tuple[str, ...] — agents with no terminal event yet
+    partial_texts: dict   # {agent_name: str} — pending agents' output so far
+
+
+@dataclass
+class ContextRetrieved(Message):
+    """Relevant repository snippets were appended to the prompt's Environment section."""
+
+    snippets: int       # number of file excerpts included
+    size: int           # bytes of excerpt text included
+    query_ms: float     # time to rank and excerpt files for this prompt
+    files: int          # files in the repository index
+    build_ms: float     # time the last background index update took
+
+
+@dataclass
+class DaemonEvent(Message):
+    """One non-token event of a session the daemon runs (see tui.daemon).
+
+    record is the event dict as the daemon sends it ("type", "session",
+    "seq", ...), or a client-side "accepted"/"attached"/"rejected" notice.
+    """
+
+    record: dict
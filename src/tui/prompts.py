@@ -0,0 +1,390 @@
+"""Token-budgeted prompt construction for reconciliation rounds.
+
+Reconciliation used to paste both agents' complete transcripts into each
+prompt, so cost and latency grew with how verbose the previous round was.
+This module compacts a transcript down to what the other agent needs:
+
+- the fenced code blocks (last version per target file),
+- the unified diff between the two final proposals,
+- a short prose summary (first few sentences outside code fences),
+
+and assembles them in priority order under a token budget estimated by
+estimate_tokens().
+
+Repeated rounds, once both agents propose code for the same file, use delta
+prompts instead: the agreed common lines are sent once, with a marker where
+each differing hunk goes, followed by the hunks themselves (with a few
+context lines). Every round is a fresh agent process, so the agreed lines
+must be in the prompt even though both agents proposed them. Each agent
+replies per hunk only, and its full proposal is reassembled locally from the
+agreed lines, so the reply costs about the size of the disagreement rather
+than the size of the file, and the prompt carries the file once instead of
+twice. The "merge both" action likewise sends only unresolved three-way
+merge conflicts (build_conflict_prompt).
+Pure functions; no I/O.
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass, replace
+
+from tui.apply import (
+    CodeProposal,
+    Hunk,
+    apply_hunks,
+    extract_code_proposals,
+    generate_unified_diff,
+)
+from tui.merge import Conflict
+
+# Default prompt budget for one reconciliation prompt, in estimated tokens.
+RECONCILE_TOKEN_BUDGET = 8000
+# Rough average for code and English prose with common LLM tokenizers.
+CHARS_PER_TOKEN = 4
+# Unchanged lines shown around each hunk in a delta prompt, as anchors.
+DELTA_CONTEXT_LINES = 3
+
+_FENCE = re.compile(r"^```")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_HUNK_HEADING = re.compile(r"^#{1,6}\s*(?:Hunk|Conflict)\s+(\d+)\b", re.IGNORECASE)
+_SLASH_COMMENT_LANGUAGES = {
+    "javascript", "js", "typescript", "ts", "tsx", "jsx", "go", "rust", "rs",
+    "java", "c", "cpp", "c++", "csharp", "cs", "kotlin", "swift", "scala",
+}
+
+_RECONCILE_INSTRUCTIONS = (
+    "Review both approaches. Identify the strengths of each and produce "
+    "the best unified solution. Write a brief explanation, then provide "
+    "the final code in a fenced block with the target filename as the "
+    "first line comment (e.g. # src/module.py)."
+)
+
+_DELTA_INSTRUCTIONS = (
+    "The agreed code above is kept as-is; each `<<< Hunk N >>>` marker in it "
+    "stands for the hunk of that number. "
+    "For each hunk, choose the best version (yours, {other}'s, or a combination). "
+    "Write a brief explanation, then for every hunk a heading line "
+    "`### Hunk N` followed by a fenced block containing only the lines that "
+    "replace that hunk (an empty block deletes them). Do not repeat the "
+    "context lines or the rest of the file."
+)
+
+_CONFLICT_INSTRUCTIONS = (
+    "Two proposals for {target} were merged automatically except for the "
+    "conflicts above, where both changed the same lines differently. For each "
+    "conflict, write a heading line `### Conflict N` followed by a fenced block "
+    "containing only the lines that should replace it, combining both intents "
+    "where possible. No explanation and no other code."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text (~CHARS_PER_TOKEN characters per token)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def summarize_prose(text: str, max_sentences: int = 3) -> str:
+    """Return the first max_sentences sentences of the prose outside code fences."""
+    prose: list[str] = []
+    in_fence = False
+    for line in text.splitlines():
+        if _FENCE.match(line.strip()):
+            in_fence = not in_fence
+            continue
+        if not in_fence and line.strip():
+            prose.append(line.strip())
+    sentences = _SENTENCE_END.split(" ".join(prose))
+    return " ".join(sentences[:max_sentences]).strip()
+
+
+def render_proposal(proposal: CodeProposal) -> str:
+    """Render a CodeProposal back into a fenced block, restoring the filename comment."""
+    lines = [f"```{proposal.language}"]
+    if proposal.filename:
+        prefix = "//" if proposal.language.lower() in _SLASH_COMMENT_LANGUAGES else "#"
+        lines.append(f"{prefix} {proposal.filename}")
+    lines.append(proposal.code)
+    lines.append("```")
+    return "\n".join(lines)
+
+
+def final_proposals(text: str) -> list[CodeProposal]:
+    """Code blocks from text, keeping only the last version for each target file.
+
+    Blocks without a filename are kept as-is (in order); a block for a file that
+    appears again later is superseded by the later one.
+    """
+    proposals = extract_code_proposals(text)
+    latest: dict[str, int] = {}
+    for index, proposal in enumerate(proposals):
+        if proposal.filename:
+            latest[proposal.filename] = index
+    return [
+        p for index, p in enumerate(proposals)
+        if p.filename is None or latest[p.filename] == index
+    ]
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut text to roughly budget tokens, keeping its head and tail around a marker."""
+    if estimate_tokens(text) <= budget:
+        return text
+    marker = "\n[... truncated to fit the prompt budget ...]\n"
+    keep = max(0, budget * CHARS_PER_TOKEN - len(marker))
+    head = text[: keep * 2 // 3]
+    tail = text[len(text) - keep // 3:] if keep // 3 else ""
+    return f"{head}{marker}{tail}"
+
+
+@dataclass(frozen=True)
+class _Section:
+    priority: int   # lower is more important
+    order: int      # position in the final prompt
+    text: str
+    required: bool = False
+
+
+def _assemble(sections: list[_Section], budget: int) -> str:
+    """Keep sections under budget and join them in prompt order.
+
+    Required sections are always kept; if together they exceed the budget the
+    budget is shared out smallest-first, so short sections (instructions) stay
+    whole and only the large ones are truncated. Optional sections are then
+    added greedily by priority while they fit.
+    """
+    required = sorted((s for s in sections if s.required), key=lambda s: estimate_tokens(s.text))
+    optional = sorted((s for s in sections if not s.required), key=lambda s: s.priority)
+
+    if sum(estimate_tokens(s.text) for s in required) > budget:
+        remaining = budget
+        fitted: list[_Section] = []
+        for index, section in enumerate(required):
+            share = remaining // (len(required) - index)
+            fitted.append(replace(section, text=truncate_to_tokens(section.text, share)))
+            remaining -= estimate_tokens(fitted[-1].text)
+        required = fitted
+    kept = list(required)
+    used = sum(estimate_tokens(s.text) for s in kept)
+    for section in optional:
+        cost = estimate_tokens(section.text)
+        if used + cost <= budget:
+            kept.append(section)
+            used += cost
+    return "\n\n".join(s.text for s in sorted(kept, key=lambda s: s.order))
+
+
+def build_reconcile_prompt(
+    own: str,
+    own_text: str,
+    other: str,
+    other_text: str,
+    budget: int = RECONCILE_TOKEN_BUDGET,
+    own_partial: bool = False,
+    other_partial: bool = False,
+) -> str:
+    """Build one agent's reconciliation prompt from compacted transcripts.
+
+    Args:
+        own:           Display name of the agent receiving the prompt, e.g. "Claude".
+        own_text:      That agent's previous output.
+        other:         Display name of the other agent.
+        other_text:    The other agent's previous output.
+        budget:        Maximum estimated tokens for the whole prompt.
+        own_partial:   own_text is a partial transcript (agent was cut off).
+        other_partial: other_text is a partial transcript.
+
+    Returns:
+        Prompt containing, in priority order, the instructions, own final code,
+        the diff to the other agent's final code, the other agent's code, and
+        short prose summaries. Transcripts without code fall back to prose.
+        The other agent's proposal always appears, as its code or as the diff
+        (truncated if need be).
+    """
+    own_blocks = final_proposals(own_text)
+    other_blocks = final_proposals(other_text)
+    cut_note = "\n[incomplete — this output was cut off before the agent finished]"
+
+    def _code(blocks: list[CodeProposal], text: str) -> str:
+        if blocks:
+            return "\n\n".join(render_proposal(b) for b in blocks)
+        return text
+
+    own_heading = f"## You previously proposed{cut_note if own_partial else ''}"
+    other_heading = f"## {other} proposed{cut_note if other_partial else ''}"
+    diff_section = None
+    if own_blocks and other_blocks:
+        diff = generate_unified_diff(
+            own_blocks[-1].code + "\n", other_blocks[-1].code + "\n",
+            fromfile=own.lower(), tofile=other.lower(),
+        )
+        if diff:
+            diff_section = f"## Diff from your code to {other}'s\n```diff\n{diff.rstrip()}\n```"
+        else:
+            diff_section = f"## Diff\nYour final code and {other}'s are identical."
+    sections = [
+        _Section(0, 90, _RECONCILE_INSTRUCTIONS, required=True),
+        _Section(1, 10, f"{own_heading}\n{_code(own_blocks, own_text)}", required=True),
+        # With a diff, the other agent's code is recoverable from yours, so it may be
+        # dropped; the diff then becomes required so the other proposal is never lost.
+        _Section(3, 40, f"{other_heading}\n{_code(other_blocks, other_text)}",
+                 required=diff_section is None),
+    ]
+    if diff_section is not None:
+        sections.append(_Section(2, 50, diff_section, required=True))
+    for priority, order, name, text, blocks in (
+        (4, 15, "Your", own_text, own_blocks),
+        (5, 45, f"{other}'s", other_text, other_blocks),
+    ):
+        summary = summarize_prose(text) if blocks else ""
+        if summary:
+            sections.append(_Section(priority, order, f"## {name} reasoning (summary)\n{summary}"))
+    return _assemble(sections, budget)
+
+
+def _render_hunk(index: int, hunk: Hunk, base: list[str], own_is_a: bool, context: int) -> str:
+    """Render one hunk as a diff block: " " context, "-" own lines, "+" other lines."""
+    own_lines, other_lines = (hunk.a_lines, hunk.b_lines) if own_is_a else (hunk.b_lines, hunk.a_lines)
+    body = [f"  {line}" for line in base[max(0, hunk.a_start - context):hunk.a_start]]
+    body += [f"- {line}" for line in own_lines]
+    body += [f"+ {line}" for line in other_lines]
+    body += [f"  {line}" for line in base[hunk.a_end:hunk.a_end + context]]
+    own_start = (hunk.a_start if own_is_a else hunk.b_start) + 1
+    return f"### Hunk {index + 1} (your line {own_start})\n```diff\n" + "\n".join(body) + "\n```"
+
+
+def _render_base(base: list[str], hunks: list[Hunk], language: str) -> str:
+    """The agreed lines of base, with a `<<< Hunk N >>>` marker in place of each hunk."""
+    lines: list[str] = []
+    position = 0
+    for index, hunk in enumerate(hunks):
+        lines += base[position:hunk.a_start]
+        lines.append(f"<<< Hunk {index + 1} >>>")
+        position = hunk.a_end
+    lines += base[position:]
+    return f"```{language}\n" + "\n".join(lines) + "\n```"
+
+
+def build_delta_prompt(
+    own: str,
+    other: str,
+    base_code: str,
+    hunks: list[Hunk],
+    own_is_a: bool = True,
+    context: int = DELTA_CONTEXT_LINES,
+    budget: int = RECONCILE_TOKEN_BUDGET,
+    language: str = "",
+    filename: str | None = None,
+) -> str:
+    """Build one agent's prompt for a repeated round: the agreed code once, then the hunks.
+
+    Args:
+        own:       Display name of the agent receiving the prompt, e.g. "Claude".
+        other:     Display name of the other agent.
+        base_code: The code hunks were computed against (the "a" side).
+        hunks:     diff_hunks(base_code, b_code), in file order.
+        own_is_a:  The receiving agent proposed the "a" side.
+        context:   Unchanged lines shown before and after each hunk.
+        budget:    Maximum estimated tokens for the whole prompt.
+        language:  Fence language for the agreed code.
+        filename:  Target file, named in the agreed-code heading.
+
+    Returns:
+        Prompt with the agreed code (a marker where each hunk goes), one diff
+        block per hunk ("-" lines are the agent's own, "+" lines are the other
+        agent's) and reply instructions. All three are required sections, so
+        over budget they are truncated, never dropped.
+    """
+    base = base_code.splitlines()
+    agreed = (
+        f"## Agreed code{f' ({filename})' if filename else ''}\n"
+        f"You and {other} both proposed these lines.\n"
+        + _render_base(base, hunks, language)
+    )
+    rendered = "\n\n".join(
+        _render_hunk(index, hunk, base, own_is_a, context) for index, hunk in enumerate(hunks)
+    )
+    heading = (
+        f"## Remaining disagreements with {other}\n"
+        f"Lines marked - are yours, lines marked + are {other}'s."
+    )
+    sections = [
+        _Section(0, 90, _DELTA_INSTRUCTIONS.format(other=other), required=True),
+        _Section(1, 5, agreed, required=True),
+        _Section(2, 10, f"{heading}\n\n{rendered}", required=True),
+    ]
+    return _assemble(sections, budget)
+
+
+def parse_delta_reply(text: str) -> dict[int, list[str]]:
+    """Parse a delta-round reply into {hunk index (0-based): replacement lines}.
+
+    Each `Hunk N` (or `Conflict N`) heading takes the next fenced block after
+    it; a number repeated later in the reply is superseded by the later block.
+    """
+    chosen: dict[int, list[str]] = {}
+    pending: int | None = None
+    block: list[str] | None = None
+    for line in text.splitlines():
+        if block is not None:
+            if line.strip() == "```":
+                if pending is not None:
+                    chosen[pending] = block
+                pending, block = None, None
+            else:
+                block.append(line)
+            continue
+        heading = _HUNK_HEADING.match(line.strip())
+        if heading:
+            pending = int(heading.group(1)) - 1
+        elif _FENCE.match(line.strip()):
+            block = []
+    return chosen
+
+
+def reassemble_delta(
+    base_code: str, hunks: list[Hunk], reply: str, own_is_a: bool = True
+) -> str:
+    """Rebuild an agent's full proposal from its delta-round reply.
+
+    Hunks the reply does not answer keep the agent's own previous lines.
+    """
+    chosen = parse_delta_reply(reply)
+    replacements = {
+        index: chosen.get(index, hunk.a_lines if own_is_a else hunk.b_lines)
+        for index, hunk in enumerate(hunks)
+    }
+    return apply_hunks(base_code, hunks, replacements)
+
+
+def build_conflict_prompt(
+    conflicts: list[Conflict],
+    language: str = "",
+    filename: str | None = None,
+    budget: int = RECONCILE_TOKEN_BUDGET,
+) -> str:
+    """Build the prompt that asks an agent to resolve three-way merge conflicts only.
+
+    Each conflict is shown with its surrounding context, the original (base)
+    lines if any, and both versions. The reply is parsed with parse_delta_reply().
+    """
+    def _block(lines: tuple[str, ...]) -> str:
+        return f"```{language}\n" + "\n".join(lines) + "\n```"
+
+    parts: list[str] = []
+    for index, conflict in enumerate(conflicts):
+        part = [f"### Conflict {index + 1}"]
+        if conflict.before:
+            part.append(f"Preceded by:\n{_block(conflict.before)}")
+        if conflict.base:
+            part.append(f"Original:\n{_block(conflict.base)}")
+        part.append(f"Claude's version:\n{_block(conflict.ours)}")
+        part.append(f"Codex's version:\n{_block(conflict.theirs)}")
+        if conflict.after:
+            part.append(f"Followed by:\n{_block(conflict.after)}")
+        parts.append("\n".join(part))
+    sections = [
+        _Section(0, 90, _CONFLICT_INSTRUCTIONS.format(target=filename or "the file"), required=True),
+        _Section(1, 10, "## Merge conflicts\n\n" + "\n\n".join(parts), required=True),
+    ]
+    return _assemble(sections, budget)
@@ -0,0 +1,181 @@
+"""The automatic reconciliation loop, shared by the TUI and headless runs.
+
+Each round sends both agents a reconciliation prompt, turns their replies
+into proposals, scores how similar the proposals are and asks the
+ConvergencePolicy whether to stop. The first round (unless asked for a
+delta round) uses the compacted full prompt, build_reconcile_prompt().
+Later rounds, once both proposals target the same file and still differ,
+use delta prompts, build_delta_prompt(). A delta reply is reassembled
+locally into a full proposal.
+
+How a round reaches the agents is the caller's business: AgentBureauApp
+streams into its panes, HeadlessRunner holds concurrency slots and emits
+events. Both pass a `run_round` coroutine, which maps agent -> prompt to
+agent -> reply text, and an `on_round` callback for per-round state and
+journaling. No UI, no I/O.
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from tui.apply import CodeProposal, Hunk, diff_hunks, extract_code_proposals, similarity_ratio
+from tui.prompts import (
+    RECONCILE_TOKEN_BUDGET,
+    build_delta_prompt,
+    build_reconcile_prompt,
+    reassemble_delta,
+    render_proposal,
+)
+from tui.session import ConvergencePolicy
+
+AGENTS = ("claude", "codex")
+DISPLAY_NAMES = {"claude": "Claude", "codex": "Codex"}
+
+Proposals = dict[str, CodeProposal | None]
+
+
+@dataclass(frozen=True)
+class RoundResult:
+    """The outcome of one reconciliation round.
+
+    Attributes:
+        round:       1-based round number within the loop.
+        similarity:  Similarity of the two proposals (0..1) after this round.
+        stop_reason: Why the loop stops after this round, or None if it goes on.
+        texts:       What the next round reads, by agent: the replies, or the
+                     reassembled proposals after a delta round.
+        proposals:   Each agent's final code proposal (None if it gave no code).
+    """
+
+    round: int
+    similarity: float
+    stop_reason: str | None
+    texts: dict[str, str]
+    proposals: Proposals
+
+
+def delta_base(proposals: Proposals) -> tuple[CodeProposal, list[Hunk]] | None:
+    """Claude's proposal and the hunks to Codex's, if a delta round is possible.
+
+    Requires both proposals to target the same file and to differ; otherwise
+    the round falls back to full prompts.
+    """
+    base, other = proposals.get("claude"), proposals.get("codex")
+    if base is None or other is None or base.filename != other.filename:
+        return None
+    hunks = diff_hunks(base.code, other.code)
+    return (base, hunks) if hunks else None
+
+
+def round_prompts(
+    texts: dict[str, str],
+    base: tuple[CodeProposal, list[Hunk]] | None,
+    partial: set[str] | frozenset[str] = frozenset(),
+    budget: int = RECONCILE_TOKEN_BUDGET,
+) -> dict[str, str]:
+    """Each agent's prompt for one round: a delta prompt against base, or a full one."""
+    prompts: dict[str, str] = {}
+    for agent, other in (("claude", "codex"), ("codex", "claude")):
+        if base is not None:
+            proposal, hunks = base
+            prompts[agent] = build_delta_prompt(
+                DISPLAY_NAMES[agent], DISPLAY_NAMES[other], proposal.code, hunks,
+                own_is_a=agent == "claude", budget=budget,
+                language=proposal.language, filename=proposal.filename,
+            )
+        else:
+            # Compacted prompts: code, diff and short summaries under a token budget,
+            # so each round costs about the same regardless of prior verbosity.
+            prompts[agent] = build_reconcile_prompt(
+                DISPLAY_NAMES[agent], texts.get(agent, ""), DISPLAY_NAMES[other], texts.get(other, ""),
+                budget=budget, own_partial=agent in partial, other_partial=other in partial,
+            )
+    return prompts
+
+
+def read_replies(
+    replies: dict[str, str], base: tuple[CodeProposal, list[Hunk]] | None
+) -> tuple[dict[str, str], Proposals]:
+    """Turn a round's replies into (texts for the next round, proposals)."""
+    if base is not None:
+        proposal, hunks = base
+        proposals: Proposals = {
+            agent: CodeProposal(
+                language=proposal.language,
+                code=reassemble_delta(proposal.code, hunks, replies.get(agent, ""),
+                                      own_is_a=agent == "claude"),
+                filename=proposal.filename,
+            )
+            for agent in AGENTS
+        }
+        # The next round (delta or full) reads the reassembled files, not the hunk replies.
+        return {agent: render_proposal(p) for agent, p in proposals.items()}, proposals
+    proposals = {}
+    for agent in AGENTS:
+        found = extract_code_proposals(replies.get(agent, ""))
+        proposals[agent] = found[-1] if found else None
+    return {agent: replies.get(agent, "") for agent in AGENTS}, proposals
+
+
+def proposal_similarity(texts: dict[str, str], proposals: Proposals) -> float:
+    """Similarity of the two proposals, falling back to the texts where there is no code."""
+    claude, codex = proposals.get("claude"), proposals.get("codex")
+    return similarity_ratio(
+        claude.code if claude else texts.get("claude", ""),
+        codex.code if codex else texts.get("codex", ""),
+    )
+
+
+def proposal_records(proposals: Proposals) -> dict[str, dict]:
+    """Proposals as the JSON objects journal records and events carry."""
+    return {
+        agent: {"language": p.language, "code": p.code, "filename": p.filename}
+        for agent, p in proposals.items() if p is not None
+    }
+
+
+async def run_reconciliation(
+    texts: dict[str, str],
+    proposals: Proposals,
+    run_round: Callable[[dict[str, str]], Awaitable[dict[str, str]]],
+    policy: ConvergencePolicy = ConvergencePolicy(),
+    budget: int = RECONCILE_TOKEN_BUDGET,
+    partial: set[str] | frozenset[str] = frozenset(),
+    delta: bool = False,
+    on_round: Callable[[RoundResult], None] | None = None,
+) -> RoundResult:
+    """Run rounds until the policy stops the loop; returns the last round.
+
+    Args:
+        texts:     Each agent's previous output, read by a full round.
+        proposals: Each agent's previous proposal, the base of a delta round.
+        run_round: Sends agent -> prompt to the agents, returns agent -> reply.
+        policy:    When the loop stops.
+        budget:    Estimated-token cap for each prompt.
+        partial:   Agents whose text is a partial transcript (first round only).
+        delta:     Try a delta prompt for the first round too (e.g. "reconcile
+                   further"); rounds after the first always do.
+        on_round:  Called after each round is scored, before the next starts.
+    """
+    loop_start = time.monotonic()
+    scores: list[float] = []
+    while True:
+        round_start = time.monotonic()
+        base = delta_base(proposals) if delta else None
+        replies = await run_round(round_prompts(texts, base, partial, budget))
+        texts, proposals = read_replies(replies, base)
+        partial = frozenset()
+        now = time.monotonic()
+        scores.append(proposal_similarity(texts, proposals))
+        result = RoundResult(
+            round=len(scores), similarity=scores[-1],
+            stop_reason=policy.stop_reason(scores, now - loop_start, now - round_start),
+            texts=texts, proposals=proposals,
+        )
+        if on_round is not None:
+            on_round(result)
+        if result.stop_reason is not None:
+            return result
+        delta = True
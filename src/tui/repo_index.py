@@ -0,0 +1,326 @@
+"""Incremental project file index for relevant-context retrieval in prompts.
+
+Agents otherwise see only the working directory, branch and top-level names,
+and spend their first turns rediscovering the repository. RepoIndex keeps,
+for every indexed text file under the project root:
+
+- its path, size and mtime (to re-index only what changed),
+- the symbols it defines (def/class/function/... names),
+- its term frequencies, from which a BM25 inverted index is built.
+
+update() rescans the tree and re-indexes changed files only; update_paths()
+does the same for a known set of paths. query() ranks files against a prompt
+with BM25 (path and symbol terms weighted up) and returns the best-matching
+line window of the top files within a byte budget.
+
+The index is persisted as JSON under .disagree/ so warm starts only stat files.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter, deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from tui.apply import write_file_atomic
+from tui.stats import DISAGREE_DIR
+
+REPO_INDEX_PATH = DISAGREE_DIR / "index.json"
+_INDEX_VERSION = 1
+
+# Directories never descended into (hidden directories are skipped as well).
+_SKIP_DIRS = {"__pycache__", "node_modules", "venv", "build", "dist", "target"}
+_IDENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_SUBWORD = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+_SYMBOL = re.compile(
+    r"^\s*(?:export\s+)?(?:async\s+)?(?:def|class|function|func|fn|struct|enum|trait|interface|type)"
+    r"\s+([A-Za-z_][A-Za-z0-9_]*)",
+    re.MULTILINE,
+)
+_STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "into", "should", "would",
+    "please", "make", "add", "use", "are", "was", "not", "but", "can", "all", "our",
+    "you", "your", "its", "when", "then", "than", "have", "has", "will", "also",
+}
+# Extra term frequency for terms in a file's path and in its symbol names.
+_PATH_WEIGHT = 3
+_SYMBOL_WEIGHT = 2
+
+
+def is_ignored(name: str) -> bool:
+    """True for path components the index (and the file watcher) never look into."""
+    return name.startswith(".") or name in _SKIP_DIRS
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-cased identifier terms of text, with camelCase/snake_case parts split out."""
+    terms: list[str] = []
+    for ident in _IDENT.findall(text):
+        lowered = ident.lower()
+        parts = [p.lower() for p in _SUBWORD.findall(ident)]
+        for term in {lowered, *parts}:
+            if len(term) >= 2 and term not in _STOPWORDS:
+                terms.append(term)
+    return terms
+
+
+@dataclass(frozen=True)
+class Snippet:
+    """A ranked excerpt of one file.
+
+    Attributes:
+        path:  File path relative to the index root.
+        line:  1-based line number of the first excerpt line.
+        text:  The excerpt.
+        score: BM25 score of the file for the query.
+    """
+
+    path: str
+    line: int
+    text: str
+    score: float
+
+
+@dataclass
+class _Doc:
+    mtime_ns: int
+    size: int
+    symbols: list[str]
+    terms: dict[str, int]
+    length: int
+
+
+class RepoIndex:
+    """BM25 index over the text files under root, updated incrementally.
+
+    Thread-safe: updates and queries may run in different worker threads.
+    At most `max_files` files are indexed, each at most `max_file_bytes`, so
+    memory stays bounded on very large trees.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, root: Path, max_file_bytes: int = 200_000, max_files: int = 20_000) -> None:
+        self.root = root
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self._docs: dict[str, _Doc] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    # --- persistence ---
+
+    @classmethod
+    def load(cls, root: Path, path: Path = REPO_INDEX_PATH, **kwargs) -> RepoIndex:
+        """Read a saved index for root; returns an empty index if unreadable or for another root."""
+        index = cls(root, **kwargs)
+        try:
+            data = json.loads(path.read_text())
+            if data.get("version") != _INDEX_VERSION or data.get("root") != str(root):
+                return index
+            for rel, entry in data["files"].items():
+                index._add(rel, _Doc(
+                    mtime_ns=int(entry["mtime_ns"]), size=int(entry["size"]),
+                    symbols=list(entry["symbols"]),
+                    terms={t: int(n) for t, n in entry["terms"].items()},
+                    length=sum(int(n) for n in entry["terms"].values()),
+                ))
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return cls(root, **kwargs)
+        return index
+
+    def save(self, path: Path = REPO_INDEX_PATH) -> None:
+        """Write the index atomically to path."""
+        with self._lock:
+            files = {
+                rel: {"mtime_ns": d.mtime_ns, "size": d.size, "symbols": d.symbols, "terms": d.terms}
+                for rel, d in self._docs.items()
+            }
+        payload = {"version": _INDEX_VERSION, "root": str(self.root), "files": files}
+        write_file_atomic(path, json.dumps(payload, separators=(",", ":")))
+
+    # --- maintenance ---
+
+    @property
+    def file_count(self) -> int:
+        return len(self._docs)
+
+    def _add(self, rel: str, doc: _Doc) -> None:
+        self._remove(rel)
+        self._docs[rel] = doc
+        self._total_length += doc.length
+        for term, tf in doc.terms.items():
+            self._postings.setdefault(term, {})[rel] = tf
+
+    def _remove(self, rel: str) -> bool:
+        doc = self._docs.pop(rel, None)
+        if doc is None:
+            return False
+        self._total_length -= doc.length
+        for term in doc.terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(rel, None)
+                if not postings:
+                    del self._postings[term]
+        return True
+
+    def _read_doc(self, rel: str, stat: os.stat_result) -> _Doc | None:
+        """Tokenize one file; None for binary, unreadable or oversized files."""
+        if stat.st_size > self.max_file_bytes:
+            return None
+        try:
+            raw = (self.root / rel).read_bytes()
+        except OSError:
+            return None
+        if b"\0" in raw[:1024]:
+            return None
+        text = raw.decode("utf-8", errors="replace")
+        symbols = sorted(set(_SYMBOL.findall(text)))
+        terms = Counter(tokenize(text))
+        for term in tokenize(rel.replace("/", " ").replace(".", " ")):
+            terms[term] += _PATH_WEIGHT
+        for term in tokenize(" ".join(symbols)):
+            terms[term] += _SYMBOL_WEIGHT
+        return _Doc(stat.st_mtime_ns, stat.st_size, symbols, dict(terms), sum(terms.values()))
+
+    def _walk(self) -> Iterable[tuple[str, os.stat_result]]:
+        """Yield (relative path, stat) for candidate files under root, breadth-first."""
+        pending = deque([self.root])
+        while pending:
+            directory = pending.popleft()
+            try:
+                entries = sorted(os.scandir(directory), key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                if is_ignored(entry.name):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(Path(entry.path))
+                    elif entry.is_file(follow_symlinks=False):
+                        yield Path(entry.path).relative_to(self.root).as_posix(), entry.stat()
+                except OSError:
+                    continue
+
+    def _refresh(self, rel: str, stat: os.stat_result | None) -> bool:
+        """Re-index rel if new or changed (stat None: it was deleted). Returns True on change."""
+        if stat is None:
+            return self._remove(rel)
+        doc = self._docs.get(rel)
+        if doc is not None and doc.mtime_ns == stat.st_mtime_ns and doc.size == stat.st_size:
+            return False
+        if doc is None and len(self._docs) >= self.max_files:
+            return False
+        new_doc = self._read_doc(rel, stat)
+        if new_doc is None:
+            return self._remove(rel)
+        self._add(rel, new_doc)
+        return True
+
+    def update(self) -> tuple[int, int]:
+        """Rescan root; re-index new or changed files and drop deleted ones.
+
+        Returns:
+            (files re-indexed, files removed)
+        """
+        seen: set[str] = set()
+        changed = 0
+        with self._lock:
+            for rel, stat in self._walk():
+                if len(seen) >= self.max_files:
+                    break
+                seen.add(rel)
+                changed += self._refresh(rel, stat)
+            gone = [rel for rel in self._docs if rel not in seen]
+            for rel in gone:
+                self._remove(rel)
+        return changed, len(gone)
+
+    def update_paths(self, paths: Iterable[str]) -> int:
+        """Re-index the given root-relative paths; missing ones are dropped.
+
+        Returns:
+            Number of files whose index entry changed.
+        """
+        changed = 0
+        with self._lock:
+            for rel in paths:
+                if any(is_ignored(part) for part in Path(rel).parts):
+                    continue
+                try:
+                    stat = (self.root / rel).stat()
+                    if not (self.root / rel).is_file():
+                        stat = None
+                except OSError:
+                    stat = None
+                changed += self._refresh(rel, stat)
+        return changed
+
+    # --- retrieval ---
+
+    def _scores(self, terms: list[str]) -> dict[str, float]:
+        n = len(self._docs)
+        if not n:
+            return {}
+        avg_length = self._total_length / n or 1.0
+        scores: dict[str, float] = {}
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for rel, tf in postings.items():
+                norm = tf + self.k1 * (1 - self.b + self.b * self._docs[rel].length / avg_length)
+                scores[rel] = scores.get(rel, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return scores
+
+    def _excerpt(self, rel: str, terms: set[str], lines_before: int = 3, lines_after: int = 9) -> tuple[int, str]:
+        """Window of lines around the line with the most query terms."""
+        try:
+            lines = (self.root / rel).read_text(errors="replace").splitlines()
+        except OSError:
+            return 1, ""
+        best, best_hits = 0, -1
+        for number, line in enumerate(lines):
+            hits = len(terms.intersection(tokenize(line)))
+            if hits > best_hits:
+                best, best_hits = number, hits
+        start = max(0, best - lines_before)
+        return start + 1, "\n".join(lines[start:best + lines_after + 1])
+
+    def query(self, text: str, k: int = 5, byte_budget: int = 4000) -> list[Snippet]:
+        """Top-k files for text by BM25, each as an excerpt, within byte_budget bytes total."""
+        terms = tokenize(text)
+        with self._lock:
+            scores = self._scores(terms)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        snippets: list[Snippet] = []
+        used = 0
+        for rel, score in ranked:
+            line, excerpt = self._excerpt(rel, set(terms))
+            overhead = len(render_snippets([Snippet(rel, line, "", score)]).encode()) + 2
+            room = byte_budget - used - overhead
+            if room <= 0:
+                break
+            encoded = excerpt.encode()
+            if len(encoded) > room:
+                excerpt = encoded[:room].decode(errors="ignore").rsplit("\n", 1)[0]
+            snippets.append(Snippet(rel, line, excerpt, score))
+            used += overhead + len(excerpt.encode())
+        return snippets
+
+
+def render_snippets(snippets: list[Snippet]) -> str:
+    """Format snippets for the prompt's Environment section."""
+    return "\n\n".join(
+        f"{s.path} (line {s.line}):\n```\n{s.text}\n```" for s in snippets
+    )
@@ -3,7 +3,10 @@
 Transitions:
   IDLE -> STREAMING          (on prompt submission)
   STREAMING -> CLASSIFYING   (on both AgentFinished received)
+  STREAMING -> STREAMING     (on QuorumReached — early classification while a
+                              late agent keeps streaming; see QuorumPolicy)
   CLASSIFYING -> RECONCILING (on ClassificationDone — auto-starts reconciliation)
+  RECONCILING -> RECONCILING (next automatic round; see ConvergencePolicy)
   RECONCILING -> REVIEWING   (on ReconciliationReady)
   REVIEWING -> RECONCILING   (user presses r — reconcile again)
   REVIEWING -> CONFIRMING_APPLY  (user accepts an answer)
@@ -11,6 +14,7 @@ Transitions:
 """
 from __future__ import annotations
 
+from dataclasses import dataclass
 from enum import Enum, auto
 
 
@@ -23,3 +27,59 @@ class SessionState(Enum):
     RECONCILING = auto()       # auto-started after classification
     REVIEWING = auto()         # reconciliation done; user chooses next action
     CONFIRMING_APPLY = auto()  # diff shown, waiting for user y/n
+
+
+@dataclass(frozen=True)
+class QuorumPolicy:
+    """When to stop waiting for slow agents before classifying.
+
+    Once `quorum` agents have produced a terminal event, a `grace` timer starts.
+    If the remaining agents are still streaming when it expires, classification
+    runs on whatever has arrived (late agents' text so far counts as partial).
+    Late agents keep streaming into their panes; reconciliation waits for them,
+    and if `reclassify_late` is set their final answer is classified again first.
+
+    The default quorum is both agents, i.e. wait for everyone; a lower quorum
+    (`agent-bureau --quorum 1`) opts in to early classification.
+    """
+
+    quorum: int = 2
+    grace: float = 10.0
+    reclassify_late: bool = True
+
+
+@dataclass(frozen=True)
+class ConvergencePolicy:
+    """When the automatic reconciliation loop stops and hands over to review.
+
+    After each round the similarity of the two proposals (0..1, see
+    tui.apply.similarity_ratio) is scored. The loop stops when the score
+    reaches `threshold`, when a round improves it by less than
+    `min_improvement`, after `max_rounds` rounds, or when another round as
+    long as the last one would overrun `time_budget` seconds.
+
+    max_rounds=1 restores the single-round behaviour.
+    """
+
+    max_rounds: int = 3
+    time_budget: float = 300.0
+    threshold: float = 0.98
+    min_improvement: float = 0.01
+
+    def stop_reason(self, scores: list[float], elapsed: float, last_round: float) -> str | None:
+        """Why the loop should stop after the latest round, or None to continue.
+
+        Args:
+            scores:     Similarity after each round so far, oldest first.
+            elapsed:    Seconds since the loop started.
+            last_round: Duration of the latest round in seconds.
+        """
+        if scores[-1] >= self.threshold:
+            return "converged"
+        if len(scores) >= 2 and scores[-1] - scores[-2] < self.min_improvement:
+            return "no improvement"
+        if len(scores) >= self.max_rounds:
+            return "max rounds"
+        if elapsed + last_round > self.time_budget:
+            return "time budget"
+        return None
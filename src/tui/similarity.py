@@ -0,0 +1,182 @@
+"""Near-duplicate prompt lookup over past accepted solutions.
+
+Teams re-ask nearly the same prompt, and each time pay for a full
+two-agent round. SolutionIndex remembers every applied solution together
+with a MinHash signature of its prompt and a fingerprint of the project it
+was applied in. At submit time find() estimates the Jaccard similarity of
+the new prompt's word shingles against past prompts and, above
+`threshold`, returns the best match so the app can offer its solution.
+
+Lookup does not scan every signature: signatures are split into bands, and
+only solutions sharing at least one whole band with the query (LSH) are
+compared. The index is persisted as JSON under .disagree/.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from tui.apply import write_file_atomic
+from tui.stats import DISAGREE_DIR
+
+SOLUTIONS_PATH = DISAGREE_DIR / "solutions.json"
+
+NUM_PERM = 64
+BANDS = 16  # 4 rows per band: pairs ~0.8 similar share a band with probability > 0.999
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_WORD = re.compile(r"[a-z0-9_]+")
+
+
+def shingles(text: str, k: int = 3) -> set[str]:
+    """Word k-shingles of text (lower-cased); short texts yield their whole word sequence."""
+    words = _WORD.findall(text.lower())
+    if len(words) < k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def minhash(text: str) -> list[int]:
+    """MinHash signature (NUM_PERM values) of text's shingles."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+        for s in shingles(text)
+    ]
+    if not hashes:
+        return [_PRIME] * NUM_PERM
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def estimate_similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def environment_fingerprint(root: Path) -> str:
+    """Identifies the project a solution belongs to (its resolved root path)."""
+    return hashlib.sha256(str(root.resolve()).encode()).hexdigest()[:16]
+
+
+def _bands(signature: list[int]) -> list[str]:
+    rows = NUM_PERM // BANDS
+    return [
+        f"{i}:" + ",".join(map(str, signature[i * rows:(i + 1) * rows])) for i in range(BANDS)
+    ]
+
+
+@dataclass
+class Solution:
+    """An accepted solution and the prompt it answered.
+
+    Attributes:
+        prompt:    The prompt as the user typed it.
+        env:       environment_fingerprint() of the project it was applied in.
+        code:      The code that was written.
+        language:  Fence language of the code.
+        filename:  File the code was written to.
+        session:   Journal session id.
+        ts:        Unix time it was applied.
+        signature: minhash(prompt).
+    """
+
+    prompt: str
+    env: str
+    code: str
+    language: str
+    filename: str | None
+    session: str = ""
+    ts: float = 0.0
+    signature: list[int] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class SolutionMatch:
+    """A past solution whose prompt is near-identical to the query."""
+
+    solution: Solution
+    similarity: float
+
+
+class SolutionIndex:
+    """MinHash/LSH index of accepted solutions. Thread-safe."""
+
+    def __init__(self, threshold: float = 0.8, max_entries: int = 5000) -> None:
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._solutions: list[Solution] = []
+        self._buckets: dict[str, set[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._solutions)
+
+    @classmethod
+    def load(cls, path: Path = SOLUTIONS_PATH, **kwargs) -> SolutionIndex:
+        """Read a saved index; returns an empty index if missing or unreadable."""
+        index = cls(**kwargs)
+        try:
+            entries = json.loads(path.read_text())
+            solutions = [Solution(**entry) for entry in entries]
+        except (OSError, ValueError, TypeError):
+            return index
+        for solution in solutions:
+            index.add(solution)
+        return index
+
+    def save(self, path: Path = SOLUTIONS_PATH) -> None:
+        with self._lock:
+            payload = [asdict(s) for s in self._solutions]
+        write_file_atomic(path, json.dumps(payload, separators=(",", ":")))
+
+    def _rebuild(self) -> None:
+        self._buckets = {}
+        for position, solution in enumerate(self._solutions):
+            for band in _bands(solution.signature):
+                self._buckets.setdefault(band, set()).add(position)
+
+    def add(self, solution: Solution) -> None:
+        """Remember a solution; replaces an earlier one for the same prompt and project."""
+        if not solution.signature:
+            solution.signature = minhash(solution.prompt)
+        with self._lock:
+            before = len(self._solutions)
+            self._solutions = [
+                s for s in self._solutions
+                if not (s.prompt == solution.prompt and s.env == solution.env)
+            ]
+            self._solutions.append(solution)
+            if len(self._solutions) > self.max_entries:
+                del self._solutions[:len(self._solutions) - self.max_entries]
+            if len(self._solutions) != before + 1:
+                self._rebuild()
+            else:
+                for band in _bands(solution.signature):
+                    self._buckets.setdefault(band, set()).add(len(self._solutions) - 1)
+
+    def find(self, prompt: str, env: str) -> SolutionMatch | None:
+        """Best past solution in env whose prompt is at least `threshold` similar, if any."""
+        if not shingles(prompt):
+            return None
+        signature = minhash(prompt)
+        with self._lock:
+            candidates = set()
+            for band in _bands(signature):
+                candidates |= self._buckets.get(band, set())
+            best: SolutionMatch | None = None
+            for position in candidates:
+                solution = self._solutions[position]
+                if solution.env != env:
+                    continue
+                score = estimate_similarity(signature, solution.signature)
+                # Prefer the most similar, then the most recent.
+                if score >= self.threshold and (
+                    best is None or (score, solution.ts) > (best.similarity, best.solution.ts)
+                ):
+                    best = SolutionMatch(solution, score)
+        return best
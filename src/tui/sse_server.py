@@ -0,0 +1,178 @@
+"""Read-only HTTP view of the daemon's sessions: Server-Sent Events plus a browser page.
+
+`agent-bureau daemon serve --http PORT` starts this next to the Unix
+socket, on the same SessionHub. Teammates can then watch sessions in a
+browser, e.g. through `ssh -L PORT:localhost:PORT`, without a terminal
+running Textual. Every viewer reads the same session log, so adding
+viewers never adds agent calls.
+
+Routes (GET only):
+
+  /                       the viewer page (viewer.html): side-by-side agent panes
+  /sessions               JSON list of the hub's sessions
+  /events/<session>       text/event-stream of the session's events
+
+Each SSE message carries one event dict as JSON in `data` and its seq as
+the `id`. A browser that reconnects sends Last-Event-ID and resumes right
+after it; `?offset=N` starts at seq N. After the result an `end` event is
+sent and the stream closes. While nothing happens a comment line is sent
+every `heartbeat` seconds, which keeps tunnels and proxies from dropping
+the connection and reveals viewers that went away.
+
+Plain asyncio streams, no web framework; one request per connection.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from tui.daemon import SessionHub
+
+VIEWER_PATH = Path(__file__).parent / "viewer.html"
+_MAX_HEADER = 16 * 1024
+
+
+class EventServer:
+    """Serves a SessionHub's session logs over HTTP/SSE."""
+
+    def __init__(
+        self, hub: SessionHub, host: str = "127.0.0.1", port: int = 8765, heartbeat: float = 15.0
+    ) -> None:
+        self.hub = hub
+        self.host = host
+        self.port = port
+        self.heartbeat = heartbeat
+        self._server: asyncio.AbstractServer | None = None
+        self._page: bytes | None = None
+        self._connections: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        self._page = await asyncio.to_thread(VIEWER_PATH.read_bytes)
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, limit=_MAX_HEADER
+        )
+        if self.port == 0:
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop listening and end open event streams."""
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._connections):
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+                method, target, headers = _parse_head(head)
+            except (asyncio.LimitOverrunError, ValueError):
+                await _respond(writer, HTTPStatus.BAD_REQUEST)
+                return
+            if method != "GET":
+                await _respond(writer, HTTPStatus.METHOD_NOT_ALLOWED, extra={"Allow": "GET"})
+                return
+            url = urlsplit(target)
+            if url.path == "/":
+                await _respond(writer, HTTPStatus.OK, self._page or b"", "text/html; charset=utf-8")
+            elif url.path == "/sessions":
+                body = json.dumps(self.hub.sessions()).encode()
+                await _respond(writer, HTTPStatus.OK, body, "application/json")
+            elif url.path.startswith("/events/"):
+                await self._events(writer, unquote(url.path[len("/events/"):]), url.query, headers)
+            else:
+                await _respond(writer, HTTPStatus.NOT_FOUND)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # the viewer went away
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _events(
+        self, writer: asyncio.StreamWriter, session: str, query: str, headers: dict[str, str]
+    ) -> None:
+        log = self.hub.get(session)
+        if log is None:
+            await _respond(writer, HTTPStatus.NOT_FOUND)
+            return
+        offset = 0
+        try:
+            if "last-event-id" in headers:
+                offset = int(headers["last-event-id"]) + 1
+            elif "offset" in (params := parse_qs(query)):
+                offset = int(params["offset"][0])
+        except ValueError:
+            await _respond(writer, HTTPStatus.BAD_REQUEST)
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        await writer.drain()
+        events = log.follow(offset)
+        pending = asyncio.ensure_future(anext(events))
+        try:
+            while True:
+                done, _ = await asyncio.wait({pending}, timeout=self.heartbeat)
+                if not done:
+                    writer.write(b": keepalive\n\n")
+                    await writer.drain()
+                    continue
+                try:
+                    record = pending.result()
+                except StopAsyncIteration:
+                    break
+                writer.write(f"id: {record['seq']}\ndata: {json.dumps(record)}\n\n".encode())
+                await writer.drain()
+                pending = asyncio.ensure_future(anext(events))
+            writer.write(b"event: end\ndata: {}\n\n")
+            await writer.drain()
+        finally:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+            await events.aclose()
+
+
+def _parse_head(head: bytes) -> tuple[str, str, dict[str, str]]:
+    """Method, target and lower-cased headers of an HTTP request head."""
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise ValueError(f"bad request line {lines[0]!r}")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, sep, value = line.partition(":")
+            if not sep:
+                raise ValueError(f"bad header {line!r}")
+            headers[name.strip().lower()] = value.strip()
+    return parts[0], parts[1], headers
+
+
+async def _respond(
+    writer: asyncio.StreamWriter,
+    status: HTTPStatus,
+    body: bytes | None = None,
+    content_type: str = "text/plain; charset=utf-8",
+    extra: dict[str, str] | None = None,
+) -> None:
+    if body is None:
+        body = f"{status.value} {status.phrase}\n".encode()
+    headers = {"Content-Type": content_type, "Content-Length": str(len(body)),
+               "Connection": "close", **(extra or {})}
+    head = f"HTTP/1.1 {status.value} {status.phrase}\r\n" + "".join(
+        f"{name}: {value}\r\n" for name, value in headers.items()
+    )
+    writer.write(head.encode() + b"\r\n" + body)
+    await writer.drain()
@@ -0,0 +1,205 @@
+"""Per-agent performance records persisted under .disagree/.
+
+RaceLedger tracks race-mode outcomes: how often each agent wins, how long a
+winning answer takes, and how much wall-clock time racing saved compared with
+waiting for every agent to finish.
+
+LatencyHistory keeps a rolling window of latency samples per (agent, stage),
+e.g. ("claude", "stream.ttft"), and answers percentile queries over it.
+TimeoutPolicy turns that history into per-agent deadlines.
+
+All records are small JSON documents. load() tolerates a missing or corrupt
+file (starting from an empty record) so a bad ledger never blocks a session.
+"""
+from __future__ import annotations
+
+import json
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tui.apply import write_file_atomic
+
+DISAGREE_DIR = Path(".disagree")
+RACE_LEDGER_PATH = DISAGREE_DIR / "race.json"
+LATENCY_HISTORY_PATH = DISAGREE_DIR / "latency.json"
+
+
+@dataclass
+class RaceLedger:
+    """Cumulative race-mode statistics for each agent.
+
+    Attributes:
+        races:         {agent: number of races entered}
+        wins:          {agent: number of races won}
+        win_latency:   {agent: total seconds spent producing winning answers}
+        latency_saved: Total estimated seconds saved by not waiting for losers.
+    """
+
+    races: dict[str, int] = field(default_factory=dict)
+    wins: dict[str, int] = field(default_factory=dict)
+    win_latency: dict[str, float] = field(default_factory=dict)
+    latency_saved: float = 0.0
+
+    @classmethod
+    def load(cls, path: Path = RACE_LEDGER_PATH) -> RaceLedger:
+        """Read a ledger from path; returns an empty ledger if unreadable."""
+        try:
+            data = json.loads(path.read_text())
+            return cls(
+                races={k: int(v) for k, v in data.get("races", {}).items()},
+                wins={k: int(v) for k, v in data.get("wins", {}).items()},
+                win_latency={k: float(v) for k, v in data.get("win_latency", {}).items()},
+                latency_saved=float(data.get("latency_saved", 0.0)),
+            )
+        except (OSError, ValueError, TypeError, AttributeError):
+            return cls()
+
+    def save(self, path: Path = RACE_LEDGER_PATH) -> None:
+        """Write the ledger atomically to path."""
+        payload = {
+            "races": self.races,
+            "wins": self.wins,
+            "win_latency": self.win_latency,
+            "latency_saved": self.latency_saved,
+        }
+        write_file_atomic(path, json.dumps(payload, indent=2, sort_keys=True))
+
+    def mean_win_latency(self, agent: str) -> float | None:
+        """Average seconds the agent takes to produce a winning answer, or None."""
+        wins = self.wins.get(agent, 0)
+        if not wins:
+            return None
+        return self.win_latency.get(agent, 0.0) / wins
+
+    def win_rate(self, agent: str) -> float:
+        """Fraction of entered races the agent won (0.0 if it never raced)."""
+        races = self.races.get(agent, 0)
+        return self.wins.get(agent, 0) / races if races else 0.0
+
+    def record(
+        self,
+        entrants: list[str],
+        winner: str | None,
+        elapsed: float,
+        cancelled: tuple[str, ...] = (),
+    ) -> float:
+        """Record one race and return the estimated latency saved in seconds.
+
+        Saved latency is estimated from the cancelled agents' historical mean
+        winning latency: the slowest of them is how long the session would have
+        waited. Agents with no history contribute nothing, so the estimate is a
+        lower bound.
+        """
+        saved = 0.0
+        if winner is not None:
+            baselines = [
+                latency for latency in (self.mean_win_latency(a) for a in cancelled)
+                if latency is not None
+            ]
+            if baselines:
+                saved = max(0.0, max(baselines) - elapsed)
+            self.wins[winner] = self.wins.get(winner, 0) + 1
+            self.win_latency[winner] = self.win_latency.get(winner, 0.0) + elapsed
+        for agent in entrants:
+            self.races[agent] = self.races.get(agent, 0) + 1
+        self.latency_saved += saved
+        return saved
+
+
+class LatencyHistory:
+    """Rolling per-agent, per-stage latency samples with percentile queries.
+
+    Only the most recent `window` samples are kept for each (agent, stage) key.
+    percentile() returns None until `min_samples` have been recorded, so callers
+    fall back to their static defaults while history is still cold.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 5) -> None:
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+
+    @classmethod
+    def load(
+        cls, path: Path = LATENCY_HISTORY_PATH, window: int = 200, min_samples: int = 5
+    ) -> LatencyHistory:
+        """Read history from path; returns an empty history if unreadable."""
+        history = cls(window=window, min_samples=min_samples)
+        try:
+            data = json.loads(path.read_text())
+            for agent, stages in data.items():
+                for stage, samples in stages.items():
+                    for seconds in samples[-window:]:
+                        history.record(agent, stage, float(seconds))
+        except (OSError, ValueError, TypeError, AttributeError):
+            return cls(window=window, min_samples=min_samples)
+        return history
+
+    def save(self, path: Path = LATENCY_HISTORY_PATH) -> None:
+        """Write all retained samples atomically to path as {agent: {stage: [...]}}."""
+        payload: dict[str, dict[str, list[float]]] = {}
+        for (agent, stage), samples in self._samples.items():
+            payload.setdefault(agent, {})[stage] = [round(s, 3) for s in samples]
+        write_file_atomic(path, json.dumps(payload, sort_keys=True))
+
+    def record(self, agent: str, stage: str, seconds: float) -> None:
+        """Add one latency sample for (agent, stage)."""
+        key = (agent, stage)
+        if key not in self._samples:
+            self._samples[key] = deque(maxlen=self.window)
+        self._samples[key].append(float(seconds))
+
+    def samples(self, agent: str, stage: str) -> list[float]:
+        """Return the retained samples for (agent, stage), oldest first."""
+        return list(self._samples.get((agent, stage), ()))
+
+    def percentile(self, agent: str, stage: str, q: float) -> float | None:
+        """Nearest-rank percentile (q in 0..1) of the samples, or None if too few."""
+        samples = self._samples.get((agent, stage))
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        rank = max(1, math.ceil(q * len(ordered)))
+        return ordered[rank - 1]
+
+
+@dataclass(frozen=True)
+class TimeoutPolicy:
+    """Derive per-agent, per-stage timeouts from LatencyHistory.
+
+    The overall deadline is the stage's p99 total latency times `factor`,
+    clamped to [floor, ceiling]. The inactivity deadline (no TokenChunk for that
+    long) is the larger of the p99 time-to-first-token and p99 largest gap
+    between tokens, times `factor`, clamped to [idle_floor, overall deadline].
+    While history is cold the caller's default deadline applies and the
+    inactivity deadline is disabled (None).
+    """
+
+    percentile: float = 0.99
+    factor: float = 1.5
+    floor: float = 15.0
+    ceiling: float = 600.0
+    idle_floor: float = 10.0
+
+    def timeouts(
+        self, history: LatencyHistory, agent: str, stage: str, default: float
+    ) -> tuple[float, float | None]:
+        """Return (overall_timeout, idle_timeout) in seconds for one invocation."""
+        total = history.percentile(agent, stage, self.percentile)
+        overall = default
+        if total is not None:
+            overall = min(self.ceiling, max(self.floor, total * self.factor))
+
+        waits = [
+            w for w in (
+                history.percentile(agent, f"{stage}.ttft", self.percentile),
+                history.percentile(agent, f"{stage}.gap", self.percentile),
+            )
+            if w is not None
+        ]
+        if not waits:
+            return overall, None
+        idle = min(overall, max(self.idle_floor, max(waits) * self.factor))
+        return overall, idle
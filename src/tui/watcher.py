@@ -0,0 +1,325 @@
+"""Change-driven refresh of the repository index and environment context.
+
+Rescanning the whole project on every prompt does not scale to large
+monorepos. FileWatcher runs in a daemon thread and reports batches of changed
+root-relative paths to a callback, which re-indexes just those files:
+
+- On Linux it uses inotify through ctypes: one watch per directory (not per
+  file), plus a non-recursive watch on .git/ so branch switches show up as
+  ".git/HEAD".
+- Elsewhere, or when inotify is unavailable or runs out of watches, it falls
+  back to polling: a periodic stat walk compared with the previous snapshot,
+  with the poll interval stretched so scanning stays around 10% of one core.
+
+Bursts (a checkout, a formatter run) are debounced into one callback. Memory
+stays bounded on trees with 100k+ files: watches are per directory and capped,
+the polling snapshot is capped at `max_files` entries, and a batch larger than
+`max_pending` paths collapses into a single "rescan everything" signal
+(callback argument None) instead of growing without limit.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+
+from tui.repo_index import is_ignored
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+# Called with changed root-relative paths, or None when everything must be rescanned.
+ChangeCallback = Callable[[set[str] | None], None]
+
+
+class _Inotify:
+    """Minimal ctypes binding for inotify_init1 and inotify_add_watch."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path: Path, mask: int = _WATCH_MASK) -> int:
+        wd = self._add(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), str(path))
+        return wd
+
+    def read(self, timeout: float) -> list[tuple[int, int, str]]:
+        """Events as (wd, mask, name), waiting up to timeout seconds for the first."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].split(b"\0", 1)[0]
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Watch root for file changes and report debounced batches to on_change.
+
+    on_change runs in the watcher thread. It receives a set of changed
+    root-relative paths (created, modified or deleted files) or None when the
+    batch overflowed and the caller should rescan everything.
+
+    use_inotify=False forces the polling backend; `backend` reports which one
+    is running ("inotify" or "polling") once started.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        on_change: ChangeCallback,
+        debounce: float = 0.5,
+        max_delay: float = 5.0,
+        max_pending: int = 10_000,
+        max_watches: int = 8192,
+        max_files: int = 100_000,
+        poll_interval: float = 2.0,
+        use_inotify: bool = True,
+    ) -> None:
+        self.root = root
+        self.on_change = on_change
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.max_watches = max_watches
+        self.max_files = max_files
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend: str | None = None
+        self._pending: set[str] = set()
+        self._overflow = False
+        self._first_event: float | None = None
+        self._last_event = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # --- lifecycle ---
+
+    def start(self) -> None:
+        """Start watching in a daemon thread (no-op if already running)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the watcher thread and wait briefly for it to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = _Inotify()
+            except (OSError, AttributeError):
+                inotify = None  # not Linux, or no inotify instances left
+        if inotify is not None:
+            try:
+                if self._run_inotify(inotify):
+                    return
+            finally:
+                inotify.close()
+        self._run_polling()
+
+    # --- batching ---
+
+    def _note(self, paths: set[str] | None) -> None:
+        """Queue changed paths (None: something needs a full rescan)."""
+        now = time.monotonic()
+        if self._first_event is None:
+            self._first_event = now
+        self._last_event = now
+        if paths is None:
+            self._overflow = True
+        elif not self._overflow:
+            self._pending |= paths
+            if len(self._pending) > self.max_pending:
+                self._overflow = True
+        if self._overflow:
+            self._pending.clear()
+
+    def _flush(self, force: bool = False) -> None:
+        """Deliver the batch once quiet for `debounce` s, or after `max_delay` s of activity."""
+        if self._first_event is None:
+            return
+        now = time.monotonic()
+        quiet = now - self._last_event >= self.debounce
+        overdue = now - self._first_event >= self.max_delay
+        if not (force or quiet or overdue):
+            return
+        batch = None if self._overflow else self._pending
+        self._pending, self._overflow, self._first_event = set(), False, None
+        try:
+            self.on_change(batch)
+        except Exception:
+            pass  # a failing consumer must not kill the watcher
+
+    # --- inotify backend ---
+
+    def _run_inotify(self, inotify: _Inotify) -> bool:
+        """Watch with inotify until stopped. Returns False to fall back to polling."""
+        watches: dict[int, str] = {}
+
+        def _watch_tree(rel: str) -> bool:
+            pending = deque([rel])
+            while pending:
+                current = pending.popleft()
+                if len(watches) >= self.max_watches:
+                    return False
+                try:
+                    watches[inotify.add_watch(self.root / current)] = current
+                    entries = list(os.scandir(self.root / current))
+                except OSError as exc:
+                    if exc.errno == errno.ENOSPC:
+                        return False
+                    continue
+                for entry in entries:
+                    if is_ignored(entry.name):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(os.path.join(current, entry.name) if current else entry.name)
+                    except OSError:
+                        continue
+            return True
+
+        if not _watch_tree(""):
+            return False
+        git_dir = self.root / ".git"
+        if git_dir.is_dir():
+            try:
+                watches[inotify.add_watch(git_dir, IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE)] = ".git"
+            except OSError:
+                pass
+        self.backend = "inotify"
+
+        while not self._stop.is_set():
+            timeout = self.debounce if self._first_event is not None else 0.5
+            for wd, mask, name in inotify.read(timeout):
+                if mask & IN_Q_OVERFLOW:
+                    self._note(None)
+                    continue
+                directory = watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del watches[wd]
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    self._note(None)
+                    continue
+                rel = os.path.join(directory, name) if directory else name
+                if mask & IN_ISDIR:
+                    if is_ignored(name):
+                        continue
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        if not _watch_tree(rel):
+                            return False
+                    # A directory appeared or vanished: its files are easiest found by a rescan.
+                    self._note(None)
+                elif directory == ".git" or not is_ignored(name):
+                    self._note({rel})
+            self._flush()
+        return True
+
+    # --- polling backend ---
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        """Snapshot {rel path: (mtime_ns, size)} of up to max_files files, plus .git/HEAD."""
+        snapshot: dict[str, tuple[int, int]] = {}
+        for rel in (".git/HEAD", ".git/config"):
+            try:
+                stat = (self.root / rel).stat()
+                snapshot[rel] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass
+        pending = deque([""])
+        while pending and len(snapshot) < self.max_files:
+            current = pending.popleft()
+            try:
+                entries = list(os.scandir(self.root / current))
+            except OSError:
+                continue
+            for entry in entries:
+                if is_ignored(entry.name):
+                    continue
+                rel = os.path.join(current, entry.name) if current else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(rel)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat()
+                        snapshot[rel] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    continue
+                if len(snapshot) >= self.max_files:
+                    break
+        return snapshot
+
+    def _run_polling(self) -> None:
+        self.backend = "polling"
+        snapshot = self._scan()
+        interval = self.poll_interval
+        while not self._stop.wait(interval):
+            started = time.monotonic()
+            current = self._scan()
+            changed = {
+                rel for rel in snapshot.keys() | current.keys()
+                if snapshot.get(rel) != current.get(rel)
+            }
+            snapshot = current
+            # Keep the stat walk to roughly a tenth of the time on big trees.
+            interval = max(self.poll_interval, (time.monotonic() - started) * 10)
+            if changed:
+                self._note(changed)
+            self._flush(force=True)
@@ -0,0 +1,164 @@
+"""HistoryScreen — full-text search over past sessions.
+
+Opens on ctrl+o. The session journal is synced into the SQLite history store
+in a worker thread; each keystroke in the search box re-runs the query, and
+further pages are fetched as the highlight nears the end of the loaded list,
+so only what is visible is ever read. Escape closes the screen.
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Vertical
+from textual.screen import Screen
+from textual.widgets import Input, Label, OptionList, Static
+from textual.widgets.option_list import Option
+
+from tui.history import HISTORY_PATH, HistoryEntry, HistoryStore
+from tui.journal import JOURNAL_PATH
+
+PAGE_SIZE = 50
+# Fetch the next page once the highlight is this close to the end of the list.
+_PREFETCH = 10
+
+
+class HistoryScreen(Screen[None]):
+    """Search box, lazily paged result list, and the highlighted session's texts."""
+
+    DEFAULT_CSS = """
+    HistoryScreen {
+        background: $surface;
+    }
+    #history-results {
+        height: 1fr;
+        border: solid $panel;
+    }
+    #history-detail {
+        height: 1fr;
+        border: solid $panel;
+        padding: 0 1;
+        overflow-y: auto;
+    }
+    #history-hint {
+        color: $text-muted;
+    }
+    """
+
+    BINDINGS = [
+        Binding("escape", "close", "Close"),
+    ]
+
+    def __init__(self, path: Path = HISTORY_PATH, journal: Path = JOURNAL_PATH) -> None:
+        super().__init__()
+        self._path = path
+        self._journal = journal
+        self._store: HistoryStore | None = None
+        self._query = ""
+        self._entries: list[HistoryEntry] = []
+        self._exhausted = False
+        self._loading = False
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield Input(placeholder="Search prompts, answers and code…", id="history-search")
+            yield OptionList(id="history-results")
+            yield Static("", id="history-detail")
+            yield Label("Loading history…", id="history-hint")
+
+    def on_mount(self) -> None:
+        self.query_one("#history-search", Input).focus()
+        self.run_worker(self._open_store, thread=True, exit_on_error=False, name="history-open")
+
+    def on_unmount(self) -> None:
+        if self._store is not None:
+            self._store.close()
+
+    # --- workers (threads) ---
+
+    def _open_store(self) -> None:
+        store = HistoryStore(self._path)
+        store.sync(self._journal)
+        self._store = store
+        self.app.call_from_thread(self._search, self._query)
+
+    def _fetch(self, query: str, offset: int) -> None:
+        started = time.perf_counter()
+        entries = self._store.search(query, limit=PAGE_SIZE, offset=offset)
+        elapsed = (time.perf_counter() - started) * 1000
+        self.app.call_from_thread(self._add_page, query, offset, entries, elapsed)
+
+    def _fetch_detail(self, session: str) -> None:
+        record = self._store.get(session)
+        if record is None:
+            return
+        parts = [f"Prompt:\n{record.prompt}"]
+        if record.code:
+            parts.append("Code:\n" + "\n\n".join(record.code))
+        for agent, text in record.outputs.items():
+            parts.append(f"{agent}:\n{text}")
+        self.app.call_from_thread(
+            self.query_one("#history-detail", Static).update, Text("\n\n".join(parts))
+        )
+
+    # --- paging ---
+
+    def _search(self, query: str) -> None:
+        """Start a new query from its first page."""
+        self._query = query
+        self._entries = []
+        self._exhausted = False
+        self.query_one("#history-results", OptionList).clear_options()
+        self._load_more()
+
+    def _load_more(self) -> None:
+        if self._store is None or self._exhausted or self._loading:
+            return
+        self._loading = True
+        self.run_worker(
+            lambda: self._fetch(self._query, len(self._entries)),
+            thread=True, group="history-search", exit_on_error=False,
+        )
+
+    def _add_page(self, query: str, offset: int, entries: list[HistoryEntry], elapsed_ms: float) -> None:
+        self._loading = False
+        if query != self._query or offset != len(self._entries):
+            self._load_more()  # superseded by a newer query; fetch for that one
+            return
+        self._entries.extend(entries)
+        self._exhausted = len(entries) < PAGE_SIZE
+        results = self.query_one("#history-results", OptionList)
+        results.add_options(Option(_entry_label(e), id=e.session) for e in entries)
+        more = "" if self._exhausted else "+"
+        self.query_one("#history-hint", Label).update(
+            Text(f"{len(self._entries)}{more} session(s) in {elapsed_ms:.0f} ms  •  [esc] Close")
+        )
+        if offset == 0 and entries:
+            results.highlighted = 0
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        self._search(event.value)
+
+    def on_option_list_option_highlighted(self, event: OptionList.OptionHighlighted) -> None:
+        if event.option.id is not None:
+            self.run_worker(
+                lambda: self._fetch_detail(event.option.id),
+                thread=True, exclusive=True, group="history-detail", exit_on_error=False,
+            )
+        if event.option_index >= len(self._entries) - _PREFETCH:
+            self._load_more()
+
+    def action_close(self) -> None:
+        self.dismiss()
+
+
+def _entry_label(entry: HistoryEntry) -> Text:
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.ts)) if entry.ts else "—"
+    prompt = " ".join(entry.prompt.split())[:80]
+    label = Text(f"{when}  {entry.status:<9} {prompt}")
+    if entry.snippet:
+        label.append("\n    " + " ".join(entry.snippet.split())[:100], style="dim")
+    return label
@@ -1,10 +1,13 @@
 """ReconciliationPanel widget — below-panes panel for agent reconciliation output.
 
 Hidden by default (display=False). Becomes visible when show_reconciliation()
-is called with the agent discussion text and unified diff.
+is called with the agent discussion text and unified diff, when
+show_hunk_selection() lists the differing hunks for per-hunk picking, or when
+show_reused() offers a past solution.
 """
 from __future__ import annotations
 
+from rich.markup import escape
 from rich.syntax import Syntax
 from textual.app import ComposeResult
 from textual.widget import Widget
@@ -80,6 +83,71 @@ class ReconciliationPanel(Widget):
         else:
             log.write("[dim]No code differences — both reconciliations are identical.[/dim]")
 
+    def show_race_winner(self, agent: str, code: str, language: str = "") -> None:
+        """Display the winning race-mode answer's code. Makes panel visible.
+
+        Args:
+            agent:    Display name of the agent that answered first.
+            code:     The winner's code (or its whole answer if it had no code block).
+            language: Fence language for highlighting; plain text if empty.
+        """
+        self.display = True
+        header = self.query_one("#recon-header", Label)
+        log = self.query_one("#recon-log", RichLog)
+        log.clear()
+        header.update(f"Race — {agent} answered first")
+        header.set_class(True, "success")
+        header.set_class(False, "failure")
+        log.write(Syntax(code, language or "text", theme="monokai", background_color="default"))
+
+    def show_reused(self, similarity: float, prompt: str, code: str, language: str = "") -> None:
+        """Display a past accepted solution offered for a near-duplicate prompt. Makes panel visible.
+
+        Args:
+            similarity: How similar the past prompt is to the current one (0..1).
+            prompt:     The past prompt the solution answered.
+            code:       The past solution's code.
+            language:   Fence language for highlighting; plain text if empty.
+        """
+        self.display = True
+        header = self.query_one("#recon-header", Label)
+        log = self.query_one("#recon-log", RichLog)
+        log.clear()
+        header.update(f"Reused — past solution for a {similarity:.0%} similar prompt")
+        header.set_class(True, "success")
+        header.set_class(False, "failure")
+        log.write(f"[dim]Past prompt: {escape(prompt)}[/dim]")
+        log.write(Syntax(code, language or "text", theme="monokai", background_color="default"))
+
+    def show_hunk_selection(self, hunks: list, choices: list[str], cursor: int) -> None:
+        """List the differing hunks with the side picked for each. Makes panel visible.
+
+        Args:
+            hunks:   list[Hunk] from diff_hunks(claude_code, codex_code).
+            choices: Picked side per hunk, "claude" or "codex".
+            cursor:  Index of the hunk the pick keys act on.
+        """
+        self.display = True
+        header = self.query_one("#recon-header", Label)
+        log = self.query_one("#recon-log", RichLog)
+        log.clear()
+        codex_count = choices.count("codex")
+        header.update(
+            f"Pick per hunk — {len(hunks)} hunks  •  "
+            f"Claude: {len(hunks) - codex_count}  •  Codex: {codex_count}"
+        )
+        header.set_class(True, "success")
+        header.set_class(False, "failure")
+        for index, (hunk, choice) in enumerate(zip(hunks, choices)):
+            marker = "\u25b6" if index == cursor else " "
+            side = "Claude" if choice == "claude" else "Codex"
+            log.write(f"{marker} [bold]Hunk {index + 1}[/bold] (line {hunk.a_start + 1}) — using {side}")
+            for prefix, lines, picked in (("-", hunk.a_lines, choice == "claude"),
+                                          ("+", hunk.b_lines, choice == "codex")):
+                style = ("green" if prefix == "+" else "red") if picked else "dim"
+                for line in lines:
+                    log.write(f"[{style}]{prefix} {escape(line)}[/{style}]")
+
     def show_merge_output(self, text: str) -> None:
         """Replace panel content with the merged output text. Makes panel visible."""
         self.display = True
@@ -22,13 +22,33 @@ class ReviewBar(Widget):
     }
     """
 
-    _HINT = "[r] Reconcile further  •  [c] Apply Claude  •  [x] Apply Codex  •  [y] Merge & apply"
+    _HINT = (
+        "[r] Reconcile further  •  [c] Apply Claude  •  [x] Apply Codex  •  "
+        "[y] Merge & apply  •  [h] Pick per hunk"
+    )
+    _HUNK_HINT = (
+        "[j/k] Next/prev hunk  •  [c] Use Claude  •  [x] Use Codex  •  "
+        "[a] Apply selection  •  [esc] Back"
+    )
+
+    _RACE_HINT = "[{key}] Apply {winner}  •  [r] Run both agents (no race)"
 
     def compose(self) -> ComposeResult:
         yield Static(self._HINT)
 
     def show(self) -> None:
+        self.show_hunk_mode(False)
+        self.display = True
+
+    def show_race(self, winner: str) -> None:
+        """Show only the keys that apply after a race: the winner's answer, or a normal run."""
+        key = "c" if winner == "claude" else "x"
+        self.query_one(Static).update(self._RACE_HINT.format(key=key, winner=winner.capitalize()))
         self.display = True
 
+    def show_hunk_mode(self, active: bool) -> None:
+        """Switch the hints between whole-answer review and per-hunk picking."""
+        self.query_one(Static).update(self._HUNK_HINT if active else self._HINT)
+
     def hide(self) -> None:
         self.display = False
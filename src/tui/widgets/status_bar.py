@@ -13,8 +13,10 @@ class StatusBar(Static):
     Displays keyboard hints in IDLE state. Updated via update_status()
     when agent streaming state or classification results change.
 
-    Uses Static.update() (inherited) for all text changes — no reactive
-    needed; updates are driven by explicit calls from AgentBureauApp.
+    Uses Static.update() for all text changes — no reactive needed; updates
+    are driven by explicit calls from AgentBureauApp. update() also keeps the
+    text it was given in `status_text`, so notes can be appended to the
+    current status without reading it back from the rendered widget.
     """
 
     DEFAULT_CSS = """
@@ -29,6 +31,12 @@ class StatusBar(Static):
 
     def __init__(self, **kwargs) -> None:
         super().__init__(_INITIAL_TEXT, **kwargs)
+        self.status_text = _INITIAL_TEXT
+
+    def update(self, content="", **kwargs) -> None:
+        """Static.update(), remembering content as status_text."""
+        self.status_text = content
+        super().update(content, **kwargs)
 
     def show_hints(self) -> None:
         """Restore keyboard hint text (IDLE state)."""
@@ -48,12 +56,17 @@ class StatusBar(Static):
         parts = [f"{name}: {count} lines" for name, count in agent_counts.items()]
         self.update("Both done — " + ", ".join(parts))
 
-    def show_classification(self, agent_counts: dict[str, int], disagreements: list) -> None:
+    def show_classification(
+        self, agent_counts: dict[str, int], disagreements: list, partial: tuple = (),
+        pending: tuple = (),
+    ) -> None:
         """Update text after classification completes.
 
         Args:
             agent_counts: {agent_name: line_count}
             disagreements: list[Disagreement] from classify_disagreements()
+            partial: names of agents whose output is a partial transcript
+            pending: names of agents still streaming (a quorum classified early)
         """
         done_part = ", ".join(f"{name}: {count} lines" for name, count in agent_counts.items())
         if disagreements:
@@ -61,16 +74,48 @@ class StatusBar(Static):
             classification_part = f"disagreement: {kinds}"
         else:
             classification_part = "agents agree"
+        # Pending agents are partial by definition; only name the others here.
+        partial = tuple(name for name in partial if name not in pending)
+        if partial:
+            classification_part += f"  •  partial: {', '.join(partial)}"
+        if pending:
+            finished = [name for name in agent_counts if name not in pending]
+            self.update(
+                f"{', '.join(finished)} done, {', '.join(pending)} still streaming (partial)"
+                f" — {done_part}  •  {classification_part}"
+            )
+            return
         self.update(f"Both done — {done_part}  •  {classification_part}")
 
+    def show_race_won(self, winner: str, elapsed: float, latency_saved: float) -> None:
+        """Update text when race mode committed to the first successful answer."""
+        self.update(
+            f"Race won by {winner} in {elapsed:.1f}s  •  ~{latency_saved:.1f}s saved"
+        )
+
+    def show_race_mode(self, enabled: bool) -> None:
+        """Update text when race mode is toggled."""
+        state = "on — first agent to answer with code wins" if enabled else "off"
+        self.update(f"Race mode {state}  •  Ctrl-R: toggle")
+
+    def show_quorum_wait(self, pending: list[str]) -> None:
+        """Append a note that reconciliation waits for late agents (after early classification)."""
+        self.update(f"{self.status_text}  •  waiting for {', '.join(pending)} to reconcile")
+
     def show_reconciling(self) -> None:
         """Update text during agent reconciliation."""
         self.update("Reconciling — each agent reviewing the other's proposal...")
 
-    def show_reviewing(self, agent_counts: dict[str, int]) -> None:
+    def show_convergence(self, round: int, similarity: float, stop_reason: str | None) -> None:
+        """Update text after an automatic reconciliation round is scored."""
+        text = f"Reconcile round {round} — proposals {similarity:.0%} similar"
+        text += f"  •  stopping: {stop_reason}" if stop_reason else "  •  next round..."
+        self.update(text)
+
+    def show_reviewing(self, agent_counts: dict[str, int], convergence: str = "") -> None:
         """Update text when reconciliation is done and review bar is active."""
         done_part = ", ".join(f"{name}: {count} lines" for name, count in agent_counts.items())
-        self.update(f"Reconciled — {done_part}")
+        self.update(f"Reconciled — {done_part}{f'  •  {convergence}' if convergence else ''}")
 
     def show_apply_confirm(self, file_count: int) -> None:
         """Update text during apply confirmation."""
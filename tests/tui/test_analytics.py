@@ -0,0 +1,97 @@
+"""Tests for analytics.py — streaming journal statistics for `agent-bureau stats`."""
+import gzip
+import json
+
+from tui.analytics import compute_stats, iter_records, journal_files, main, percentile, render_table
+
+
+def _lines(records):
+    return "".join(json.dumps(r) + "\n" for r in records)
+
+
+def _session(sid, claude_elapsed, stop_reason="converged", source="claude"):
+    return [
+        {"session": sid, "stage": "prompt", "prompt": "p"},
+        {"session": sid, "stage": "checkpoint", "state": "STREAMING", "lines": {"claude": ["x"]}},
+        {"session": sid, "stage": "stream", "agent": "claude", "status": "done",
+         "elapsed": claude_elapsed, "ttft": 0.5, "text": "answer"},
+        {"session": sid, "stage": "stream", "agent": "codex", "status": "timeout",
+         "elapsed": 60.0, "ttft": None, "text": ""},
+        {"session": sid, "stage": "classification", "disagreements": [{"kind": "approach", "summary": "s"}]},
+        {"session": sid, "stage": "reconcile_round", "round": 1, "stop_reason": None},
+        {"session": sid, "stage": "reconcile_round", "round": 2, "stop_reason": stop_reason},
+        {"session": sid, "stage": "apply", "confirmed": True, "files": ["a.py"], "source": source},
+    ]
+
+
+def test_journal_files_lists_segments_oldest_first_then_active(tmp_path):
+    # Arrange
+    active = tmp_path / "sessions.jsonl"
+    active.write_text("")
+    for stamp in ("200", "100"):
+        (tmp_path / f"sessions-{stamp}.jsonl.gz").write_bytes(gzip.compress(b""))
+
+    # Act
+    files = journal_files(active)
+
+    # Assert
+    assert [f.name for f in files] == ["sessions-100.jsonl.gz", "sessions-200.jsonl.gz", "sessions.jsonl"]
+
+
+def test_iter_records_skips_unneeded_stages_and_answer_text(tmp_path):
+    # Arrange
+    path = tmp_path / "sessions.jsonl"
+    path.write_text(_lines(_session("s1", 3.0)) + "{not json\n")
+
+    # Act
+    records = list(iter_records([path]))
+
+    # Assert
+    assert "checkpoint" not in [r["stage"] for r in records]
+    stream = next(r for r in records if r["stage"] == "stream")
+    assert stream["elapsed"] == 3.0
+    assert "text" not in stream
+
+
+def test_compute_stats_aggregates_segments_and_legacy_records(tmp_path):
+    # Arrange
+    active = tmp_path / "sessions.jsonl"
+    legacy = {"prompt": "p", "agent_a": {}, "agent_b": {}, "disagreements": [{"kind": "fact", "summary": ""}]}
+    with gzip.open(tmp_path / "sessions-1.jsonl.gz", "wt") as f:
+        f.write(_lines([legacy] + _session("s1", 2.0)))
+    active.write_text(_lines(_session("s2", 4.0, stop_reason="max rounds", source="merge")))
+
+    # Act
+    summary = compute_stats(journal_files(active))
+
+    # Assert
+    assert summary["sessions"] == 3
+    assert summary["disagreement_kinds"] == {"approach": 2, "fact": 1}
+    assert summary["agents"]["claude"]["latency"]["p50"] == 2.0
+    assert summary["agents"]["claude"]["ttft"]["p99"] == 0.5
+    assert summary["agents"]["codex"]["answers"] == {"timeout": 2}
+    assert summary["reconciliation"]["loops"] == 2
+    assert summary["reconciliation"]["converged_rate"] == 0.5
+    assert summary["accepted"] == {"claude": 1, "merge": 1}
+
+
+def test_percentile_nearest_rank():
+    values = [1.0, 2.0, 3.0, 4.0]
+    assert percentile(values, 50) == 2.0
+    assert percentile(values, 99) == 4.0
+    assert percentile([], 50) is None
+
+
+def test_render_table_and_json_output(tmp_path, capsys):
+    # Arrange
+    path = tmp_path / "sessions.jsonl"
+    path.write_text(_lines(_session("s1", 2.0)))
+
+    # Act
+    table = render_table(compute_stats([path]))
+    main(["--json", "--journal", str(path)])
+
+    # Assert
+    assert "approach" in table
+    assert "converged 100%" in table
+    assert json.loads(capsys.readouterr().out)["sessions"] == 1
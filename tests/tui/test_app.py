@@ -12,19 +12,33 @@ Tests cover:
   - Clear: Ctrl-L clears both panes and resets status bar
   - Reconciliation: ReconciliationReady shows panel and review bar
   - Apply result: confirmed/rejected returns to IDLE
+  - Race mode: ctrl+r toggles; RaceWon skips straight to REVIEWING
+  - Partial output: timed-out transcripts feed classification when enabled
+  - Quorum: early classification while a late agent keeps streaming
+  - Reconcile rounds: delta prompts and the convergence loop
+  - Speculative merge: started on review, reused by y, cancelled by c
+  - Daemon sessions: run in the daemon, survive quitting, reattach
 """
+import asyncio
+
 import pytest
 
 from tui.app import AgentBureauApp
 from tui.messages import (
     AgentFinished, ClassificationDone, TokenReceived,
-    ReconciliationReady, ApplyResult,
+    ReconciliationReady, ApplyResult, RaceWon,
 )
 from tui.session import SessionState
 from tui.widgets.agent_pane import AgentPane
 from tui.event_bus import AgentDone, AgentError, AgentTimeout
 
 
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """Keep the .disagree/ records the app writes (latency, index) out of the repository."""
+    monkeypatch.chdir(tmp_path)
+
+
 # --- Layout tests ---
 
 @pytest.mark.asyncio
@@ -439,3 +453,681 @@ async def test_apply_result_rejected_shows_cancelled_in_status():
         await pilot.pause()
         status_bar = app.query_one("#status-bar", StatusBar)
         assert "Cancelled" in str(status_bar.render())
+
+
+# --- Race mode tests ---
+
+@pytest.mark.asyncio
+async def test_ctrl_r_toggles_race_mode():
+    app = AgentBureauApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        assert app.race_mode is False
+        await pilot.press("ctrl+r")
+        await pilot.pause()
+        assert app.race_mode is True
+
+
+@pytest.mark.asyncio
+async def test_race_won_goes_straight_to_review():
+    """RaceWon shows the winner's code and enters REVIEWING without reconciliation."""
+    from tui.widgets.reconciliation_panel import ReconciliationPanel
+    from tui.widgets.review_bar import ReviewBar
+    app = AgentBureauApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        text = "```python\n# src/foo.py\nx = 1\n```"
+        app.post_message(RaceWon(winner="codex", full_text=text, elapsed=3.0, latency_saved=4.0))
+        await pilot.pause()
+        assert app.session_state == SessionState.REVIEWING
+        assert app.query_one("#recon-panel", ReconciliationPanel).display
+        assert app.query_one("#review-bar", ReviewBar).display
+        assert app._recon_proposals["codex"].filename == "src/foo.py"
+        assert app._recon_proposals["claude"] is None
+
+
+@pytest.mark.asyncio
+async def test_race_won_code_with_subscripts_survives_in_the_panel():
+    """The winner's code reaches the recon log verbatim, brackets included."""
+    from textual.widgets import RichLog
+    app = AgentBureauApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        text = "```python\n# src/foo.py\nvalue = d[key]\n```"
+        app.post_message(RaceWon(winner="codex", full_text=text, elapsed=3.0, latency_saved=4.0))
+        await pilot.pause()
+        await pilot.pause()
+        log = app.query_one("#recon-log", RichLog)
+        assert "d[key]" in "\n".join(line.text for line in log.lines)
+
+
+@pytest.mark.asyncio
+async def test_review_after_race_offers_only_the_winner():
+    """After a race the loser's key and merge explain themselves instead of applying nothing."""
+    from tui.widgets.status_bar import StatusBar
+    app = AgentBureauApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        text = "```python\n# src/foo.py\nx = 1\n```"
+        app.post_message(RaceWon(winner="claude", full_text=text, elapsed=3.0, latency_saved=4.0))
+        await pilot.pause()
+        await pilot.press("x")
+        await pilot.press("y")
+        await pilot.pause()
+        assert app.session_state == SessionState.REVIEWING
+        assert len(app.screen_stack) == 1
+        assert "won the race" in str(app.query_one("#status-bar", StatusBar).render())
+
+
+@pytest.mark.asyncio
+async def test_reconcile_after_race_reruns_both_agents_without_racing(monkeypatch):
+    """`r` after a race starts a normal session instead of reconciling against nothing."""
+    import tui.bridge
+    from tui.event_bus import AgentDone
+    called: list[str] = []
+
+    async def fake_stream(spec, prompt, timeout, q, **kwargs):
+        called.append(spec.name)
+        await q.put(AgentDone(agent=spec.name, full_text="x = 1", exit_code=0))
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fake_stream)
+    app = AgentBureauApp(context_bytes=0)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        app.race_mode = True
+        app._prompt = "set x"
+        app.post_message(RaceWon(winner="codex", full_text="x = 1", elapsed=1.0, latency_saved=1.0))
+        await pilot.pause()
+        await pilot.press("r")
+        await pilot.pause()
+        assert app._race_winner is None
+        assert app._prompt == "set x"
+        assert called[:2] in (["claude", "codex"], ["codex", "claude"])
+
+
+# --- Partial output tests ---
+
+@pytest.mark.asyncio
+async def test_classification_uses_partial_transcript_on_timeout():
+    """A timed-out agent's partial transcript is classified and flagged as partial."""
+    app = AgentBureauApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        posted: list = []
+        app.post_message = posted.append
+        app._terminal_events = {
+            "claude": AgentDone(agent="claude", full_text="```python\nx = 1\n```", exit_code=0),
+            "codex": AgentTimeout(agent="codex", partial_text="```python\nx = 2\n```"),
+        }
+        app._run_classification()
+        done = posted[0]
+        assert isinstance(done, ClassificationDone)
+        assert done.partial == ("codex",)
+        assert done.full_texts["codex"] == "```python\nx = 2\n```"
+        assert [d.kind for d in done.disagreements] == ["code_differs"]
+
+
+@pytest.mark.asyncio
+async def test_classification_discards_partial_when_disabled():
+    """With continue_from_partial=False only completed answers are classified."""
+    app = AgentBureauApp(continue_from_partial=False)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        posted: list = []
+        app.post_message = posted.append
+        app._terminal_events = {
+            "claude": AgentDone(agent="claude", full_text="done", exit_code=0),
+            "codex": AgentError(agent="codex", message="m", exit_code=1, partial_text="half"),
+        }
+        app._run_classification()
+        assert posted[0].partial == ()
+        assert "codex" not in posted[0].full_texts
+
+
+# --- Quorum tests ---
+
+@pytest.mark.asyncio
+async def test_quorum_reached_classifies_early_and_waits_to_reconcile():
+    """QuorumReached classifies with the late agent's partial text but does not reconcile."""
+    from tui.session import QuorumPolicy
+    from tui.messages import QuorumReached
+    from tui.widgets.status_bar import StatusBar
+    app = AgentBureauApp(quorum=QuorumPolicy(quorum=1, grace=0.0))
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        app.session_state = SessionState.STREAMING
+        done = AgentDone(agent="claude", full_text="```python\nx = 1\n```", exit_code=0)
+        app.post_message(AgentFinished(agent="claude", event=done))
+        app.post_message(QuorumReached(
+            pending=("codex",), partial_texts={"codex": "```python\nx = 2\n```"},
+        ))
+        await pilot.pause()
+        assert app.session_state == SessionState.STREAMING
+        assert app._quorum_pending == {"codex"}
+        assert "disagreement" in app.query_one("#pane-left", AgentPane).classes
+        assert app._partial_agents == {"codex"}
+        status = app.query_one("#status-bar", StatusBar).status_text
+        assert status.startswith("claude done, codex still streaming (partial)")
+
+
+@pytest.mark.asyncio
+async def test_late_agent_without_reclassify_starts_reconciliation():
+    """With reclassify_late=False the late agent's finish goes straight to reconciling."""
+    from tui.session import QuorumPolicy
+    from tui.messages import QuorumReached
+    app = AgentBureauApp(quorum=QuorumPolicy(quorum=1, grace=0.0, reclassify_late=False))
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        started: list[str] = []
+        app._start_reconciliation = lambda: started.append("recon")
+        app.session_state = SessionState.STREAMING
+        done = AgentDone(agent="claude", full_text="a", exit_code=0)
+        app.post_message(AgentFinished(agent="claude", event=done))
+        app.post_message(QuorumReached(pending=("codex",), partial_texts={"codex": "b"}))
+        await pilot.pause()
+        assert started == []
+        late = AgentDone(agent="codex", full_text="b final", exit_code=0)
+        app.post_message(AgentFinished(agent="codex", event=late))
+        await pilot.pause()
+        assert started == ["recon"]
+        assert app._last_texts["codex"] == "b final"
+        assert app._partial_agents == set()
+
+
+# --- Delta reconcile rounds ---
+
+@pytest.mark.asyncio
+async def test_reconcile_again_sends_hunks_and_reassembles(monkeypatch):
+    """A repeated round prompts with the agreed code and the hunks, and rebuilds full proposals."""
+    import tui.bridge
+    from tui.apply import CodeProposal
+    from tui.event_bus import AgentDone, TokenChunk
+    from tui.messages import ReconciliationReady
+    prompts: dict[str, str] = {}
+
+    async def fake_stream(spec, prompt, timeout, q, **kwargs):
+        prompts[spec.name] = prompt
+        reply = "### Hunk 1\n```python\nvalue = 3\n```"
+        await q.put(TokenChunk(agent=spec.name, text=reply))
+        await q.put(AgentDone(agent=spec.name, full_text=reply, exit_code=0))
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fake_stream)
+    common = "\n".join(f"line_{i} = {i}" for i in range(50))
+    app = AgentBureauApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        app._recon_proposals = {
+            "claude": CodeProposal("python", f"{common}\nvalue = 1", "src/v.py"),
+            "codex": CodeProposal("python", f"{common}\nvalue = 2", "src/v.py"),
+        }
+        posted: list = []
+        app.post_message = posted.append
+        await app._run_reconciliation(delta=True)
+        assert prompts["claude"].count("line_0 = 0") == 1
+        assert "## Agreed code (src/v.py)" in prompts["claude"]
+        assert "- value = 2" in prompts["codex"]
+        assert app._recon_proposals["claude"].code == f"{common}\nvalue = 3"
+        assert app._recon_proposals["codex"].filename == "src/v.py"
+        ready = posted[-1]
+        assert isinstance(ready, ReconciliationReady)
+        assert ready.diff_text == ""
+
+
+@pytest.mark.asyncio
+async def test_auto_reconcile_runs_rounds_until_converged(monkeypatch):
+    """The loop keeps reconciling (delta rounds) until the proposals converge."""
+    import tui.bridge
+    from tui.event_bus import AgentDone, TokenChunk
+    from tui.messages import ReconcileRoundDone, ReconciliationReady
+    replies = {
+        "claude": ["```python\n# src/v.py\nvalue = 1\n```", "### Hunk 1\n```python\nvalue = 3\n```"],
+        "codex": ["```python\n# src/v.py\nvalue = 2\n```", "### Hunk 1\n```python\nvalue = 3\n```"],
+    }
+
+    async def fake_stream(spec, prompt, timeout, q, **kwargs):
+        reply = replies[spec.name].pop(0)
+        await q.put(TokenChunk(agent=spec.name, text=reply))
+        await q.put(AgentDone(agent=spec.name, full_text=reply, exit_code=0))
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fake_stream)
+    app = AgentBureauApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        posted: list = []
+        app.post_message = posted.append
+        await app._run_reconciliation()
+        rounds = [m for m in posted if isinstance(m, ReconcileRoundDone)]
+        assert [(r.round, r.stop_reason) for r in rounds] == [(1, None), (2, "converged")]
+        assert rounds[0].similarity == 0.0
+        assert isinstance(posted[-1], ReconciliationReady)
+        assert posted[-1].convergence.startswith("2 rounds, 100% similar")
+        assert app._recon_proposals["codex"].code == "value = 3"
+
+
+# --- Speculative merge ---
+
+@pytest.mark.asyncio
+async def test_y_uses_speculative_merge_started_on_review(monkeypatch):
+    """Entering review starts the merge; `y` then applies it without a second call."""
+    import tui.bridge
+    from tui.event_bus import AgentDone, TokenChunk
+    from tui.messages import ReconciliationReady
+    calls: list[str] = []
+
+    async def fake_stream(spec, prompt, timeout, q, **kwargs):
+        calls.append(kwargs["stage"])
+        merged = "```python\n# src/m.py\nmerged = True\n```"
+        await q.put(TokenChunk(agent=spec.name, text=merged))
+        await q.put(AgentDone(agent=spec.name, full_text=merged, exit_code=0))
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fake_stream)
+    app = AgentBureauApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        app._last_texts = {"claude": "a", "codex": "b"}
+        app.post_message(ReconciliationReady(diff_text="-a\n+b\n"))
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        assert calls == ["merge"]
+        await pilot.press("y")
+        await pilot.pause()
+        assert calls == ["merge"]
+        assert app.session_state == SessionState.CONFIRMING_APPLY
+        assert app._agreed_filename == "src/m.py"
+
+
+@pytest.mark.asyncio
+async def test_accepting_one_side_cancels_speculative_merge(monkeypatch):
+    """Pressing c while the speculative merge is still running cancels it."""
+    import tui.bridge
+    from tui.messages import ReconciliationReady
+    cancelled = asyncio.Event()
+
+    async def fake_stream(spec, prompt, timeout, q, **kwargs):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fake_stream)
+    app = AgentBureauApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        app._last_texts = {"claude": "a", "codex": "b"}
+        app.post_message(ReconciliationReady(diff_text="-a\n+b\n"))
+        await pilot.pause()
+        worker = app._speculative_merge
+        assert worker is not None
+        await pilot.press("c")
+        await pilot.pause()
+        await asyncio.wait_for(cancelled.wait(), timeout=2.0)
+        assert app._speculative_merge is None
+        assert worker.is_cancelled
+
+
+# --- Local merge ---
+
+@pytest.mark.asyncio
+async def test_merge_is_local_when_proposals_do_not_conflict(monkeypatch, tmp_path):
+    """Non-overlapping changes to the file on disk merge without any agent call."""
+    import tui.bridge
+    from tui.apply import CodeProposal
+    calls: list[str] = []
+
+    async def fake_stream(spec, prompt, timeout, q, **kwargs):
+        calls.append(kwargs["stage"])
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fake_stream)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "m.py").write_text("a = 1\nb = 1\nc = 1\nd = 1\n")
+    app = AgentBureauApp(speculative_merge=False)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        app._recon_proposals = {
+            "claude": CodeProposal("python", "a = 2\nb = 1\nc = 1\nd = 1", "m.py"),
+            "codex": CodeProposal("python", "a = 1\nb = 1\nc = 1\nd = 2", "m.py"),
+        }
+        merged = await app._merge_proposals()
+        assert calls == []
+        assert "2 change(s) auto-merged" in merged
+        assert "a = 2\nb = 1\nc = 1\nd = 2" in merged
+
+
+# --- Per-hunk picking ---
+
+@pytest.mark.asyncio
+async def test_pick_per_hunk_assembles_mixed_answer():
+    """h, then x on the second hunk and a, applies Claude's code with Codex's one fix."""
+    from tui.apply import CodeProposal
+    app = AgentBureauApp(speculative_merge=False)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        app._recon_proposals = {
+            "claude": CodeProposal("python", "a = 1\nkeep\nb = 1", "src/h.py"),
+            "codex": CodeProposal("python", "a = 2\nkeep\nb = 2", "src/h.py"),
+        }
+        app.post_message(ReconciliationReady(diff_text="-a\n+b\n"))
+        await pilot.pause()
+        await pilot.press("h")
+        assert len(app._hunks) == 2
+        await pilot.press("j", "x", "a")
+        await pilot.pause()
+        assert app.session_state == SessionState.CONFIRMING_APPLY
+        assert app._agreed_code == "a = 1\nkeep\nb = 2"
+        assert app._agreed_filename == "src/h.py"
+
+
+# --- Repository context ---
+
+@pytest.mark.asyncio
+async def test_prompt_environment_includes_relevant_file_excerpts(tmp_path):
+    """With the index built, the Environment section carries the best-matching file."""
+    from tui.messages import ContextRetrieved
+    (tmp_path / "billing.py").write_text("def compute_invoice_total(items):\n    return 0\n")
+    app = AgentBureauApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        posted: list = []
+        app.post_message = posted.append
+        prompt = await app._with_env_context("fix the invoice total")
+        assert prompt.startswith("## Environment\n")
+        assert "Relevant files:\nbilling.py (line 1):" in prompt
+        assert prompt.endswith("## Task\nfix the invoice total")
+        assert isinstance(posted[0], ContextRetrieved)
+        assert posted[0].files == 1
+
+
+@pytest.mark.asyncio
+async def test_file_changes_update_index_incrementally(tmp_path):
+    """A watcher batch re-indexes just the changed files."""
+    app = AgentBureauApp(watch_files=False)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        (tmp_path / "shipping.py").write_text("def shipping_label():\n    pass\n")
+        app._on_files_changed({"shipping.py"})
+        assert app._repo_index.query("shipping label")[0].path == "shipping.py"
+
+
+# --- Session journal ---
+
+@pytest.mark.asyncio
+async def test_session_stages_are_journaled(monkeypatch, tmp_path):
+    """Prompt, both streams, classification and each reconcile round land in sessions.jsonl."""
+    import tui.bridge
+    from tui.event_bus import AgentDone, TokenChunk
+    from tui.journal import read_journal
+
+    async def fake_stream(spec, prompt, timeout, q, **kwargs):
+        reply = "```python\n# src/v.py\nvalue = 1\n```"
+        await q.put(TokenChunk(agent=spec.name, text=reply))
+        await q.put(AgentDone(agent=spec.name, full_text=reply, exit_code=0))
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fake_stream)
+    app = AgentBureauApp(speculative_merge=False, context_bytes=0)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        app._start_session("set value")
+        for _ in range(100):
+            if app.session_state == SessionState.REVIEWING:
+                break
+            await pilot.pause(0.02)
+        assert app._journal.flush()
+        records = [
+            r for r in read_journal(tmp_path / ".disagree" / "sessions.jsonl")
+            if r["stage"] != "checkpoint"
+        ]
+        assert [r["stage"] for r in records] == [
+            "prompt", "stream", "stream", "classification", "reconcile_round",
+        ]
+        assert {r["session"] for r in records} == {app._session_id}
+        assert records[1]["elapsed"] >= records[1]["ttft"] >= 0
+        classification = records[3]
+        assert classification["prompt"] == "set value"
+        assert classification["agent_a"]["name"] == "claude"
+        assert records[4]["proposals"]["codex"] == {
+            "language": "python", "filename": "src/v.py", "code": "value = 1",
+        }
+
+
+# --- Checkpoints and resume ---
+
+@pytest.mark.asyncio
+async def test_checkpoints_record_streamed_lines_and_state(tmp_path):
+    """Streamed lines are checkpointed as deltas alongside the session state."""
+    from tui.journal import load_checkpoint
+    app = AgentBureauApp(context_bytes=0, checkpoint_interval=0)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        app._session_id = "s1"
+        app._prompt = "set value"
+        app.session_state = SessionState.STREAMING
+        app.post_message(TokenReceived(agent="claude", text="first"))
+        app.post_message(TokenReceived(agent="codex", text="other"))
+        await pilot.pause()
+        app._checkpoint()
+        app.post_message(TokenReceived(agent="claude", text="second"))
+        await pilot.pause()
+        app._checkpoint()
+        assert app._journal.flush()
+        checkpoint = load_checkpoint(tmp_path / ".disagree" / "sessions.jsonl")
+        assert checkpoint.session == "s1"
+        assert checkpoint.state == "STREAMING"
+        assert checkpoint.lines == {"claude": ["first", "second"], "codex": ["other"]}
+
+
+@pytest.mark.asyncio
+async def test_resume_interrupted_stream_opens_review_without_agents(monkeypatch):
+    """--resume rebuilds panes, texts and proposals, and goes to review with no agent call."""
+    import tui.bridge
+    from tui.journal import Checkpoint
+    from tui.widgets.review_bar import ReviewBar
+
+    async def fail_stream(*args, **kwargs):
+        raise AssertionError("agents must not be called on resume")
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fail_stream)
+    checkpoint = Checkpoint(
+        session="s1", state="STREAMING", prompt="set value",
+        lines={"claude": ["```python", "# src/v.py", "value = 1", "```"], "codex": ["value ="]},
+        finished=["claude"],
+    )
+    app = AgentBureauApp(context_bytes=0, resume=checkpoint)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        assert app.session_state == SessionState.REVIEWING
+        assert app._session_id == "s1"
+        assert app._partial_agents == {"codex"}
+        assert app._recon_proposals["claude"].filename == "src/v.py"
+        assert app._recon_proposals["codex"] is None
+        assert app._last_texts["codex"] == "value ="
+        assert app.query_one("#pane-left", AgentPane).line_count == 5
+        assert app.query_one("#review-bar", ReviewBar).display
+
+
+@pytest.mark.asyncio
+async def test_resume_during_review_keeps_diff_and_proposals():
+    """A session checkpointed in review comes back with its diff and proposals."""
+    from tui.journal import Checkpoint
+    checkpoint = Checkpoint(
+        session="s2", state="REVIEWING", prompt="p",
+        last_texts={"claude": "a", "codex": "b"},
+        proposals={"claude": {"language": "python", "code": "x = 1", "filename": "v.py"}},
+        diff="--- claude-recon\n+++ codex-recon\n", convergence="1 round",
+    )
+    app = AgentBureauApp(context_bytes=0, resume=checkpoint)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        assert app._review_diff == checkpoint.diff
+        assert app._recon_proposals["claude"].code == "x = 1"
+        assert app._last_texts == {"claude": "a", "codex": "b"}
+
+
+@pytest.mark.asyncio
+async def test_ctrl_o_opens_history():
+    """ctrl+o pushes the history browser."""
+    from tui.widgets.history_screen import HistoryScreen
+    app = AgentBureauApp(context_bytes=0)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        await pilot.press("ctrl+o")
+        await pilot.pause()
+        assert isinstance(app.screen, HistoryScreen)
+
+
+# --- Reusing past solutions ---
+
+@pytest.mark.asyncio
+async def test_applied_solution_is_offered_and_reused_for_near_duplicate(monkeypatch):
+    """A near-duplicate prompt offers the applied solution; u stops the agents and reviews it."""
+    import tui.bridge
+    from tui.similarity import Solution
+    cancelled = asyncio.Event()
+
+    async def slow_stream(spec, prompt, timeout, q, **kwargs):
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", slow_stream)
+    app = AgentBureauApp(context_bytes=0, speculative_merge=False)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        app._solutions.add(Solution(
+            prompt="add retry with backoff to the http client", env=app._env_fingerprint,
+            code="def retry():\n    pass", language="python", filename="src/net.py",
+        ))
+        app._start_session("add retry with backoff to the http client please")
+        await pilot.pause()
+        assert app._reuse is not None
+        await pilot.press("u")
+        await asyncio.wait_for(cancelled.wait(), timeout=2.0)
+        await pilot.pause()
+        assert app.session_state == SessionState.REVIEWING
+        assert app._recon_proposals["codex"].filename == "src/net.py"
+        await pilot.press("c")
+        await pilot.pause()
+        assert app._agreed_code == "def retry():\n    pass"
+
+
+@pytest.mark.asyncio
+async def test_confirmed_apply_records_solution():
+    """Applying an answer adds it to the solution index."""
+    app = AgentBureauApp(context_bytes=0)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+        app._prompt = "write the config loader"
+        app._agreed_code = "load = 1"
+        app.post_message(ApplyResult(confirmed=True, files_written=["cfg.py"]))
+        await pilot.pause()
+        match = app._solutions.find("write the config loader", app._env_fingerprint)
+        assert match.solution.code == "load = 1"
+
+
+def test_main_dispatches_stats_subcommand(tmp_path, capsys):
+    """`agent-bureau stats` prints the journal report instead of starting the TUI."""
+    import json
+    from tui.app import main
+    journal = tmp_path / "sessions.jsonl"
+    journal.write_text('{"session": "s", "stage": "prompt", "prompt": "p"}\n')
+    with pytest.raises(SystemExit) as exit_info:
+        main(["stats", "--json", "--journal", str(journal)])
+    assert exit_info.value.code == 0
+    assert json.loads(capsys.readouterr().out)["sessions"] == 1
+
+
+
+def test_main_waits_for_both_agents_unless_a_quorum_is_given(monkeypatch):
+    """Early classification is opt-in: only --quorum lowers the default of both agents."""
+    from tui.app import main
+    apps: list[AgentBureauApp] = []
+    monkeypatch.setattr(AgentBureauApp, "run", lambda self: apps.append(self))
+    main(["--context-bytes", "0"])
+    main(["--context-bytes", "0", "--quorum", "1", "--grace", "2.5"])
+    assert apps[0].quorum.quorum == 2
+    assert (apps[1].quorum.quorum, apps[1].quorum.grace) == (1, 2.5)
+
+# --- Daemon-backed sessions ---
+
+@pytest.fixture
+def daemon_agents(monkeypatch):
+    """Fake agents for the daemon: both answer with the same code once `release` is set."""
+    import tui.bridge
+    from tui.event_bus import TokenChunk
+    release = asyncio.Event()
+
+    async def fake_stream(spec, prompt, timeout, q, **kwargs):
+        await q.put(TokenChunk(agent=spec.name, text=f"{spec.name} thinking"))
+        await release.wait()
+        reply = "```python\n# calc.py\nx = 1\n```"
+        await q.put(AgentDone(agent=spec.name, full_text=reply, exit_code=0))
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fake_stream)
+    return release
+
+
+@pytest.fixture
+async def daemon():
+    """A BridgeDaemon on a short temporary socket path, on the test's event loop."""
+    import shutil
+    import tempfile
+    from pathlib import Path
+    from tui.daemon import BridgeDaemon, SessionHub
+    directory = tempfile.mkdtemp(prefix="ab-")
+    bridge = BridgeDaemon(SessionHub(), Path(directory) / "bureau.sock")
+    await bridge.start()
+    yield bridge
+    await bridge.close()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+async def _wait_for(pilot, condition) -> None:
+    for _ in range(200):
+        if condition():
+            return
+        await pilot.pause(0.02)
+    raise AssertionError("condition not reached")
+
+
+@pytest.mark.asyncio
+async def test_daemon_session_streams_into_panes_and_opens_review(daemon, daemon_agents):
+    """With daemon_socket the prompt runs in the daemon and its result is reviewed here."""
+    daemon_agents.set()
+    app = AgentBureauApp(daemon_socket=daemon.path, context_bytes=0, watch_files=False)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        app._start_session("set x")
+        await _wait_for(pilot, lambda: app.session_state == SessionState.REVIEWING)
+        assert daemon.hub.get(app._session_id) is not None
+        assert app._recon_proposals["claude"].filename == "calc.py"
+        assert app.query_one("#pane-left", AgentPane).line_count > 0
+        assert app._convergence.startswith("1 round, 100% similar")
+
+
+@pytest.mark.asyncio
+async def test_quitting_leaves_daemon_session_running_and_attach_resumes_it(daemon, daemon_agents):
+    """Closing the app only drops the connection; --attach replays and finishes the session."""
+    first = AgentBureauApp(daemon_socket=daemon.path, context_bytes=0, watch_files=False)
+    async with first.run_test(size=(120, 40)) as pilot:
+        await pilot.pause()
+        first._start_session("set x")
+        await _wait_for(pilot, lambda: first._remote_running)
+    session = first.detached_session
+    assert session is not None and not daemon.hub.get(session).finished
+
+    daemon_agents.set()
+    second = AgentBureauApp(
+        daemon_socket=daemon.path, attach=session, context_bytes=0, watch_files=False
+    )
+    async with second.run_test(size=(120, 40)) as pilot:
+        await _wait_for(pilot, lambda: second.session_state == SessionState.REVIEWING)
+        assert second._session_id == session
+        assert second._prompt == "set x"
+        assert second._recon_proposals["codex"].code == "x = 1"
+    assert second.detached_session is None
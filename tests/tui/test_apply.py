@@ -2,7 +2,15 @@
 import pytest
 from pathlib import Path
 
-from tui.apply import CodeProposal, extract_code_proposals, generate_unified_diff, write_file_atomic
+from tui.apply import (
+    CodeProposal,
+    apply_hunks,
+    diff_hunks,
+    extract_code_proposals,
+    generate_unified_diff,
+    similarity_ratio,
+    write_file_atomic,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -128,6 +136,57 @@ def test_generate_diff_custom_fromfile():
     assert "--- agent_claude" in diff
 
 
+# ---------------------------------------------------------------------------
+# diff_hunks / apply_hunks
+# ---------------------------------------------------------------------------
+
+
+def test_diff_hunks_identical_is_empty():
+    # Arrange
+    code = "a\nb\nc"
+
+    # Act
+    hunks = diff_hunks(code, code)
+
+    # Assert
+    assert hunks == []
+
+
+def test_diff_hunks_reports_only_differing_lines():
+    # Arrange
+    a_code = "one\ntwo\nthree\nfour"
+    b_code = "one\nTWO\nthree\nfour\nfive"
+
+    # Act
+    hunks = diff_hunks(a_code, b_code)
+
+    # Assert
+    assert [(h.a_lines, h.b_lines) for h in hunks] == [(("two",), ("TWO",)), ((), ("five",))]
+    assert (hunks[0].a_start, hunks[0].a_end) == (1, 2)
+
+
+def test_apply_hunks_rebuilds_either_side():
+    # Arrange
+    a_code = "one\ntwo\nthree\nfour"
+    b_code = "zero\none\nTWO\nthree"
+    hunks = diff_hunks(a_code, b_code)
+
+    # Act
+    as_a = apply_hunks(a_code, hunks, {})
+    as_b = apply_hunks(a_code, hunks, {i: h.b_lines for i, h in enumerate(hunks)})
+
+    # Assert
+    assert as_a == a_code
+    assert as_b == b_code
+
+
+def test_similarity_ratio_bounds():
+    # Act / Assert
+    assert similarity_ratio("a\nb", "a\nb\n") == 1.0
+    assert similarity_ratio("a\nb", "c\nd") == 0.0
+    assert 0.0 < similarity_ratio("a\nb\nc", "a\nb\nd") < 1.0
+
+
 # ---------------------------------------------------------------------------
 # write_file_atomic
 # ---------------------------------------------------------------------------
@@ -0,0 +1,170 @@
+"""Tests for batch.py — headless prompt runs with a global agent concurrency limit."""
+import asyncio
+import io
+import json
+
+import pytest
+
+import tui.bridge
+from tui.batch import BatchItem, HeadlessOptions, HeadlessRunner, main, read_prompts, run_main
+from tui.event_bus import AgentDone, AgentTimeout, TokenChunk
+from tui.journal import SessionJournal, read_journal
+from tui.session import ConvergencePolicy
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """Keep the latency history the runner saves out of the repository."""
+    monkeypatch.chdir(tmp_path)
+
+
+def _answer(code):
+    return f"Here you go.\n```python\n# calc.py\n{code}\n```"
+
+
+def _fake_agents(monkeypatch, replies, delay=0.0):
+    """Replace the bridge: each agent streams replies[agent] (a reply per call, last repeats)."""
+    calls = {"claude": 0, "codex": 0}
+    peak = {"now": 0, "max": 0}
+
+    async def fake_stream(spec, prompt, timeout, q, **kwargs):
+        peak["now"] += 1
+        peak["max"] = max(peak["max"], peak["now"])
+        try:
+            await asyncio.sleep(delay)
+            options = replies[spec.name]
+            reply = options[min(calls[spec.name], len(options) - 1)]
+            calls[spec.name] += 1
+            if reply is None:
+                await q.put(AgentTimeout(agent=spec.name))
+                return
+            for line in reply.splitlines():
+                await q.put(TokenChunk(agent=spec.name, text=line))
+            await q.put(AgentDone(agent=spec.name, full_text=reply, exit_code=0))
+        finally:
+            peak["now"] -= 1
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fake_stream)
+    return calls, peak
+
+
+def test_read_prompts_accepts_objects_and_strings():
+    # Arrange
+    lines = ['{"id": "add", "prompt": "write add"}\n', "\n", '"write sub"\n']
+
+    # Act
+    items = read_prompts(lines)
+
+    # Assert
+    assert items == [BatchItem("add", "write add"), BatchItem("3", "write sub")]
+
+
+def test_read_prompts_rejects_lines_without_a_prompt():
+    with pytest.raises(ValueError, match="line 1"):
+        read_prompts(['{"id": 1}\n'])
+
+
+async def test_run_classifies_reconciles_and_applies_to_scratch_dir(monkeypatch, tmp_path):
+    # Arrange
+    _fake_agents(monkeypatch, {
+        "claude": [_answer("x = 1"), _answer("x = 2")],
+        "codex": [_answer("x = 3"), _answer("x = 2")],
+    })
+    runner = HeadlessRunner(HeadlessOptions(convergence=ConvergencePolicy(max_rounds=3)))
+
+    # Act
+    result = await runner.run(BatchItem("p1", "set x"), apply_dir=tmp_path / "out")
+
+    # Assert
+    assert result["status"] == {"claude": "done", "codex": "done"}
+    assert [d["kind"] for d in result["disagreements"]] == ["code_differs"]
+    assert result["rounds"] == 1 and result["stop_reason"] == "converged"
+    assert result["source"] == "merge"
+    assert (tmp_path / "out" / "p1" / "calc.py").read_text() == "x = 2"
+
+
+async def test_run_reconciles_partial_transcript_of_timed_out_agent(monkeypatch):
+    # Arrange
+    calls, _ = _fake_agents(monkeypatch, {
+        "claude": [_answer("x = 1")],
+        "codex": [None],
+    })
+    runner = HeadlessRunner(HeadlessOptions(convergence=ConvergencePolicy(max_rounds=1)))
+
+    # Act
+    result = await runner.run(BatchItem("p1", "set x"))
+
+    # Assert
+    assert result["status"]["codex"] == "timeout"
+    assert result["rounds"] == 0 and result["stop_reason"] == "single answer"
+    assert result["proposals"]["claude"]["code"] == "x = 1"
+    assert calls == {"claude": 1, "codex": 1}
+
+
+async def test_run_all_bounds_agent_concurrency_and_streams_one_line_per_prompt(monkeypatch):
+    # Arrange
+    _, peak = _fake_agents(monkeypatch, {
+        "claude": [_answer("x = 1")], "codex": [_answer("x = 1")],
+    }, delay=0.01)
+    runner = HeadlessRunner(concurrency=3)
+    items = [BatchItem(str(i), f"prompt {i}") for i in range(6)]
+    out = io.StringIO()
+
+    # Act
+    failures = await runner.run_all(items, out)
+
+    # Assert
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert failures == 0
+    assert sorted(r["id"] for r in results) == [str(i) for i in range(6)]
+    assert peak["max"] == 3
+
+
+async def test_journal_receives_app_shaped_stage_records(monkeypatch, tmp_path):
+    # Arrange
+    _fake_agents(monkeypatch, {"claude": [_answer("x = 1")], "codex": [_answer("x = 1")]})
+    journal = SessionJournal(tmp_path / "sessions.jsonl", flush_interval=0.01)
+    runner = HeadlessRunner(journal=journal)
+
+    # Act
+    await runner.run(BatchItem("p1", "set x"))
+    journal.flush()
+    journal.close()
+
+    # Assert
+    stages = [r["stage"] for r in read_journal(tmp_path / "sessions.jsonl")]
+    assert stages == ["prompt", "stream", "stream", "classification", "reconcile_round"]
+
+
+def test_main_writes_ndjson_results(monkeypatch, tmp_path, capsys):
+    # Arrange
+    _fake_agents(monkeypatch, {"claude": [_answer("x = 1")], "codex": [_answer("x = 1")]})
+    prompts = tmp_path / "prompts.jsonl"
+    prompts.write_text('{"id": "a", "prompt": "set x"}\n')
+
+    # Act
+    code = main([str(prompts), "--concurrency", "2"])
+
+    # Assert
+    result = json.loads(capsys.readouterr().out)
+    assert code == 0
+    assert result["id"] == "a" and result["similarity"] == 1.0
+
+
+def test_run_main_json_streams_every_event_then_the_result(monkeypatch, capsys):
+    # Arrange
+    _fake_agents(monkeypatch, {"claude": [_answer("x = 1")], "codex": [_answer("x = 2")]})
+
+    # Act
+    code = run_main(["set x", "--json", "--max-rounds", "1"])
+
+    # Assert
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    types = [r["type"] for r in records]
+    assert code == 0
+    stream_done = [i for i, r in enumerate(records) if r["type"] == "done" and r["phase"] == "stream"]
+    assert len(stream_done) == 2 and types.index("classification") > max(stream_done)
+    assert types[-2:] == ["reconcile_round", "result"]
+    first = records[0]
+    assert first["type"] == "token" and first["phase"] == "stream" and first["agent"] in ("claude", "codex")
+    assert {r["phase"] for r in records if r["type"] == "done"} == {"stream", "reconcile"}
@@ -0,0 +1,72 @@
+"""Tests for blobs.py — the content-addressed, chunked text store."""
+import random
+
+from tui.blobs import BlobStore, chunk_text, externalize, resolve
+
+
+def _source(lines=2000, seed=1):
+    rng = random.Random(seed)
+    return "".join(f"value_{i} = {rng.randrange(10**6)}\n" for i in range(lines))
+
+
+def test_chunks_concatenate_back_to_text():
+    # Arrange
+    text = _source() + "x" * 200_000 + "\ntail"
+
+    # Act
+    chunks = chunk_text(text)
+
+    # Assert
+    assert "".join(chunks) == text
+    assert len(chunks) > 10
+    assert max(len(c) for c in chunks) <= 64 * 1024
+
+
+def test_put_and_get_round_trip(tmp_path):
+    # Arrange
+    store = BlobStore(tmp_path)
+    text = _source(100) + "ünïcode"
+
+    # Act
+    digest = store.put(text)
+
+    # Assert
+    assert digest in store
+    assert store.get(digest) == text
+    assert store.get("0" * 64) is None
+
+
+def test_small_edit_stores_only_the_changed_chunks(tmp_path):
+    # Arrange
+    store = BlobStore(tmp_path)
+    original = _source()
+    store.put(original)
+    first = store.disk_usage()
+    lines = original.splitlines(keepends=True)
+    lines[1000] = "value_1000 = 'edited'\n"
+
+    # Act
+    store.put(original)
+    unchanged = store.disk_usage()
+    store.put("".join(lines))
+    edited = store.disk_usage()
+
+    # Assert
+    assert unchanged == first
+    assert edited - first < first / 10
+
+
+def test_externalize_and_resolve_long_strings(tmp_path):
+    # Arrange
+    store = BlobStore(tmp_path)
+    record = {"stage": "stream", "text": "a" * 600, "nested": {"code": ["b" * 600, "short"]}}
+
+    # Act
+    stored = externalize(record, store, min_size=512)
+
+    # Assert
+    assert stored["stage"] == "stream"
+    assert set(stored["text"]) == {"$blob"}
+    assert stored["nested"]["code"][1] == "short"
+    assert resolve(stored, store) == record
+    assert resolve({"text": {"$blob": "f" * 64}}, store) == {"text": ""}
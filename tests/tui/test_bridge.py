@@ -188,6 +188,25 @@ async def test_agent_spec_build_argv():
     ]
 
 
+async def test_agent_spec_build_argv_for_stdin_and_file_transports():
+    """Non-argv transports keep the prompt off the command line."""
+    # Arrange
+    stdin_spec = AgentSpec(
+        name="codex", command="codex", args=("exec",),
+        system_prompt="SYS", prompt_transport="stdin", prompt_args=("-",),
+    )
+    file_spec = AgentSpec(
+        name="x", command="x", prompt_transport="file", prompt_args=("--prompt-file", "{path}"),
+    )
+    bare_file_spec = AgentSpec(name="y", command="y", prompt_transport="file")
+
+    # Act / Assert
+    assert stdin_spec.build_argv("fix bug") == ["codex", "exec", "-"]
+    assert stdin_spec.build_input("fix bug") == "SYS\n\n---\n\nfix bug"
+    assert file_spec.build_argv("p", "/tmp/p.md") == ["x", "--prompt-file", "/tmp/p.md"]
+    assert bare_file_spec.build_argv("p", "/tmp/p.md") == ["y", "/tmp/p.md"]
+
+
 async def test_both_error_still_two_terminal_events():
     """Both agents failing still produces exactly 2 terminal events."""
     # Arrange
@@ -201,3 +220,403 @@ async def test_both_error_still_two_terminal_events():
     terminal = [e for e in events if e.type in ("done", "error", "timeout")]
     assert len(terminal) == 2
     assert all(e.type == "error" for e in terminal)
+
+
+# ---------------------------------------------------------------------------
+# Race mode (real subprocesses via the PIPE path)
+# ---------------------------------------------------------------------------
+
+
+def _python_agent(name: str, script: str) -> AgentSpec:
+    """AgentSpec running an inline Python script; the prompt arrives as argv[1]."""
+    import sys
+
+    return AgentSpec(name=name, command=sys.executable, args=("-c", script))
+
+
+_CODE_ANSWER = "print('```python'); print('x = 1'); print('```')"
+
+
+async def test_race_first_code_answer_wins_and_cancels_others():
+    """The first AgentDone containing a fenced block wins; slower agents are cancelled."""
+    from tui.bridge import run_race
+
+    # Arrange
+    fast = _python_agent("fast", _CODE_ANSWER)
+    slow = _python_agent("slow", "import time; time.sleep(30); " + _CODE_ANSWER)
+
+    # Act
+    result = await run_race("prompt", (fast, slow), timeout=10.0, use_pty=False)
+
+    # Assert
+    assert result.winner == "fast"
+    assert result.cancelled == ("slow",)
+    assert result.elapsed < 10.0
+    assert "x = 1" in result.winner_event.full_text
+
+
+async def test_race_answer_without_code_does_not_win():
+    """A successful answer with no fenced code block does not end the race."""
+    from tui.bridge import run_race
+
+    # Arrange
+    prose = _python_agent("prose", "print('just words')")
+    coder = _python_agent("coder", "import time; time.sleep(0.2); " + _CODE_ANSWER)
+    seen: list[BridgeEvent] = []
+
+    # Act
+    result = await run_race(
+        "prompt", (prose, coder), timeout=10.0, use_pty=False, on_event=seen.append
+    )
+
+    # Assert
+    assert result.winner == "coder"
+    assert result.cancelled == ()
+    assert seen == result.events
+
+
+async def test_race_without_winner_waits_for_all_terminal_events():
+    """When no agent qualifies, every agent's terminal event is collected."""
+    from tui.bridge import run_race
+
+    # Arrange
+    failing = _python_agent("failing", "raise SystemExit(3)")
+    prose = _python_agent("prose", "print('no code here')")
+
+    # Act
+    result = await run_race("prompt", (failing, prose), timeout=10.0, use_pty=False)
+
+    # Assert
+    assert result.winner is None
+    assert result.winner_event is None
+    terminal = {e.agent: e.type for e in result.events if e.type != "token"}
+    assert terminal == {"failing": "error", "prose": "done"}
+
+
+# ---------------------------------------------------------------------------
+# Hedged requests (fake stream coroutine, no subprocess)
+# ---------------------------------------------------------------------------
+
+
+def _fake_stream(script: list[tuple[float, list[str], str]]):
+    """Build a stream coroutine whose Nth invocation follows script[N].
+
+    Each entry is (delay before first line, lines, terminal type).
+    """
+    calls = {"n": 0}
+
+    async def _stream(spec, prompt, timeout, q, idle_timeout=None):
+        calls["idle_timeout"] = idle_timeout
+        delay, lines, terminal = script[calls["n"]]
+        calls["n"] += 1
+        await asyncio.sleep(delay)
+        for line in lines:
+            await q.put(TokenChunk(agent=spec.name, text=line))
+        if terminal == "done":
+            await q.put(AgentDone(agent=spec.name, full_text="\n".join(lines), exit_code=0))
+        else:
+            await q.put(AgentError(agent=spec.name, message="boom", exit_code=1))
+
+    _stream.calls = calls
+    return _stream
+
+
+def _warm_history(seconds: float):
+    from tui.stats import LatencyHistory
+
+    history = LatencyHistory(min_samples=3)
+    for _ in range(3):
+        history.record("claude", "stream.ttft", seconds)
+    return history
+
+
+async def _collect(coro, q: asyncio.Queue) -> list[BridgeEvent]:
+    await coro
+    events = []
+    while not q.empty():
+        events.append(q.get_nowait())
+    return events
+
+
+async def test_hedge_starts_duplicate_and_fast_copy_wins():
+    """A stalled first invocation is hedged; only the duplicate's events are forwarded."""
+    from tui.bridge import HedgeBudget, _stream_hedged
+
+    # Arrange — original stalls for 5s, the hedge answers immediately
+    stream = _fake_stream([(5.0, ["slow"], "done"), (0.0, ["fast 1", "fast 2"], "done")])
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+    spec = AgentSpec(name="claude", command="claude")
+
+    # Act
+    events = await asyncio.wait_for(_collect(_stream_hedged(
+        spec, "p", 30.0, q,
+        history=_warm_history(0.05), budget=HedgeBudget(ratio=1.0), stream=stream,
+    ), q), timeout=3.0)
+
+    # Assert
+    assert stream.calls["n"] == 2
+    assert [e.text for e in events if e.type == "token"] == ["fast 1", "fast 2"]
+    assert [e.type for e in events if e.type != "token"] == ["done"]
+
+
+async def test_hedge_takes_its_own_concurrency_slot():
+    """A hedge holds a slot of the caller's limit while it runs and gives it back."""
+    from tui.bridge import HedgeBudget, _stream_hedged
+
+    # Arrange — two slots, one held by the caller for the original invocation
+    stream = _fake_stream([(5.0, ["slow"], "done"), (0.0, ["fast"], "done")])
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+    spec = AgentSpec(name="claude", command="claude")
+    slots = asyncio.Semaphore(2)
+    await slots.acquire()
+
+    # Act
+    events = await asyncio.wait_for(_collect(_stream_hedged(
+        spec, "p", 30.0, q, history=_warm_history(0.05), budget=HedgeBudget(ratio=1.0),
+        stream=stream, slots=slots,
+    ), q), timeout=3.0)
+
+    # Assert
+    assert stream.calls["n"] == 2
+    assert [e.text for e in events if e.type == "token"] == ["fast"]
+    assert not slots.locked()
+
+
+async def test_no_hedge_when_concurrency_slots_are_full():
+    """With every slot taken the original invocation is awaited as-is, never doubled."""
+    from tui.bridge import HedgeBudget, _stream_hedged
+
+    # Arrange
+    stream = _fake_stream([(0.2, ["only"], "done"), (0.0, ["hedge"], "done")])
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+    spec = AgentSpec(name="claude", command="claude")
+    slots = asyncio.Semaphore(1)
+    await slots.acquire()
+
+    # Act
+    events = await _collect(_stream_hedged(
+        spec, "p", 30.0, q, history=_warm_history(0.01), budget=HedgeBudget(ratio=1.0),
+        stream=stream, slots=slots,
+    ), q)
+
+    # Assert
+    assert stream.calls["n"] == 1
+    assert [e.type for e in events] == ["token", "done"]
+
+
+async def test_no_hedge_when_budget_exhausted():
+    """With no hedge credits the original invocation is awaited as-is."""
+    from tui.bridge import HedgeBudget, _stream_hedged
+
+    # Arrange
+    stream = _fake_stream([(0.2, ["only"], "done")])
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+    spec = AgentSpec(name="claude", command="claude")
+
+    # Act
+    events = await _collect(_stream_hedged(
+        spec, "p", 30.0, q,
+        history=_warm_history(0.01), budget=HedgeBudget(ratio=0.0), stream=stream,
+    ), q)
+
+    # Assert
+    assert stream.calls["n"] == 1
+    assert [e.type for e in events] == ["token", "done"]
+
+
+async def test_no_hedge_with_cold_history_and_ttft_recorded():
+    """Cold history never hedges; the observed TTFT is recorded for next time."""
+    from tui.bridge import HedgeBudget, _stream_hedged
+    from tui.stats import LatencyHistory
+
+    # Arrange
+    stream = _fake_stream([(0.05, ["hi"], "done")])
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+    history = LatencyHistory()
+    spec = AgentSpec(name="claude", command="claude")
+
+    # Act
+    await _stream_hedged(
+        spec, "p", 30.0, q, history=history, budget=HedgeBudget(ratio=1.0), stream=stream
+    )
+
+    # Assert — TTFT, total latency and largest token gap are all recorded
+    assert stream.calls["n"] == 1
+    assert len(history.samples("claude", "stream.ttft")) == 1
+    assert len(history.samples("claude", "stream")) == 1
+    assert len(history.samples("claude", "stream.gap")) == 1
+    assert stream.calls["idle_timeout"] is None
+
+
+async def test_hedge_survives_failure_of_one_copy():
+    """If the duplicate errors, the original can still win."""
+    from tui.bridge import HedgeBudget, _stream_hedged
+
+    # Arrange — original is late but succeeds; the hedge fails immediately
+    stream = _fake_stream([(0.3, ["late"], "done"), (0.0, [], "error")])
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+    spec = AgentSpec(name="claude", command="claude")
+
+    # Act
+    events = await _collect(_stream_hedged(
+        spec, "p", 30.0, q,
+        history=_warm_history(0.05), budget=HedgeBudget(ratio=1.0), stream=stream,
+    ), q)
+
+    # Assert
+    assert [e.type for e in events] == ["token", "done"]
+
+
+async def test_primary_failure_without_hedge_is_forwarded():
+    """A fast failure before the hedge deadline is final — no duplicate started."""
+    from tui.bridge import HedgeBudget, _stream_hedged
+
+    # Arrange
+    stream = _fake_stream([(0.0, [], "error")])
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+    spec = AgentSpec(name="claude", command="claude")
+
+    # Act
+    events = await asyncio.wait_for(_collect(_stream_hedged(
+        spec, "p", 30.0, q,
+        history=_warm_history(1.0), budget=HedgeBudget(ratio=1.0), stream=stream,
+    ), q), timeout=3.0)
+
+    # Assert
+    assert stream.calls["n"] == 1
+    assert [e.type for e in events] == ["error"]
+
+
+# ---------------------------------------------------------------------------
+# Adaptive and inactivity timeouts
+# ---------------------------------------------------------------------------
+
+
+async def test_pipe_idle_timeout_stops_stalled_stream():
+    """A stream that goes quiet is stopped by the inactivity timeout, flagged idle."""
+    from tui.bridge import _stream_pipe
+
+    # Arrange — one line, then silence far beyond the idle timeout
+    spec = _python_agent(
+        "claude", "import sys, time; print('hello'); sys.stdout.flush(); time.sleep(30)"
+    )
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+
+    # Act
+    events = await asyncio.wait_for(
+        _collect(_stream_pipe(spec, "p", 30.0, q, idle_timeout=0.5), q), timeout=10.0
+    )
+
+    # Assert — the line streamed before the stall survives on the terminal event
+    assert [e.type for e in events] == ["token", "timeout"]
+    assert events[-1].idle is True
+    assert events[-1].partial_text == "hello"
+
+
+async def test_hedged_stream_uses_policy_timeouts_from_history():
+    """Warm history replaces the default timeout and enables an idle timeout."""
+    from tui.bridge import HedgeBudget, _stream_hedged
+    from tui.stats import LatencyHistory, TimeoutPolicy
+
+    # Arrange
+    history = LatencyHistory(min_samples=1)
+    history.record("claude", "stream", 20.0)
+    history.record("claude", "stream.ttft", 8.0)
+    stream = _fake_stream([(0.0, ["hi"], "done")])
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+    spec = AgentSpec(name="claude", command="claude")
+
+    # Act
+    await _stream_hedged(
+        spec, "p", 60.0, q, history=history, budget=HedgeBudget(ratio=0.0),
+        policy=TimeoutPolicy(factor=2.0, floor=1.0, idle_floor=1.0), stream=stream,
+    )
+
+    # Assert
+    assert stream.calls["idle_timeout"] == 16.0
+
+
+# ---------------------------------------------------------------------------
+# Partial-output preservation
+# ---------------------------------------------------------------------------
+
+
+async def test_error_event_carries_partial_transcript():
+    """Lines streamed before a non-zero exit are kept on AgentError.partial_text."""
+    from tui.bridge import _stream_pipe
+
+    # Arrange
+    spec = _python_agent("codex", "print('line 1'); print('line 2'); raise SystemExit(3)")
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+
+    # Act
+    events = await _collect(_stream_pipe(spec, "p", 10.0, q), q)
+
+    # Assert
+    error = events[-1]
+    assert isinstance(error, AgentError)
+    assert error.exit_code == 3
+    assert error.partial_text == "line 1\nline 2"
+
+
+def test_terminal_text_covers_every_terminal_event():
+    """terminal_text() returns full_text for done and partial_text for failures."""
+    from tui.event_bus import terminal_text
+
+    # Act / Assert
+    assert terminal_text(AgentDone(agent="a", full_text="all", exit_code=0)) == "all"
+    assert terminal_text(AgentError(agent="a", message="m", exit_code=1, partial_text="p")) == "p"
+    assert terminal_text(AgentTimeout(agent="a", partial_text="t")) == "t"
+    assert terminal_text(TokenChunk(agent="a", text="x")) == ""
+
+
+# ---------------------------------------------------------------------------
+# Prompt transport (real subprocesses)
+# ---------------------------------------------------------------------------
+
+# Far beyond the 128 KiB per-argument limit that makes argv transport fail with E2BIG.
+_HUGE_PROMPT = "x" * (4 * 1024 * 1024)
+
+
+async def test_stdin_transport_delivers_huge_prompt():
+    """A multi-megabyte prompt reaches the agent through stdin without E2BIG."""
+    import sys
+    from tui.bridge import _stream_pipe
+
+    # Arrange
+    spec = AgentSpec(
+        name="claude", command=sys.executable,
+        args=("-c", "import sys; print(len(sys.stdin.read()))"),
+        prompt_transport="stdin",
+    )
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+
+    # Act
+    events = await _collect(_stream_pipe(spec, _HUGE_PROMPT, 30.0, q), q)
+
+    # Assert
+    assert events[-1].type == "done"
+    assert events[-1].full_text == str(len(_HUGE_PROMPT))
+
+
+async def test_file_transport_passes_path_and_removes_file():
+    """The file transport passes a temp file path and deletes it after exit."""
+    import os
+    import sys
+    from tui.bridge import _HOUSEKEEPING, _stream_pipe
+
+    # Arrange
+    script = "import sys; print(sys.argv[1]); print(len(open(sys.argv[1]).read()))"
+    spec = AgentSpec(
+        name="claude", command=sys.executable, args=("-c", script), prompt_transport="file",
+    )
+    q: asyncio.Queue[BridgeEvent] = asyncio.Queue()
+
+    # Act
+    events = await _collect(_stream_pipe(spec, _HUGE_PROMPT, 30.0, q), q)
+    await asyncio.gather(*_HOUSEKEEPING)
+
+    # Assert
+    path, length = events[-1].full_text.splitlines()
+    assert length == str(len(_HUGE_PROMPT))
+    assert not os.path.exists(path)
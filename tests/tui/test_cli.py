@@ -0,0 +1,49 @@
+"""Tests for cli.py — headless subcommand dispatch ahead of the TUI."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tui.cli import main, run_subcommand
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+
+
+def test_run_subcommand_ignores_tui_arguments():
+    assert run_subcommand(["--resume"]) is None
+    assert run_subcommand([]) is None
+
+
+def test_main_dispatches_stats_subcommand(tmp_path, capsys):
+    # Arrange
+    journal = tmp_path / "sessions.jsonl"
+    journal.write_text('{"session": "s", "stage": "prompt", "prompt": "p"}\n')
+
+    # Act
+    with pytest.raises(SystemExit) as exit_info:
+        main(["stats", "--json", "--journal", str(journal)])
+
+    # Assert
+    assert exit_info.value.code == 0
+    assert json.loads(capsys.readouterr().out)["sessions"] == 1
+
+
+def test_headless_subcommands_do_not_import_textual(tmp_path):
+    # Arrange
+    script = (
+        "import sys\n"
+        "from tui.cli import run_subcommand\n"
+        f"run_subcommand(['stats', '--json', '--journal', {str(tmp_path / 'none.jsonl')!r}])\n"
+        "print('textual' in sys.modules, file=sys.stderr)\n"
+    )
+
+    # Act
+    done = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True,
+        env={"PYTHONPATH": str(SRC)}, check=True,
+    )
+
+    # Assert
+    assert done.stderr.strip() == "False"
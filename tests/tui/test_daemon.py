@@ -0,0 +1,152 @@
+"""Tests for daemon.py — session hub, event replay and the Unix socket protocol."""
+import asyncio
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+import tui.bridge
+from tui.daemon import BridgeDaemon, SessionHub, SessionLog, request
+from tui.event_bus import AgentDone, TokenChunk
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """Keep the latency history the runner saves out of the repository."""
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def socket_path():
+    """A short socket path (AF_UNIX paths are limited to about 100 bytes)."""
+    directory = tempfile.mkdtemp(prefix="ab-")
+    yield Path(directory) / "bureau.sock"
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def agents(monkeypatch):
+    """Fake agents that answer with the same code after `release` is set."""
+    release = asyncio.Event()
+
+    async def fake_stream(spec, prompt, timeout, q, **kwargs):
+        await q.put(TokenChunk(agent=spec.name, text="thinking"))
+        await release.wait()
+        reply = "```python\n# calc.py\nx = 1\n```"
+        await q.put(AgentDone(agent=spec.name, full_text=reply, exit_code=0))
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fake_stream)
+    return release
+
+
+async def _collect(payload, path):
+    return [record async for record in request(payload, path)]
+
+
+async def test_session_log_replays_from_offset_then_follows_live():
+    # Arrange
+    log = SessionLog("s", "p")
+    log.append({"type": "token", "text": "a"})
+    log.append({"type": "token", "text": "b"})
+
+    async def later():
+        await asyncio.sleep(0.01)
+        log.append({"type": "token", "text": "c"})
+        log.finish()
+
+    # Act
+    task = asyncio.create_task(later())
+    seen = [record async for record in log.follow(offset=1)]
+    await task
+
+    # Assert
+    assert [(r["seq"], r["text"]) for r in seen] == [(1, "b"), (2, "c")]
+
+
+async def test_submit_follow_streams_events_until_the_result(agents, socket_path):
+    # Arrange
+    daemon = BridgeDaemon(SessionHub(), socket_path)
+    await daemon.start()
+    agents.set()
+
+    # Act
+    records = await _collect({"op": "submit", "prompt": "set x"}, socket_path)
+    await daemon.close()
+
+    # Assert
+    assert records[0]["type"] == "accepted"
+    assert records[1]["type"] == "token" and records[1]["seq"] == 0
+    assert records[-1]["type"] == "result" and records[-1]["similarity"] == 1.0
+
+
+async def test_session_survives_detach_and_attach_replays_from_offset(agents, socket_path):
+    # Arrange
+    daemon = BridgeDaemon(SessionHub(), socket_path)
+    await daemon.start()
+    accepted = await _collect({"op": "submit", "prompt": "set x", "follow": False}, socket_path)
+    session = accepted[0]["session"]
+    await asyncio.sleep(0.01)
+
+    # Act
+    agents.set()
+    replay = await _collect({"op": "attach", "session": session, "offset": 1}, socket_path)
+    listing = await _collect({"op": "list"}, socket_path)
+    await daemon.close()
+
+    # Assert
+    assert len(accepted) == 1
+    assert replay[0]["seq"] == 1
+    assert replay[-1]["type"] == "result"
+    assert listing[0]["sessions"] == [
+        {"session": session, "prompt": "set x", "events": replay[-1]["seq"] + 1, "finished": True}
+    ]
+
+
+async def test_submit_context_reaches_agents_but_not_the_session_prompt(monkeypatch, socket_path):
+    # Arrange
+    prompts: list[str] = []
+
+    async def fake_stream(spec, prompt, timeout, q, **kwargs):
+        prompts.append(prompt)
+        await q.put(AgentDone(agent=spec.name, full_text="x = 1", exit_code=0))
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fake_stream)
+    daemon = BridgeDaemon(SessionHub(), socket_path)
+    await daemon.start()
+
+    # Act
+    await _collect({"op": "submit", "prompt": "set x", "context": "Branch: main"}, socket_path)
+    listing = await _collect({"op": "list"}, socket_path)
+    await daemon.close()
+
+    # Assert
+    assert prompts[0] == "## Environment\nBranch: main\n\n## Task\nset x"
+    assert listing[0]["sessions"][0]["prompt"] == "set x"
+
+
+async def test_bad_requests_are_rejected(socket_path):
+    # Arrange
+    daemon = BridgeDaemon(SessionHub(), socket_path)
+    await daemon.start()
+
+    # Act
+    unknown = await _collect({"op": "attach", "session": "nope"}, socket_path)
+    empty = await _collect({"op": "submit", "prompt": " "}, socket_path)
+    await daemon.close()
+
+    # Assert
+    assert unknown[0]["type"] == "rejected" and "nope" in unknown[0]["message"]
+    assert empty[0]["type"] == "rejected"
+
+
+async def test_second_daemon_on_a_live_socket_refuses_to_start(socket_path):
+    # Arrange
+    first = BridgeDaemon(SessionHub(), socket_path)
+    await first.start()
+
+    # Act / Assert
+    with pytest.raises(RuntimeError, match="already listening"):
+        await BridgeDaemon(SessionHub(), socket_path).start()
+    await first.close()
+    assert not socket_path.exists()
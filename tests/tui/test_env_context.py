@@ -0,0 +1,65 @@
+"""Tests for env_context.py — cached environment context for prompts."""
+import os
+
+import pytest
+
+import tui.env_context
+from tui.env_context import EnvContextCache, gather_env_context
+
+
+def test_gather_lists_project_root_without_hidden_entries(tmp_path):
+    # Arrange
+    (tmp_path / "src").mkdir()
+    (tmp_path / "README.md").write_text("x")
+    (tmp_path / ".hidden").write_text("x")
+
+    # Act
+    context = gather_env_context(tmp_path)
+
+    # Assert
+    assert f"Working directory: {tmp_path}" in context
+    assert "Project root: README.md, src" in context
+
+
+def test_cache_is_stale_until_refreshed_and_after_head_changes(tmp_path):
+    # Arrange
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    cache = EnvContextCache(tmp_path)
+
+    # Act / Assert
+    assert cache.get() is None
+    context = cache.refresh()
+    assert cache.get() == context
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/feature\n")
+    assert cache.get() is None
+
+
+def test_cache_is_stale_after_root_changes(tmp_path):
+    # Arrange
+    cache = EnvContextCache(tmp_path)
+    cache.refresh()
+
+    # Act
+    (tmp_path / "new.py").write_text("x")
+    os.utime(tmp_path, ns=(0, 1_000_000_000))
+
+    # Assert
+    assert cache.get() is None
+
+
+@pytest.mark.asyncio
+async def test_current_reuses_fresh_cache(tmp_path, monkeypatch):
+    # Arrange
+    calls: list[str] = []
+    monkeypatch.setattr(tui.env_context, "gather_env_context",
+                        lambda root: calls.append("gather") or "ctx")
+    cache = EnvContextCache(tmp_path)
+
+    # Act
+    first = await cache.current()
+    second = await cache.current()
+
+    # Assert
+    assert first == second == "ctx"
+    assert calls == ["gather"]
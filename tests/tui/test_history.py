@@ -0,0 +1,119 @@
+"""Tests for history.py — the SQLite session history with full-text search."""
+import gzip
+import json
+
+from tui.history import HistoryStore, fts_query, sessions_from_records
+
+
+def _write(path, records, mode="w"):
+    with open(path, mode) as f:
+        f.write("".join(json.dumps(r) + "\n" for r in records))
+
+
+def _session(sid, prompt, answer, ts=1.0):
+    return [
+        {"session": sid, "stage": "prompt", "prompt": prompt, "ts": ts},
+        {"session": sid, "stage": "stream", "agent": "claude", "text": answer},
+    ]
+
+
+def test_sessions_from_records_groups_stages_and_legacy_lines():
+    # Arrange
+    legacy = {"prompt": "design a queue", "agent_a": {"answer": "use redis"},
+              "agent_b": {"answer": "use sqs"}, "disagreements": []}
+    records = [
+        *_session("s1", "fix parser", "```python\n# p.py\nparse = 1\n```"),
+        {"session": "s1", "stage": "apply", "confirmed": True, "files": ["p.py"]},
+        legacy, dict(legacy),
+    ]
+
+    # Act
+    sessions = sessions_from_records(records)
+
+    # Assert
+    assert len(sessions) == 2
+    assert sessions[0].status == "applied"
+    assert sessions[0].code == ["parse = 1"]
+    assert sessions[1].id.startswith("legacy-")
+    assert sessions[1].outputs == {"claude": "use redis", "codex": "use sqs"}
+
+
+def test_search_ranks_matches_and_pages(tmp_path):
+    # Arrange
+    store = HistoryStore(tmp_path / "history.db")
+    records = []
+    for i in range(30):
+        records += _session(f"s{i}", f"task {i}", "generic answer", ts=float(i))
+    records += _session("hit", "tokenizer bug", "fix the tokenizer offset", ts=99.0)
+    store.add_records(records)
+
+    # Act
+    hits = store.search("tokeniz")
+    first, second = store.search("", limit=20), store.search("", limit=20, offset=20)
+
+    # Assert
+    assert [h.session for h in hits] == ["hit"]
+    assert "[tokenizer]" in hits[0].snippet
+    assert first[0].session == "hit"
+    assert len(first) == 20 and len(second) == 11
+    assert not {e.session for e in first} & {e.session for e in second}
+
+
+def test_texts_are_stored_once_per_content_hash(tmp_path):
+    # Arrange
+    store = HistoryStore(tmp_path / "history.db")
+    answer = "x" * 10_000
+
+    # Act
+    store.add_records(_session("a", "same prompt", answer) + _session("b", "same prompt", answer))
+
+    # Assert
+    assert store.session_count == 2
+    assert store._db.execute("SELECT count(*) FROM blobs").fetchone()[0] == 2
+
+
+def test_later_records_merge_into_the_session_and_reindex(tmp_path):
+    # Arrange
+    store = HistoryStore(tmp_path / "history.db")
+    store.add_records(_session("s1", "rename helper", "draft"))
+
+    # Act
+    store.add_records([
+        {"session": "s1", "stage": "stream", "agent": "codex", "text": "alternative"},
+        {"session": "s1", "stage": "apply", "confirmed": False, "files": []},
+    ])
+
+    # Assert
+    record = store.get("s1")
+    assert record.prompt == "rename helper"
+    assert record.outputs == {"claude": "draft", "codex": "alternative"}
+    assert record.status == "cancelled"
+    assert [e.session for e in store.search("alternative")] == ["s1"]
+    assert store.search("draft")[0].session == "s1"
+
+
+def test_sync_imports_only_new_journal_lines_and_segments(tmp_path):
+    # Arrange
+    journal = tmp_path / "sessions.jsonl"
+    _write(journal, _session("s1", "first prompt", "a"))
+    with gzip.open(tmp_path / "sessions-1.jsonl.gz", "wt") as f:
+        f.write(json.dumps({"session": "old", "stage": "prompt", "prompt": "archived"}) + "\n")
+    store = HistoryStore(tmp_path / "history.db")
+
+    # Act
+    first = store.sync(journal)
+    _write(journal, _session("s2", "second prompt", "b"), mode="a")
+    with open(journal, "a") as f:
+        f.write('{"session": "s3", "stage": "pro')  # half-written line
+    second = store.sync(journal)
+
+    # Assert
+    assert first == 2
+    assert second == 1
+    assert store.session_count == 3
+    assert store.search("archived")[0].session == "old"
+
+
+def test_fts_query_quotes_words_and_prefixes_the_last():
+    assert fts_query('merge "both" AND') == '"merge" """both""" "AND"*'
+    assert fts_query("   ") == ""
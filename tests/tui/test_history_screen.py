@@ -0,0 +1,74 @@
+"""Tests for HistoryScreen — searching and paging past sessions."""
+import json
+
+import pytest
+from textual.app import App
+from textual.widgets import OptionList, Static
+
+from tui.widgets.history_screen import PAGE_SIZE, HistoryScreen
+
+
+class HistoryTestApp(App):
+    """Host app that pushes HistoryScreen over a prepared journal."""
+
+    def __init__(self, tmp_path):
+        super().__init__()
+        self.tmp_path = tmp_path
+
+    def on_mount(self) -> None:
+        self.push_screen(HistoryScreen(self.tmp_path / "history.db", self.tmp_path / "sessions.jsonl"))
+
+
+def _journal(tmp_path, count):
+    with open(tmp_path / "sessions.jsonl", "w") as f:
+        for i in range(count):
+            f.write(json.dumps({"session": f"s{i}", "stage": "prompt", "prompt": f"prompt {i}",
+                                "ts": float(i)}) + "\n")
+        f.write(json.dumps({"session": "w", "stage": "prompt", "prompt": "fix the widget",
+                            "ts": 0.5}) + "\n")
+
+
+async def _settle(app, pilot):
+    for _ in range(5):
+        await pilot.pause()
+        await app.workers.wait_for_complete()
+    await pilot.pause()
+
+
+@pytest.mark.asyncio
+async def test_history_lists_first_page_and_loads_more_near_the_end(tmp_path):
+    _journal(tmp_path, PAGE_SIZE + 20)
+    app = HistoryTestApp(tmp_path)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await _settle(app, pilot)
+        results = app.screen.query_one("#history-results", OptionList)
+        assert results.option_count == PAGE_SIZE
+        results.highlighted = PAGE_SIZE - 1
+        await _settle(app, pilot)
+        assert results.option_count == PAGE_SIZE + 21
+
+
+@pytest.mark.asyncio
+async def test_history_search_filters_and_shows_detail(tmp_path):
+    _journal(tmp_path, 5)
+    app = HistoryTestApp(tmp_path)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await _settle(app, pilot)
+        await pilot.press(*"widg")
+        await _settle(app, pilot)
+        results = app.screen.query_one("#history-results", OptionList)
+        assert results.option_count == 1
+        assert results.get_option_at_index(0).id == "w"
+        detail = app.screen.query_one("#history-detail", Static)
+        assert "fix the widget" in str(detail.render())
+
+
+@pytest.mark.asyncio
+async def test_history_escape_closes(tmp_path):
+    _journal(tmp_path, 1)
+    app = HistoryTestApp(tmp_path)
+    async with app.run_test(size=(120, 40)) as pilot:
+        await _settle(app, pilot)
+        await pilot.press("escape")
+        await pilot.pause()
+        assert not isinstance(app.screen, HistoryScreen)
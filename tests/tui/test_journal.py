@@ -0,0 +1,157 @@
+"""Tests for journal.py — the batched, rotating session journal writer."""
+import gzip
+import json
+import threading
+
+from tui.journal import SessionJournal, load_checkpoint, read_journal
+
+
+def test_append_writes_records_with_timestamp_after_flush(tmp_path):
+    # Arrange
+    path = tmp_path / ".disagree" / "sessions.jsonl"
+    journal = SessionJournal(path, flush_interval=0.01)
+
+    # Act
+    journal.append({"stage": "prompt", "prompt": "hi"})
+    journal.append({"stage": "apply", "ts": 1.0})
+    flushed = journal.flush()
+    journal.close()
+
+    # Assert
+    assert flushed
+    records = read_journal(path)
+    assert [r["stage"] for r in records] == ["prompt", "apply"]
+    assert records[0]["ts"] > 0
+    assert records[1]["ts"] == 1.0
+
+
+def test_append_after_close_is_ignored(tmp_path):
+    # Arrange
+    path = tmp_path / "sessions.jsonl"
+    journal = SessionJournal(path)
+    journal.close()
+
+    # Act
+    journal.append({"stage": "prompt"})
+
+    # Assert
+    assert journal.flush(timeout=0.1)
+    assert not path.exists()
+
+
+def test_full_file_is_rotated_compressed_and_pruned(tmp_path):
+    # Arrange
+    path = tmp_path / "sessions.jsonl"
+    journal = SessionJournal(path, batch_size=1, flush_interval=0.0, max_bytes=10, keep_segments=2)
+
+    # Act
+    for i in range(5):
+        journal.append({"n": i})
+        journal.flush()
+    journal.close()
+
+    # Assert
+    segments = sorted(tmp_path.glob("sessions-*.jsonl.gz"))
+    assert len(segments) == 2
+    assert not path.exists()
+    newest = [json.loads(line) for line in gzip.decompress(segments[-1].read_bytes()).splitlines()]
+    assert newest[0]["n"] == 4
+
+
+def test_concurrent_journals_do_not_interleave_lines(tmp_path):
+    # Arrange
+    path = tmp_path / "sessions.jsonl"
+    journals = [SessionJournal(path, batch_size=8, flush_interval=0.001) for _ in range(2)]
+
+    def _fill(journal, writer):
+        for i in range(200):
+            journal.append({"writer": writer, "n": i, "text": "x" * 200})
+
+    # Act
+    threads = [threading.Thread(target=_fill, args=(j, w)) for w, j in enumerate(journals)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for journal in journals:
+        journal.flush()
+        journal.close()
+
+    # Assert
+    records = read_journal(path)
+    assert len(records) == 400
+    for writer in (0, 1):
+        assert [r["n"] for r in records if r["writer"] == writer] == list(range(200))
+
+
+def test_read_journal_skips_malformed_lines(tmp_path):
+    # Arrange
+    path = tmp_path / "sessions.jsonl"
+    path.write_text('{"stage": "prompt"}\n{broken\n{"stage": "apply"}\n')
+
+    # Act
+    records = read_journal(path)
+
+    # Assert
+    assert [r["stage"] for r in records] == ["prompt", "apply"]
+
+
+def test_read_journal_of_missing_file_is_empty(tmp_path):
+    assert read_journal(tmp_path / "missing.jsonl") == []
+
+
+def test_load_checkpoint_folds_lines_and_takes_latest_state(tmp_path):
+    # Arrange
+    path = tmp_path / "sessions.jsonl"
+    records = [
+        {"session": "old", "stage": "checkpoint", "state": "STREAMING", "lines": {"claude": ["x"]}},
+        {"session": "s1", "stage": "prompt", "prompt": "p"},
+        {"session": "s1", "stage": "checkpoint", "state": "STREAMING", "lines": {"claude": ["a"]}},
+        {"session": "s1", "stage": "checkpoint", "state": "RECONCILING",
+         "lines": {"claude": ["b"], "codex": ["c"]}, "last_texts": {"claude": "a"}},
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+    # Act
+    checkpoint = load_checkpoint(path)
+
+    # Assert
+    assert checkpoint.session == "s1"
+    assert checkpoint.state == "RECONCILING"
+    assert checkpoint.lines == {"claude": ["a", "b"], "codex": ["c"]}
+    assert checkpoint.last_texts == {"claude": "a"}
+    assert load_checkpoint(path, session="old").lines == {"claude": ["x"]}
+
+
+def test_load_checkpoint_ignores_applied_sessions(tmp_path):
+    # Arrange
+    path = tmp_path / "sessions.jsonl"
+    records = [
+        {"session": "s1", "stage": "checkpoint", "state": "REVIEWING"},
+        {"session": "s1", "stage": "apply", "confirmed": True, "files": []},
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+    # Act / Assert
+    assert load_checkpoint(path) is None
+    assert load_checkpoint(tmp_path / "missing.jsonl") is None
+
+
+def test_long_texts_go_to_the_blob_store_once(tmp_path):
+    # Arrange
+    path = tmp_path / "sessions.jsonl"
+    journal = SessionJournal(path, flush_interval=0.01, blob_min_size=100)
+    answer = "def solve():\n    return 42\n" * 50
+
+    # Act
+    for stage in ("stream", "classification", "checkpoint"):
+        journal.append({"session": "s", "stage": stage, "text": answer})
+    journal.flush()
+    journal.close()
+
+    # Assert
+    raw = path.read_text()
+    assert "return 42" not in raw
+    assert raw.count('"$blob"') == 3
+    assert len(list((tmp_path / "blobs" / "texts").rglob("*"))) == 2  # one fan-out dir, one manifest
+    assert [r["text"] for r in read_journal(path)] == [answer] * 3
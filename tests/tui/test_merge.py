@@ -0,0 +1,68 @@
+"""Tests for merge.py — local three-way merge of two proposals."""
+from tui.merge import Conflict, merge3
+
+BASE = "\n".join(f"line {i}" for i in range(10))
+
+
+def _edit(text: str, index: int, new: str) -> str:
+    lines = text.splitlines()
+    lines[index] = new
+    return "\n".join(lines)
+
+
+def test_merge3_combines_non_overlapping_changes():
+    # Arrange
+    ours = _edit(BASE, 1, "ours 1")
+    theirs = _edit(BASE, 8, "theirs 8")
+
+    # Act
+    result = merge3(BASE, ours, theirs)
+
+    # Assert
+    assert result.clean
+    assert result.auto_resolved == 2
+    assert result.render() == _edit(_edit(BASE, 1, "ours 1"), 8, "theirs 8")
+
+
+def test_merge3_takes_identical_changes_once():
+    # Arrange
+    both = _edit(BASE, 4, "same fix")
+
+    # Act
+    result = merge3(BASE, both, both)
+
+    # Assert
+    assert result.clean
+    assert result.render() == both
+
+
+def test_merge3_reports_overlapping_changes_as_conflict():
+    # Arrange
+    ours = _edit(_edit(BASE, 4, "ours 4"), 0, "ours 0")
+    theirs = _edit(BASE, 4, "theirs 4")
+
+    # Act
+    result = merge3(BASE, ours, theirs)
+
+    # Assert
+    assert result.auto_resolved == 1
+    assert result.conflicts == [Conflict(
+        base=("line 4",), ours=("ours 4",), theirs=("theirs 4",),
+        before=("line 1", "line 2", "line 3"), after=("line 5", "line 6", "line 7"),
+    )]
+    assert result.render().splitlines()[:5] == ["ours 0", "line 1", "line 2", "line 3", "ours 4"]
+    assert result.render({0: ["resolved"]}).splitlines()[4] == "resolved"
+
+
+def test_merge3_without_base_conflicts_only_where_proposals_differ():
+    # Arrange
+    ours = _edit(BASE, 5, "ours 5")
+    theirs = _edit(BASE, 5, "theirs 5")
+
+    # Act
+    result = merge3(None, ours, theirs)
+
+    # Assert
+    assert len(result.conflicts) == 1
+    assert result.conflicts[0].ours == ("ours 5",)
+    assert result.render({0: ["x"]}) == _edit(BASE, 5, "x")
@@ -0,0 +1,266 @@
+"""Tests for prompts.py — token-budgeted reconciliation prompt construction."""
+from tui.apply import CodeProposal, diff_hunks
+from tui.merge import merge3
+from tui.prompts import (
+    build_conflict_prompt,
+    build_delta_prompt,
+    build_reconcile_prompt,
+    estimate_tokens,
+    final_proposals,
+    parse_delta_reply,
+    reassemble_delta,
+    render_proposal,
+    summarize_prose,
+    truncate_to_tokens,
+)
+
+
+def _answer(code: str, prose: str = "I chose a loop. It is simple. It is fast. Extra detail.") -> str:
+    return f"{prose}\n\n```python\n# src/app.py\n{code}\n```"
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def test_estimate_tokens_is_about_four_chars_per_token():
+    # Act / Assert
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_summarize_prose_skips_code_and_limits_sentences():
+    # Arrange
+    text = "First. Second!\n```python\nx = 'not prose.'\n```\nThird? Fourth."
+
+    # Act
+    summary = summarize_prose(text, max_sentences=3)
+
+    # Assert
+    assert summary == "First. Second! Third?"
+
+
+def test_final_proposals_keeps_last_version_per_file():
+    # Arrange
+    text = (
+        "```python\n# a.py\nv1\n```\n"
+        "```python\nanon\n```\n"
+        "```python\n# a.py\nv2\n```"
+    )
+
+    # Act
+    proposals = final_proposals(text)
+
+    # Assert
+    assert [p.code for p in proposals] == ["anon", "v2"]
+
+
+def test_render_proposal_restores_filename_comment():
+    # Act / Assert
+    assert render_proposal(CodeProposal("python", "x = 1", "a.py")) == "```python\n# a.py\nx = 1\n```"
+    assert render_proposal(CodeProposal("typescript", "let x", "a.ts")).splitlines()[1] == "// a.ts"
+
+
+def test_truncate_to_tokens_keeps_head_and_tail():
+    # Arrange
+    text = "HEAD" + "x" * 10_000 + "TAIL"
+
+    # Act
+    cut = truncate_to_tokens(text, 100)
+
+    # Assert
+    assert cut.startswith("HEAD")
+    assert cut.endswith("TAIL")
+    assert "truncated" in cut
+    assert estimate_tokens(cut) <= 110
+
+
+# ---------------------------------------------------------------------------
+# build_reconcile_prompt
+# ---------------------------------------------------------------------------
+
+
+def test_prompt_contains_code_diff_and_summary_but_not_full_prose():
+    # Arrange
+    verbose = "Long explanation sentence. " * 200
+    own = _answer("x = 1", prose=verbose)
+    other = _answer("x = 2")
+
+    # Act
+    prompt = build_reconcile_prompt("Claude", own, "Codex", other)
+
+    # Assert
+    assert "# src/app.py\nx = 1" in prompt
+    assert "-x = 1\n+x = 2" in prompt
+    assert "Review both approaches" in prompt
+    assert prompt.count("Long explanation sentence.") == 3
+
+
+def test_prompt_size_does_not_grow_with_verbosity():
+    # Arrange
+    short = build_reconcile_prompt("Claude", _answer("x = 1"), "Codex", _answer("x = 2"))
+    chatty_prose = "Here is a lot of discussion. " * 5000
+    chatty = build_reconcile_prompt(
+        "Claude", _answer("x = 1", chatty_prose), "Codex", _answer("x = 2", chatty_prose)
+    )
+
+    # Assert — prose beyond the summary is dropped entirely
+    assert len(chatty) < len(short) + 200
+
+
+def test_prompt_respects_token_budget_for_huge_code():
+    # Arrange
+    huge = "\n".join(f"line_{i} = {i}" for i in range(20_000))
+
+    # Act
+    prompt = build_reconcile_prompt(
+        "Claude", _answer(huge), "Codex", _answer(huge + "\nextra = 1"), budget=2000
+    )
+
+    # Assert
+    assert estimate_tokens(prompt) <= 2100
+    assert "Review both approaches" in prompt
+
+
+def test_prompt_keeps_truncated_diff_when_other_code_does_not_fit():
+    # Arrange
+    own = "\n".join(f"x{i} = {i}" for i in range(300))
+    other = "\n".join(f"some_longer_variable_name_{i} = compute({i}, {i} * 2)" for i in range(600))
+
+    # Act
+    prompt = build_reconcile_prompt("Claude", _answer(own), "Codex", _answer(other), budget=4000)
+
+    # Assert
+    assert "## Diff from your code to Codex's" in prompt
+    assert "+some_longer_variable_name_0 = compute(0, 0 * 2)" in prompt
+    assert estimate_tokens(prompt) <= 4100
+
+
+def test_prompt_without_code_falls_back_to_prose_and_flags_partial():
+    # Act
+    prompt = build_reconcile_prompt(
+        "Codex", "I would use a queue.", "Claude", "Half an ans", other_partial=True
+    )
+
+    # Assert
+    assert "I would use a queue." in prompt
+    assert "Half an ans" in prompt
+    assert "cut off" in prompt
+
+
+# ---------------------------------------------------------------------------
+# Delta rounds
+# ---------------------------------------------------------------------------
+
+
+def _long_file(changed: str) -> str:
+    lines = [f"line_{i} = {i}" for i in range(200)]
+    lines[100] = changed
+    return "\n".join(lines)
+
+
+def test_delta_prompt_sends_hunks_with_context():
+    # Arrange
+    base = _long_file("value = 1")
+    hunks = diff_hunks(base, _long_file("value = 2"))
+
+    # Act
+    prompt = build_delta_prompt("Claude", "Codex", base, hunks, own_is_a=True)
+
+    # Assert
+    assert "- value = 1" in prompt
+    assert "+ value = 2" in prompt
+    assert "  line_99 = 99" in prompt
+
+
+def test_delta_prompt_carries_agreed_code_once_with_hunk_markers():
+    # Arrange
+    base = _long_file("value = 1")
+    hunks = diff_hunks(base, _long_file("value = 2"))
+
+    # Act
+    prompt = build_delta_prompt(
+        "Claude", "Codex", base, hunks, own_is_a=True, language="python", filename="src/app.py"
+    )
+
+    # Assert — lines far outside the hunk reach the (stateless) agent, once
+    assert "## Agreed code (src/app.py)" in prompt
+    assert prompt.count("line_0 = 0") == 1
+    assert prompt.count("line_199 = 199") == 1
+    assert "line_99 = 99\n<<< Hunk 1 >>>\nline_101 = 101" in prompt
+    assert prompt.index("<<< Hunk 1 >>>") < prompt.index("### Hunk 1")
+    assert estimate_tokens(prompt) < estimate_tokens(base) * 2
+
+
+def test_delta_prompt_truncates_agreed_code_rather_than_dropping_it():
+    # Arrange
+    base = _long_file("value = 1")
+    hunks = diff_hunks(base, _long_file("value = 2"))
+
+    # Act
+    prompt = build_delta_prompt("Claude", "Codex", base, hunks, own_is_a=True, budget=600)
+
+    # Assert
+    assert "## Agreed code" in prompt and "truncated" in prompt
+    assert "+ value = 2" in prompt
+
+
+def test_delta_prompt_marks_own_lines_for_b_side():
+    # Arrange
+    base = _long_file("value = 1")
+    hunks = diff_hunks(base, _long_file("value = 2"))
+
+    # Act
+    prompt = build_delta_prompt("Codex", "Claude", base, hunks, own_is_a=False)
+
+    # Assert
+    assert "- value = 2" in prompt
+    assert "+ value = 1" in prompt
+
+
+def test_parse_delta_reply_maps_headings_to_blocks():
+    # Arrange
+    reply = (
+        "Took theirs for the first.\n\n### Hunk 1\n```python\nvalue = 2\n```\n"
+        "**Hunk 2**\n### Hunk 2\n```\n```\n"
+    )
+
+    # Act
+    chosen = parse_delta_reply(reply)
+
+    # Assert
+    assert chosen == {0: ["value = 2"], 1: []}
+
+
+def test_reassemble_delta_keeps_own_lines_for_unanswered_hunks():
+    # Arrange
+    base = "a = 1\nkeep\nb = 1"
+    other = "a = 2\nkeep\nb = 2"
+    hunks = diff_hunks(base, other)
+    reply = "### Hunk 1\n```python\na = 3\n```"
+
+    # Act
+    claude = reassemble_delta(base, hunks, reply, own_is_a=True)
+    codex = reassemble_delta(base, hunks, reply, own_is_a=False)
+
+    # Assert
+    assert claude == "a = 3\nkeep\nb = 1"
+    assert codex == "a = 3\nkeep\nb = 2"
+
+
+def test_conflict_prompt_contains_only_conflicting_region():
+    # Arrange
+    base = _long_file("value = 0")
+    result = merge3(base, _long_file("value = 1"), _long_file("value = 2"))
+
+    # Act
+    prompt = build_conflict_prompt(result.conflicts, "python", "src/v.py")
+    reply = parse_delta_reply("### Conflict 1\n```python\nvalue = 3\n```")
+
+    # Assert
+    assert "### Conflict 1" in prompt
+    assert "value = 0" in prompt and "value = 1" in prompt and "value = 2" in prompt
+    assert "line_0 = 0" not in prompt
+    assert reply == {0: ["value = 3"]}
@@ -0,0 +1,98 @@
+"""Tests for reconcile.py — the reconciliation loop shared by the app and headless runs."""
+from tui.apply import CodeProposal
+from tui.reconcile import delta_base, read_replies, round_prompts, run_reconciliation
+from tui.session import ConvergencePolicy
+
+
+def _answer(code: str) -> str:
+    return f"Done.\n```python\n# src/v.py\n{code}\n```"
+
+
+def _scripted(replies: dict[str, list[str]], seen: list[dict[str, str]]):
+    """A run_round that records each round's prompts and answers from replies."""
+    async def run_round(prompts: dict[str, str]) -> dict[str, str]:
+        seen.append(prompts)
+        return {agent: replies[agent].pop(0) for agent in prompts}
+    return run_round
+
+
+def test_delta_base_needs_same_file_and_a_difference():
+    # Arrange
+    a = CodeProposal("python", "x = 1", "src/v.py")
+
+    # Assert
+    assert delta_base({"claude": a, "codex": a}) is None
+    assert delta_base({"claude": a, "codex": CodeProposal("python", "x = 2", "src/w.py")}) is None
+    assert delta_base({"claude": a, "codex": None}) is None
+    base, hunks = delta_base({"claude": a, "codex": CodeProposal("python", "x = 2", "src/v.py")})
+    assert base is a and len(hunks) == 1
+
+
+def test_full_round_prompts_flag_partial_transcripts():
+    # Act
+    prompts = round_prompts({"claude": _answer("x = 1"), "codex": "half an"}, None, partial={"codex"})
+
+    # Assert
+    assert "cut off" in prompts["claude"]
+    assert "Codex proposed" in prompts["claude"]
+    assert "You previously proposed" in prompts["codex"]
+
+
+def test_delta_replies_are_reassembled_into_full_proposals():
+    # Arrange
+    common = "\n".join(f"line_{i} = {i}" for i in range(10))
+    base = delta_base({
+        "claude": CodeProposal("python", f"{common}\nx = 1", "src/v.py"),
+        "codex": CodeProposal("python", f"{common}\nx = 2", "src/v.py"),
+    })
+
+    # Act
+    texts, proposals = read_replies({"claude": "### Hunk 1\n```python\nx = 3\n```", "codex": ""}, base)
+
+    # Assert
+    assert proposals["claude"].code == f"{common}\nx = 3"
+    assert proposals["codex"].code == f"{common}\nx = 2"
+    assert texts["claude"].startswith("```python\n# src/v.py\n")
+
+
+async def test_loop_goes_from_full_to_delta_rounds_until_converged():
+    # Arrange
+    seen: list[dict[str, str]] = []
+    run_round = _scripted({
+        "claude": [_answer("x = 1"), "### Hunk 1\n```python\nx = 3\n```"],
+        "codex": [_answer("x = 2"), "### Hunk 1\n```python\nx = 3\n```"],
+    }, seen)
+    rounds = []
+
+    # Act
+    last = await run_reconciliation(
+        {"claude": "a", "codex": "b"}, {"claude": None, "codex": None}, run_round,
+        policy=ConvergencePolicy(max_rounds=5), on_round=rounds.append,
+    )
+
+    # Assert
+    assert [(r.round, r.stop_reason) for r in rounds] == [(1, None), (2, "converged")]
+    assert "Review both approaches" in seen[0]["claude"]
+    assert "### Hunk 1" in seen[1]["claude"] and "## Agreed code (src/v.py)" in seen[1]["claude"]
+    assert last.proposals["codex"] == CodeProposal("python", "x = 3", "src/v.py")
+    assert last.similarity == 1.0
+
+
+async def test_loop_starts_with_delta_round_when_asked():
+    # Arrange
+    seen: list[dict[str, str]] = []
+    run_round = _scripted({"claude": [""], "codex": [""]}, seen)
+    proposals = {
+        "claude": CodeProposal("python", "x = 1", "src/v.py"),
+        "codex": CodeProposal("python", "x = 2", "src/v.py"),
+    }
+
+    # Act
+    last = await run_reconciliation(
+        {}, proposals, run_round, policy=ConvergencePolicy(max_rounds=1), delta=True,
+    )
+
+    # Assert — unanswered hunks keep each agent's own lines
+    assert "### Hunk 1" in seen[0]["codex"]
+    assert last.stop_reason == "max rounds"
+    assert last.proposals["codex"].code == "x = 2"
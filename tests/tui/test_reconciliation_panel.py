@@ -100,3 +100,56 @@ async def test_hide_panel_hides_widget():
         await pilot.pause()
         # Assert
         assert panel.display is False
+
+
+@pytest.mark.asyncio
+async def test_show_hunk_selection_lists_hunks_and_marks_cursor():
+    """show_hunk_selection() writes one heading per hunk plus both sides' lines."""
+    # Arrange
+    from textual.widgets import Label
+    from tui.apply import diff_hunks
+    app = PanelTestApp()
+    hunks = diff_hunks("a\nkeep\nb", "A\nkeep\nB")
+    async with app.run_test(size=(120, 40)) as pilot:
+        panel = app.query_one("#panel", ReconciliationPanel)
+        # Act
+        panel.show_hunk_selection(hunks, ["claude", "codex"], cursor=1)
+        await pilot.pause()
+        # Assert
+        log = panel.query_one("#recon-log", RichLog)
+        text = "\n".join(line.text for line in log.lines)
+        assert "▶ Hunk 2" in text
+        assert "- a" in text and "+ B" in text
+        assert "Codex: 1" in str(panel.query_one("#recon-header", Label).render())
+
+
+@pytest.mark.asyncio
+async def test_show_race_winner_keeps_square_brackets():
+    """Race-winner code is highlighted, not parsed as markup, so subscripts survive."""
+    # Arrange
+    app = PanelTestApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        panel = app.query_one("#panel", ReconciliationPanel)
+        # Act
+        panel.show_race_winner("codex", "value = d[key]\nnames: list[str] = []", "python")
+        await pilot.pause()
+        # Assert
+        text = "\n".join(line.text for line in panel.query_one("#recon-log", RichLog).lines)
+        assert "d[key]" in text
+        assert "list[str]" in text
+
+
+@pytest.mark.asyncio
+async def test_show_reused_keeps_square_brackets():
+    """A reused solution's code is highlighted, not parsed as markup, so subscripts survive."""
+    # Arrange
+    app = PanelTestApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        panel = app.query_one("#panel", ReconciliationPanel)
+        # Act
+        panel.show_reused(0.9, "look up [key]", "value = d[key]", "python")
+        await pilot.pause()
+        # Assert
+        text = "\n".join(line.text for line in panel.query_one("#recon-log", RichLog).lines)
+        assert "Past prompt: look up [key]" in text
+        assert "d[key]" in text
@@ -0,0 +1,113 @@
+"""Tests for repo_index.py — incremental BM25 index of project files."""
+import os
+
+from tui.repo_index import RepoIndex, render_snippets, tokenize
+
+
+def _project(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "billing.py").write_text(
+        "import math\n\n\ndef compute_invoice_total(items):\n    return sum(i.price for i in items)\n"
+    )
+    (tmp_path / "src" / "auth.py").write_text("class LoginForm:\n    password = ''\n")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "secret.py").write_text("invoice = 1\n")
+    (tmp_path / "image.bin").write_bytes(b"\0\1\2invoice")
+    return tmp_path
+
+
+def test_tokenize_splits_identifiers():
+    # Act
+    terms = tokenize("computeInvoiceTotal parse_http_header")
+
+    # Assert
+    assert {"computeinvoicetotal", "compute", "invoice", "total"} <= set(terms)
+    assert {"parse_http_header", "parse", "http", "header"} <= set(terms)
+
+
+def test_update_skips_hidden_and_binary_files(tmp_path):
+    # Arrange
+    index = RepoIndex(_project(tmp_path))
+
+    # Act
+    changed, removed = index.update()
+
+    # Assert
+    assert (changed, removed) == (2, 0)
+    assert index.file_count == 2
+
+
+def test_query_ranks_relevant_file_and_excerpts_matching_lines(tmp_path):
+    # Arrange
+    index = RepoIndex(_project(tmp_path))
+    index.update()
+
+    # Act
+    snippets = index.query("fix the invoice total computation", k=2)
+
+    # Assert
+    assert snippets[0].path == "src/billing.py"
+    assert "def compute_invoice_total" in snippets[0].text
+
+
+def test_query_respects_byte_budget(tmp_path):
+    # Arrange
+    (tmp_path / "big.py").write_text("\n".join(f"invoice_{i} = {i}" for i in range(500)))
+    index = RepoIndex(tmp_path)
+    index.update()
+
+    # Act
+    snippets = index.query("invoice", byte_budget=300)
+
+    # Assert
+    assert len(render_snippets(snippets).encode()) <= 300
+
+
+def test_update_is_incremental(tmp_path):
+    # Arrange
+    root = _project(tmp_path)
+    index = RepoIndex(root)
+    index.update()
+
+    # Act / Assert
+    assert index.update() == (0, 0)
+    billing = root / "src" / "billing.py"
+    billing.write_text("def refund():\n    pass\n")
+    os.utime(billing, ns=(0, 1_000_000_000))
+    assert index.update() == (1, 0)
+    (root / "src" / "auth.py").unlink()
+    assert index.update() == (0, 1)
+    assert index.query("refund")[0].path == "src/billing.py"
+
+
+def test_update_paths_reindexes_only_given_files(tmp_path):
+    # Arrange
+    root = _project(tmp_path)
+    index = RepoIndex(root)
+    index.update()
+    (root / "src" / "new.py").write_text("def shipping_label():\n    pass\n")
+
+    # Act
+    changed = index.update_paths(["src/new.py", "src/missing.py", ".hidden/secret.py"])
+
+    # Assert
+    assert changed == 1
+    assert index.query("shipping label")[0].path == "src/new.py"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    # Arrange
+    root = _project(tmp_path)
+    index = RepoIndex(root)
+    index.update()
+    path = tmp_path / ".disagree" / "index.json"
+
+    # Act
+    index.save(path)
+    loaded = RepoIndex.load(root, path)
+    other_root = RepoIndex.load(tmp_path / "src", path)
+
+    # Assert
+    assert loaded.file_count == 2
+    assert loaded.update() == (0, 0)
+    assert other_root.file_count == 0
@@ -50,3 +50,29 @@ def test_all_states_in_session_state():
     assert SessionState.RECONCILING in SessionState
     assert SessionState.REVIEWING in SessionState
     assert SessionState.CONFIRMING_APPLY in SessionState
+
+
+def test_quorum_policy_defaults_wait_for_both_agents():
+    # Arrange
+    from tui.session import QuorumPolicy
+
+    # Act
+    policy = QuorumPolicy()
+
+    # Assert — early classification is opt-in; late agents re-classify when enabled
+    assert policy.quorum == 2
+    assert policy.grace > 0
+    assert policy.reclassify_late is True
+
+
+def test_convergence_policy_stop_reasons():
+    # Arrange
+    from tui.session import ConvergencePolicy
+    policy = ConvergencePolicy(max_rounds=3, time_budget=100.0, threshold=0.95, min_improvement=0.05)
+
+    # Act / Assert
+    assert policy.stop_reason([0.96], elapsed=10.0, last_round=10.0) == "converged"
+    assert policy.stop_reason([0.5], elapsed=10.0, last_round=10.0) is None
+    assert policy.stop_reason([0.5, 0.52], elapsed=20.0, last_round=10.0) == "no improvement"
+    assert policy.stop_reason([0.5, 0.7, 0.9], elapsed=30.0, last_round=10.0) == "max rounds"
+    assert policy.stop_reason([0.5], elapsed=60.0, last_round=60.0) == "time budget"
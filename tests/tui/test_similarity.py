@@ -0,0 +1,88 @@
+"""Tests for similarity.py — MinHash lookup of past accepted solutions."""
+from tui.similarity import (
+    Solution,
+    SolutionIndex,
+    estimate_similarity,
+    minhash,
+    shingles,
+)
+
+
+def _solution(prompt, env="proj", code="x = 1", ts=0.0):
+    return Solution(prompt=prompt, env=env, code=code, language="python", filename="x.py", ts=ts)
+
+
+def test_shingles_are_lowercase_word_trigrams():
+    assert shingles("Add a Retry loop") == {"add a retry", "a retry loop"}
+    assert shingles("fix it") == {"fix it"}
+    assert shingles("  ") == set()
+
+
+def test_minhash_estimates_jaccard_similarity():
+    # Arrange
+    base = "add retry with exponential backoff to the http client in src/net.py"
+
+    # Act
+    same = estimate_similarity(minhash(base), minhash(base.upper()))
+    near = estimate_similarity(minhash(base), minhash(base + " please"))
+    far = estimate_similarity(minhash(base), minhash("write a parser for toml configuration files"))
+
+    # Assert
+    assert same == 1.0
+    assert near > 0.7
+    assert far < 0.2
+
+
+def test_find_returns_near_duplicate_in_same_environment_only():
+    # Arrange
+    index = SolutionIndex(threshold=0.7)
+    prompt = "add retry with exponential backoff to the http client in src/net.py"
+    index.add(_solution(prompt, code="retry()"))
+    index.add(_solution("write a parser for toml configuration files"))
+
+    # Act
+    match = index.find(prompt + " please", "proj")
+
+    # Assert
+    assert match is not None
+    assert match.solution.code == "retry()"
+    assert index.find(prompt, "other-project") is None
+    assert index.find("rename the logging helper", "proj") is None
+
+
+def test_add_replaces_same_prompt_and_prefers_recent_on_ties():
+    # Arrange
+    index = SolutionIndex()
+    prompt = "convert the settings loader to use dataclasses"
+
+    # Act
+    index.add(_solution(prompt, code="old", ts=1.0))
+    index.add(_solution(prompt, code="new", ts=2.0))
+
+    # Assert
+    assert len(index) == 1
+    assert index.find(prompt, "proj").solution.code == "new"
+
+
+def test_save_and_load_round_trip(tmp_path):
+    # Arrange
+    path = tmp_path / "solutions.json"
+    index = SolutionIndex()
+    index.add(_solution("cache the environment context between prompts"))
+
+    # Act
+    index.save(path)
+    loaded = SolutionIndex.load(path)
+
+    # Assert
+    assert loaded.find("cache the environment context between prompts", "proj") is not None
+    assert len(SolutionIndex.load(tmp_path / "missing.json")) == 0
+
+
+def test_index_is_bounded_by_max_entries():
+    index = SolutionIndex(max_entries=3)
+    for i in range(5):
+        index.add(_solution(f"prompt number {i} about widgets"))
+    assert len(index) == 3
+    assert index.find("prompt number 4 about widgets", "proj") is not None
+    assert index.find("prompt number 0 about widgets", "proj") is None
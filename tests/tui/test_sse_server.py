@@ -0,0 +1,143 @@
+"""Tests for sse_server.py — the read-only HTTP/SSE view of daemon sessions."""
+import asyncio
+import json
+
+import pytest
+
+import tui.bridge
+from tui.daemon import SessionHub
+from tui.event_bus import AgentDone, TokenChunk
+from tui.sse_server import EventServer
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """Keep the latency history the runner saves out of the repository."""
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def agents(monkeypatch):
+    """Fake agents that answer with the same code after `release` is set."""
+    release = asyncio.Event()
+
+    async def fake_stream(spec, prompt, timeout, q, **kwargs):
+        await q.put(TokenChunk(agent=spec.name, text="thinking"))
+        await release.wait()
+        await q.put(AgentDone(agent=spec.name, full_text="```python\nx = 1\n```", exit_code=0))
+
+    monkeypatch.setattr(tui.bridge, "_stream_hedged", fake_stream)
+    return release
+
+
+async def _open(server, path, headers=""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode())
+    await writer.drain()
+    return reader, writer
+
+
+async def _get(server, path, headers=""):
+    reader, writer = await _open(server, path, headers)
+    data = await reader.read()
+    writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    return head.decode().split("\r\n")[0], body
+
+
+def _sse_events(body):
+    events = []
+    for block in body.decode().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append(fields)
+    return events
+
+
+@pytest.fixture
+async def served():
+    hub = SessionHub()
+    server = EventServer(hub, port=0, heartbeat=0.05)
+    await server.start()
+    yield hub, server
+    await server.close()
+    await hub.close()
+
+
+async def test_root_serves_the_viewer_page_and_sessions_list(served, agents):
+    # Arrange
+    hub, server = served
+    session = hub.submit("set x")
+
+    # Act
+    page_status, page = await _get(server, "/")
+    list_status, listing = await _get(server, "/sessions")
+
+    # Assert
+    assert page_status == "HTTP/1.1 200 OK" and b"EventSource" in page
+    assert list_status == "HTTP/1.1 200 OK"
+    assert json.loads(listing)[0]["session"] == session
+
+
+async def test_events_stream_ids_and_data_then_end(served, agents):
+    # Arrange
+    hub, server = served
+    session = hub.submit("set x")
+    agents.set()
+
+    # Act
+    status, body = await _get(server, f"/events/{session}")
+
+    # Assert
+    events = _sse_events(body)
+    assert status == "HTTP/1.1 200 OK"
+    assert [int(e["id"]) for e in events[:-1]] == list(range(len(events) - 1))
+    assert json.loads(events[-2]["data"])["type"] == "result"
+    assert events[-1]["event"] == "end"
+
+
+async def test_reconnect_with_last_event_id_resumes_after_it(served, agents):
+    # Arrange
+    hub, server = served
+    session = hub.submit("set x")
+    agents.set()
+    _, full = await _get(server, f"/events/{session}")
+    total = len(_sse_events(full)) - 1
+
+    # Act
+    _, resumed = await _get(server, f"/events/{session}", "Last-Event-ID: 2\r\n")
+
+    # Assert
+    ids = [int(e["id"]) for e in _sse_events(resumed) if "id" in e]
+    assert ids == list(range(3, total))
+
+
+async def test_idle_stream_sends_heartbeat_comments(served, agents):
+    # Arrange
+    hub, server = served
+    session = hub.submit("set x")
+    reader, writer = await _open(server, f"/events/{session}")
+
+    # Act
+    received = b""
+    while b": keepalive" not in received:
+        received += await asyncio.wait_for(reader.read(1024), 2)
+    writer.close()
+
+    # Assert
+    assert b"text/event-stream" in received
+
+
+async def test_unknown_routes_and_methods_are_refused(served):
+    # Arrange
+    _, server = served
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(b"POST /sessions HTTP/1.1\r\n\r\n")
+
+    # Act
+    post = (await reader.read()).split(b"\r\n")[0]
+    missing, _ = await _get(server, "/events/nope")
+
+    # Assert
+    assert post == b"HTTP/1.1 405 Method Not Allowed"
+    assert missing == "HTTP/1.1 404 Not Found"
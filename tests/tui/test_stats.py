@@ -0,0 +1,127 @@
+"""Tests for tui.stats — persisted per-agent performance records."""
+from tui.stats import LatencyHistory, RaceLedger, TimeoutPolicy
+
+
+def test_race_ledger_records_wins_and_rates():
+    # Arrange
+    ledger = RaceLedger()
+
+    # Act
+    ledger.record(["claude", "codex"], "claude", 4.0, cancelled=("codex",))
+    ledger.record(["claude", "codex"], "codex", 6.0, cancelled=("claude",))
+    ledger.record(["claude", "codex"], None, 9.0)
+
+    # Assert
+    assert ledger.races == {"claude": 3, "codex": 3}
+    assert ledger.win_rate("claude") == 1 / 3
+    assert ledger.mean_win_latency("codex") == 6.0
+    assert ledger.win_rate("gemini") == 0.0
+
+
+def test_race_ledger_latency_saved_uses_loser_history():
+    # Arrange — codex historically needs 10s to win
+    ledger = RaceLedger()
+    ledger.record(["claude", "codex"], "codex", 10.0, cancelled=("claude",))
+
+    # Act — claude wins in 3s while codex is cancelled
+    saved = ledger.record(["claude", "codex"], "claude", 3.0, cancelled=("codex",))
+
+    # Assert — first race had no baseline for claude, so only the second saved time
+    assert saved == 7.0
+    assert ledger.latency_saved == 7.0
+
+
+def test_race_ledger_round_trips_through_disk(tmp_path):
+    # Arrange
+    path = tmp_path / ".disagree" / "race.json"
+    ledger = RaceLedger()
+    ledger.record(["claude", "codex"], "claude", 2.5, cancelled=("codex",))
+
+    # Act
+    ledger.save(path)
+    loaded = RaceLedger.load(path)
+
+    # Assert
+    assert loaded == ledger
+
+
+def test_race_ledger_load_tolerates_corrupt_file(tmp_path):
+    # Arrange
+    path = tmp_path / "race.json"
+    path.write_text("{not json")
+
+    # Act
+    ledger = RaceLedger.load(path)
+
+    # Assert
+    assert ledger == RaceLedger()
+
+
+def test_latency_history_percentile_needs_min_samples():
+    # Arrange
+    history = LatencyHistory(min_samples=3)
+    history.record("claude", "stream.ttft", 1.0)
+    history.record("claude", "stream.ttft", 2.0)
+
+    # Act / Assert
+    assert history.percentile("claude", "stream.ttft", 0.9) is None
+    history.record("claude", "stream.ttft", 3.0)
+    assert history.percentile("claude", "stream.ttft", 0.9) == 3.0
+    assert history.percentile("claude", "stream.ttft", 0.5) == 2.0
+
+
+def test_latency_history_keeps_rolling_window():
+    # Arrange
+    history = LatencyHistory(window=3, min_samples=1)
+
+    # Act
+    for seconds in (10.0, 1.0, 2.0, 3.0):
+        history.record("codex", "reconcile", seconds)
+
+    # Assert — the oldest sample fell out of the window
+    assert history.samples("codex", "reconcile") == [1.0, 2.0, 3.0]
+    assert history.percentile("codex", "reconcile", 1.0) == 3.0
+
+
+def test_latency_history_round_trips_through_disk(tmp_path):
+    # Arrange
+    path = tmp_path / "latency.json"
+    history = LatencyHistory(min_samples=1)
+    history.record("claude", "stream", 12.5)
+    history.record("codex", "reconcile.ttft", 0.75)
+
+    # Act
+    history.save(path)
+    loaded = LatencyHistory.load(path, min_samples=1)
+
+    # Assert
+    assert loaded.samples("claude", "stream") == [12.5]
+    assert loaded.samples("codex", "reconcile.ttft") == [0.75]
+
+
+def test_timeout_policy_uses_default_when_history_is_cold():
+    # Act
+    overall, idle = TimeoutPolicy().timeouts(LatencyHistory(), "claude", "stream", 60.0)
+
+    # Assert
+    assert overall == 60.0
+    assert idle is None
+
+
+def test_timeout_policy_scales_and_clamps_p99():
+    # Arrange
+    history = LatencyHistory(min_samples=1)
+    history.record("claude", "stream", 4.0)
+    history.record("claude", "stream.ttft", 2.0)
+    history.record("claude", "stream.gap", 3.0)
+    history.record("codex", "stream", 1000.0)
+    policy = TimeoutPolicy(factor=2.0, floor=15.0, ceiling=600.0, idle_floor=1.0)
+
+    # Act
+    fast = policy.timeouts(history, "claude", "stream", 60.0)
+    slow = policy.timeouts(history, "codex", "stream", 60.0)
+
+    # Assert — fast agent: floor applies; idle from the larger of ttft/gap
+    assert fast == (15.0, 6.0)
+    # Slow agent: clamped to the ceiling, no idle history yet
+    assert slow == (600.0, None)
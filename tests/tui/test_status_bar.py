@@ -0,0 +1,64 @@
+"""Tests for StatusBar widget using Textual's headless Pilot harness."""
+import pytest
+from textual.app import App, ComposeResult
+
+from tui.widgets.status_bar import StatusBar
+
+
+class StatusBarTestApp(App):
+    """Minimal host app for testing StatusBar in isolation."""
+
+    def compose(self) -> ComposeResult:
+        yield StatusBar(id="status")
+
+
+@pytest.mark.asyncio
+async def test_update_remembers_status_text():
+    """Every update(), direct or via a show_* helper, is kept in status_text."""
+    # Arrange
+    app = StatusBarTestApp()
+    async with app.run_test(size=(120, 5)) as pilot:
+        status = app.query_one("#status", StatusBar)
+        # Act
+        status.show_race_mode(True)
+        await pilot.pause()
+        # Assert
+        assert status.status_text.startswith("Race mode on")
+
+
+@pytest.mark.asyncio
+async def test_quorum_wait_appends_to_the_status_text_with_markup_intact():
+    """show_quorum_wait() appends to the last status text, not to its rendering."""
+    # Arrange
+    app = StatusBarTestApp()
+    async with app.run_test(size=(120, 5)) as pilot:
+        status = app.query_one("#status", StatusBar)
+        status.update("[b]Both done[/b] — claude: 3 lines")
+        # Act
+        status.show_quorum_wait(["codex"])
+        await pilot.pause()
+        # Assert
+        assert status.status_text == (
+            "[b]Both done[/b] — claude: 3 lines  •  waiting for codex to reconcile"
+        )
+        assert "Both done — claude: 3 lines  •  waiting for codex" in str(status.render())
+
+
+@pytest.mark.asyncio
+async def test_early_classification_names_the_agents_still_streaming():
+    """With pending agents, the classification says who is done instead of "Both done"."""
+    # Arrange
+    app = StatusBarTestApp()
+    async with app.run_test(size=(160, 5)) as pilot:
+        status = app.query_one("#status", StatusBar)
+        # Act
+        status.show_classification(
+            {"claude": 3, "codex": 1}, [], partial=("codex",), pending=("codex",)
+        )
+        status.show_quorum_wait(["codex"])
+        await pilot.pause()
+        # Assert
+        assert status.status_text.startswith("claude done, codex still streaming (partial)")
+        assert "Both done" not in status.status_text
+        assert "partial: codex" not in status.status_text
+        assert status.status_text.endswith("waiting for codex to reconcile")
@@ -0,0 +1,117 @@
+"""Tests for watcher.py — debounced file change notifications."""
+import sys
+import threading
+import time
+
+import pytest
+
+from tui.watcher import FileWatcher
+
+
+class _Batches:
+    """Collects on_change batches and lets a test wait for the next one."""
+
+    def __init__(self) -> None:
+        self.batches: list = []
+        self._event = threading.Event()
+
+    def __call__(self, batch) -> None:
+        self.batches.append(batch)
+        self._event.set()
+
+    def wait(self, timeout: float = 5.0) -> list:
+        assert self._event.wait(timeout), "no change batch delivered"
+        self._event.clear()
+        return self.batches
+
+    def wait_until(self, predicate, timeout: float = 5.0) -> list:
+        """Wait for batches until predicate(batches) holds (a scan may split a burst)."""
+        deadline = time.monotonic() + timeout
+        while not predicate(self.batches):
+            self.wait(max(0.0, deadline - time.monotonic()))
+        return self.batches
+
+
+def _started(watcher: FileWatcher) -> FileWatcher:
+    watcher.start()
+    deadline = time.monotonic() + 5.0
+    while watcher.backend is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    return watcher
+
+
+def test_polling_reports_created_modified_and_deleted_files(tmp_path):
+    # Arrange
+    (tmp_path / "old.py").write_text("x")
+    batches = _Batches()
+    watcher = _started(FileWatcher(tmp_path, batches, poll_interval=0.1, use_inotify=False))
+
+    try:
+        # Act
+        (tmp_path / "new.py").write_text("x")
+        (tmp_path / "old.py").unlink()
+        (tmp_path / ".hidden").write_text("x")
+        batches.wait_until(lambda b: {"new.py", "old.py"} <= set().union(*b))
+        seen = set().union(*batches.batches)
+
+        # Assert
+        assert watcher.backend == "polling"
+        assert {"new.py", "old.py"} <= seen
+        assert ".hidden" not in seen
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_debounces_a_burst_into_one_batch(tmp_path):
+    # Arrange
+    (tmp_path / "src").mkdir()
+    batches = _Batches()
+    watcher = _started(FileWatcher(tmp_path, batches, debounce=0.2))
+
+    try:
+        # Act
+        for i in range(20):
+            (tmp_path / "src" / "a.py").write_text(str(i))
+        (tmp_path / "b.py").write_text("x")
+
+        # Assert
+        assert batches.wait() == [{"src/a.py", "b.py"}]
+        assert watcher.backend == "inotify"
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+def test_inotify_reports_new_directory_as_rescan(tmp_path):
+    # Arrange
+    batches = _Batches()
+    watcher = _started(FileWatcher(tmp_path, batches, debounce=0.1))
+
+    try:
+        # Act
+        (tmp_path / "pkg").mkdir()
+
+        # Assert
+        assert batches.wait() == [None]
+    finally:
+        watcher.stop()
+
+
+def test_oversized_batch_collapses_to_rescan(tmp_path):
+    # Arrange
+    batches = _Batches()
+    watcher = _started(
+        FileWatcher(tmp_path, batches, poll_interval=0.1, max_pending=3, use_inotify=False)
+    )
+
+    try:
+        # Act
+        for i in range(10):
+            (tmp_path / f"f{i}.py").write_text("x")
+
+        # Assert
+        assert None in batches.wait_until(lambda b: None in b or sum(len(x) for x in b) >= 10)
+    finally:
+        watcher.stop()